@@ -85,6 +85,8 @@ from . properties import M3SceneProperties, M3ObjectProperties
 from . utils.registration import get_core, get_prefs, get_tools, get_pie_menus
 from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, register_msgbus, unregister_msgbus
 from . ui.menus import object_context_menu, mesh_context_menu, add_object_buttons, material_pick_button, outliner_group_toggles, extrude_menu, group_origin_adjustment_toggle, render_menu, render_buttons
+from . utils.application import clear_scheduled
+from . utils.asset import clear_catalog_index
 from . handlers import load_post, undo_pre, depsgraph_update_post, render_start, render_end
 
 
@@ -189,6 +191,8 @@ def unregister():
 
     bpy.app.handlers.undo_pre.remove(undo_pre)
 
+    clear_scheduled()
+
 
     # MSGBUS
 
@@ -221,6 +225,7 @@ def unregister():
 
     del bpy.types.WindowManager.M3_screen_cast
     del bpy.types.WindowManager.M3_asset_catalogs
+    clear_catalog_index()
 
 
     # ICONS
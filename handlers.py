@@ -2,13 +2,17 @@ import bpy
 import os
 from bpy.app.handlers import persistent
 from time import time
-from . utils.application import delay_execution
-from . utils.draw import draw_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD
-from . utils.group import select_group_children
-from . utils.light import adjust_lights_for_rendering, get_area_light_poll
-from . utils.object import get_active_object, get_visible_objects
-from . utils.registration import get_prefs, reload_msgbus, get_addon
-from . utils.system import get_temp_dir
+from threading import Thread, Lock
+from . utils.application import delay_execution, schedule_execution
+from . utils.draw import draw_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD, clear_axes_batches, clear_batches
+from . utils.graph import clear_mesh_graphs
+from . utils.group import select_group_children, update_group_name_index, tag_group_name_index, clear_group_name_index
+from . utils.light import adjust_lights_for_rendering, get_area_light_poll, tag_light_update, clear_light_registry
+from . utils.material import clear_bevel_shader_cache
+from . utils.object import get_active_object, get_indexed_visible_objects, update_visible_index, clear_visible_index, tag_geometry_update, prune_geometry_updates, clear_geometry_updates, update_hierarchy_index, clear_hierarchy_index, tag_poll_update, clear_poll_cache
+from . utils.snap import clear_snap_cache
+from . utils.registration import get_prefs, reload_msgbus, get_addon, clear_addon_registry
+from . utils.system import get_temp_dir, rotate_file_generations, compress_file
 from . utils.view import sync_light_visibility
 
 global_debug = False
@@ -41,7 +45,7 @@ def manage_axes_HUD():
             axesHUD = None
 
         # axes_objects = [obj for obj in getattr(bpy.context, 'visible_objects', []) if obj.M3.draw_axes]
-        axes_objects = [obj for obj in get_visible_objects(bpy.context) if obj.M3.draw_axes]
+        axes_objects = get_indexed_visible_objects(bpy.context, category='AXES')
 
         active = get_active_object(bpy.context)
 
@@ -67,6 +71,7 @@ def manage_axes_HUD():
                         print("   removing previous draw handler")
 
                     bpy.types.SpaceView3D.draw_handler_remove(axesHUD, 'WINDOW')
+                    clear_axes_batches()
 
                 # create a new handler
 
@@ -77,6 +82,7 @@ def manage_axes_HUD():
         # remove the handler when no axes objects are present anymore
         elif axesHUD:
             bpy.types.SpaceView3D.draw_handler_remove(axesHUD, 'WINDOW')
+            clear_axes_batches()
 
             if debug:
                 print("   removing old draw handler")
@@ -236,9 +242,7 @@ def manage_group():
                 active.M3.group_size = active.empty_display_size
 
 
-        if (visible := get_visible_objects(C)):
-
-            group_empties = [obj for obj in visible if obj.M3.is_group_empty]
+        if (group_empties := get_indexed_visible_objects(C, category='GROUP_EMPTY')):
 
             # HIDE / UNHIDE
 
@@ -292,18 +296,14 @@ def manage_group():
 
 meshmachine = None
 decalmachine = None
-was_asset_drop_cleanup_executed = False
 
 def manage_asset_drop_cleanup():
     '''
-    for some reason this particular function is reliably executed twice
-    and while it's generally not a problem, it really not necessary
-    so we ensure it's only executed every second time via was_asset_drop_cleanup_executed
-
-    NOTE: this may also be related to other handlers (perhaps in HC) causing a second run, so verify that's not the case
+    NOTE: this used to be reliably executed twice, and so only every second run was considered
+    now that it's only scheduled by the depsgraph handler, when a new operator was registered, this is no longer necessary
     '''
     
-    global global_debug, was_asset_drop_cleanup_executed
+    global global_debug
 
     debug = global_debug
     # debug = False
@@ -311,13 +311,6 @@ def manage_asset_drop_cleanup():
     if debug:
         print("  M3 asset drop cleanup")
 
-    if was_asset_drop_cleanup_executed:
-        if debug:
-            print("   skipping second (duplicate) run")
-
-        was_asset_drop_cleanup_executed = False
-        return
-
     if debug:
         print("   checking for asset drop cleanup")
 
@@ -370,9 +363,10 @@ def manage_asset_drop_cleanup():
 
                 # start = time.time()
 
-                visible = get_visible_objects(C)
+                stashes = get_indexed_visible_objects(C, category='STASH') if meshmachine else []
+                backups = get_indexed_visible_objects(C, category='DECAL_BACKUP') if decalmachine else []
 
-                for obj in visible:
+                for obj in stashes + backups:
                     if meshmachine and obj.MM.isstashobj:
                         if debug:
                             print("     stash object:", obj.name)
@@ -395,8 +389,6 @@ def manage_asset_drop_cleanup():
 
                 # print(f" MACHIN3tools asset drop check done, after {time.time() - start:.20f} seconds")
 
-            was_asset_drop_cleanup_executed = True
-
         # if lastop.bl_idname == 'OBJECT_OT_drop_named_material':
             # print("material dropped")
 
@@ -472,6 +464,42 @@ def manage_lights_increase():
 
 # SAVE FILE before UNDO
 
+undo_save_lock = Lock()
+undo_save_update_count = 0
+prev_undo_save_update_count = None
+undo_save_job_count = 0
+undo_save_stats = {'saved': 0, 'skipped': 0, 'save_time': 0, 'compress_time': 0}
+
+def compress_undo_save(temp_path, filepath, generations, debug=False):
+    '''
+    compress the uncompressed undo save and rotate it into the undo save generations
+    runs on a worker thread, so don't touch bpy here, and serialize the jobs via the lock, so the rotation can't interleave
+    '''
+
+    with undo_save_lock:
+        start = time()
+
+        compressed_path = filepath + '.tmp'
+
+        try:
+            compress_file(temp_path, compressed_path)
+
+            rotate_file_generations(filepath, generations)
+            os.replace(compressed_path, filepath)
+
+        except OSError as e:
+            print("WARNING: Pre-Undo Save failed:", e)
+
+        finally:
+            for path in [temp_path, compressed_path]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        undo_save_stats['compress_time'] = time() - start
+
+        if debug:
+            print("     compress time:", undo_save_stats['compress_time'])
+
 def pre_undo_save():
     global global_debug
 
@@ -506,6 +534,17 @@ def pre_undo_save():
                     first_redo = True
 
             if C.active_operator is None or first_redo:
+                global undo_save_update_count, prev_undo_save_update_count, undo_save_job_count
+
+                # nothing has changed since the last undo save, so there's nothing new to save
+                if undo_save_update_count == prev_undo_save_update_count:
+                    undo_save_stats['skipped'] += 1
+
+                    if debug:
+                        print("    skipping undo save, nothing changed since the last one")
+
+                    return
+
                 temp_dir = get_temp_dir(bpy.context)
 
                 if temp_dir:
@@ -534,13 +573,23 @@ def pre_undo_save():
                     if debug: 
                         print("     to temp folder:", filepath)
 
-                    if debug:
-                        start = time()
+                    # save uncompressed, which is fast, and leave the compression and rotation of the generations to a worker thread
+                    undo_save_job_count += 1
+                    temp_path = os.path.join(temp_dir, f"{name}_undosave_tmp{undo_save_job_count}{ext}")
+
+                    start = time()
+
+                    bpy.ops.wm.save_as_mainfile(filepath=temp_path, check_existing=False, copy=True, compress=False)
+
+                    undo_save_stats['save_time'] = time() - start
+                    undo_save_stats['saved'] += 1
 
-                    bpy.ops.wm.save_as_mainfile(filepath=filepath, check_existing=True, copy=True, compress=True)
+                    prev_undo_save_update_count = undo_save_update_count
 
                     if debug:
-                        print("     save time:", time() - start)
+                        print("     save time:", undo_save_stats['save_time'])
+
+                    Thread(target=compress_undo_save, args=(temp_path, filepath, get_prefs().save_pie_undo_save_generations, debug), daemon=True).start()
 
 
 
@@ -550,7 +599,7 @@ def pre_undo_save():
 
 @persistent
 def load_post(none):
-    global global_debug
+    global global_debug, force_depsgraph_changes, prev_undo_save_update_count
 
     # MSGBUS
 
@@ -561,6 +610,31 @@ def load_post(none):
 
     reload_msgbus()
 
+    # the depsgraph signatures and the visible object index from the previous file are meaningless now, so have all managers run on the next update
+    force_depsgraph_changes = True
+    clear_visible_index()
+    clear_hierarchy_index()
+    clear_poll_cache()
+
+    # the addon registry is rebuilt lazily on the next get_addon() call
+    clear_addon_registry()
+
+    # free the snapping bmeshes, the mesh graphs and the retained batches of the previous file
+    clear_geometry_updates()
+    clear_snap_cache()
+    clear_mesh_graphs()
+    clear_batches()
+
+    # the group name index and the light registry are rebuilt lazily for the new file
+    clear_group_name_index()
+    clear_light_registry()
+
+    # the bevel shader's mesh dimensions and material states are keyed by pointers of the previous file
+    clear_bevel_shader_cache()
+
+    # always undo save the first time in a newly loaded file
+    prev_undo_save_update_count = None
+
 
 # PRE-UNDO HANDLER
 
@@ -576,6 +650,12 @@ def undo_pre(scene):
 
     p = get_prefs()
 
+    # object pointers may change when undoing, so have the hierarchy index rebuilt lazily
+    clear_hierarchy_index()
+
+    # and undoing may restore previous hide states, so have the lights re-collected and synced again too
+    clear_light_registry()
+
     # PRE-UNDO SAVING
 
     if p.activate_save_pie and p.save_pie_use_undo_save:
@@ -627,65 +707,228 @@ def render_end(scene):
 
 # DEPSGRAPH UPDATE POST HANDLER
 
+prev_selection = None
+prev_operators = None
+force_depsgraph_changes = True
+
+def get_depsgraph_changes(depsgraph, debug=False):
+    '''
+    go over the depsgraph updates once, and sort them into dirty flags for the individual managers
+
+        TRANSFORM_ONLY - all updated objects have only been moved, which is the case for each step of an interactive transform
+        SCENE          - the scene itself was updated, which happens on selection changes, but also when scene props change
+        SELECTION      - the active object or the number of selected objects has changed
+        OBJECT         - an object was updated in some other way than a transform, like when a prop of it changed
+        MODIFIER       - the active object's geometry or modifier stack has changed
+        GROUP          - a group empty was updated in some other way than a transform
+        VISIBILITY     - objects have been added, removed, linked or unlinked, or a collection's visibility changed
+        OPERATOR       - a new operator has been registered in the wm's operator stack
+
+    NOTE: the selection and operator stack are compared against the previous call via cheap signatures, as the depsgraph updates alone aren't reliable for these
+    '''
+
+    global prev_selection, prev_operators, force_depsgraph_changes
+
+    changes = {'TRANSFORM_ONLY': False,
+               'SCENE': False,
+               'SELECTION': False,
+               'OBJECT': False,
+               'MODIFIER': False,
+               'GROUP': False,
+               'VISIBILITY': False,
+               'OPERATOR': False}
+
+    C = bpy.context
+
+    # SELECTION and OPERATOR signatures
+
+    active = get_active_object(C)
+    objects = getattr(C.view_layer, 'objects', None)
+
+    selection = (active.as_pointer() if active else None, len(objects.selected) if objects else 0)
+
+    if selection != prev_selection:
+        changes['SELECTION'] = True
+        prev_selection = selection
+
+    wm = C.window_manager
+    operators = (len(wm.operators), wm.operators[-1].as_pointer() if wm.operators else None)
+
+    if operators != prev_operators:
+        changes['OPERATOR'] = True
+        prev_operators = operators
+
+    # DEPSGRAPH UPDATES
+
+    transform_only = None
+    updated_objects = []
+    hierarchy_objects = []
+
+    for update in (depsgraph.updates if depsgraph else []):
+        id = update.id
+
+        if isinstance(id, bpy.types.Object):
+            is_transform = update.is_updated_transform and not update.is_updated_geometry and not update.is_updated_shading
+            transform_only = is_transform if transform_only is None else transform_only and is_transform
+
+            # parenting changes may come in as transform updates only, so check all of them for the hierarchy index
+            hierarchy_objects.append(id.original)
+
+            # count geometry updates per object, used to validate the snapping cache
+            if update.is_updated_geometry:
+                tag_geometry_update(id.original)
+
+            # a light's hide_render may have been changed
+            if id.type == 'LIGHT' and not is_transform:
+                tag_light_update()
+
+            if not is_transform:
+                changes['OBJECT'] = True
+                updated_objects.append(id.original)
+
+                # newly added objects come in as updates too, and so may renamed ones
+                update_group_name_index(id.original)
+
+                if id.M3.is_group_empty:
+                    changes['GROUP'] = True
+
+                if active and id.original == active:
+                    changes['MODIFIER'] = True
+
+        elif isinstance(id, bpy.types.Scene):
+            changes['SCENE'] = True
+
+            # hiding objects changes their base flags, which is only reported as a scene update
+            tag_light_update()
+
+        elif isinstance(id, bpy.types.Collection):
+            changes['VISIBILITY'] = True
+
+            # objects may have been added, removed or (un)linked, so lights have to be re-collected
+            tag_light_update(rebuild=True)
+
+        else:
+            transform_only = False
+
+            # a light's type may have changed, which affects the area lights
+            if isinstance(id, bpy.types.Light):
+                tag_light_update(rebuild=True)
+
+    # objects may have been added or removed, so drop their geometry update counts, and have the group name index validate its numbers on the next lookup
+    if changes['VISIBILITY']:
+        prune_geometry_updates()
+        tag_group_name_index()
+
+    # keep the visible object index up to date, and have it rebuilt lazily, when collections changed
+    if C.view_layer and (updated_objects or changes['VISIBILITY']):
+        update_visible_index(C.view_layer, objects=updated_objects, rebuild=changes['VISIBILITY'])
+
+    # same for the hierarchy index, which is only invalidated if parenting has changed
+    if C.view_layer and (hierarchy_objects or changes['VISIBILITY']):
+        update_hierarchy_index(C.view_layer, objects=hierarchy_objects, rebuild=changes['VISIBILITY'])
+
+    # force everything dirty, after registration and file loading
+    if force_depsgraph_changes or depsgraph is None:
+        for change in changes:
+            changes[change] = change != 'TRANSFORM_ONLY'
+
+        tag_light_update(rebuild=True)
+
+        force_depsgraph_changes = False
+
+        if debug:
+            print(" forced depsgraph changes")
+
+        return changes
+
+    # NOTE: during transforms the scene can be part of the updates too, so only consider scene changes, when there were some non-transform updates as well
+    if transform_only:
+        changes['TRANSFORM_ONLY'] = True
+        changes['SCENE'] = False
+
+    if debug:
+        print(" depsgraph changes:", [change for change, state in changes.items() if state])
+
+    return changes
+
+
 @persistent
-def depsgraph_update_post(scene):
-    global global_debug
+def depsgraph_update_post(scene, depsgraph=None):
+    global global_debug, undo_save_update_count
 
     if global_debug:
         print()
         print("MACHIN3tools depsgraph update post handler:")
 
+    # count updates, so the pre-undo save can tell if anything has changed since it last saved
+    undo_save_update_count += 1
+
+    # and so cached poll results can tell if they are still valid
+    tag_poll_update()
+
     p = get_prefs()
 
+    changes = get_depsgraph_changes(depsgraph, debug=global_debug)
+
+    # nothing but object transforms happened, which none of the managers are interested in, as long as the selection or operator stack hasn't changed as well
+    if changes['TRANSFORM_ONLY'] and not (changes['SELECTION'] or changes['OPERATOR']):
+        if global_debug:
+            print(" skipping managers for transform only update")
+
+        return
+
+    is_general = changes['SCENE'] or changes['SELECTION'] or changes['OBJECT'] or changes['VISIBILITY']
+
 
     # AXES HUD
 
-    if p.activate_shading_pie:
+    if p.activate_shading_pie and is_general:
         if global_debug:
             print(" managing axes HUD")
 
-        delay_execution(manage_axes_HUD)
+        schedule_execution(manage_axes_HUD)
 
 
     # FOCUS HUD
 
-    if p.activate_focus:
+    if p.activate_focus and changes['SCENE']:
         if global_debug:
             print(" managing focus HUD")
 
-        delay_execution(manage_focus_HUD)
+        schedule_execution(manage_focus_HUD)
 
 
     # SURFACE SLIDE HUD
 
-    if p.activate_surface_slide:
+    if p.activate_surface_slide and (changes['SELECTION'] or changes['MODIFIER']):
         if global_debug:
             print(" managing surface slide HUD")
 
-        delay_execution(manage_surface_slide_HUD)
+        schedule_execution(manage_surface_slide_HUD)
 
 
     # SCREEN CAST HUD
 
-    if p.activate_save_pie and p.show_screencast:
+    if p.activate_save_pie and p.show_screencast and (changes['SCENE'] or changes['OPERATOR']):
         if global_debug:
             print(" managing screen cast HUD")
 
-        delay_execution(manage_screen_cast_HUD)
+        schedule_execution(manage_screen_cast_HUD)
 
 
     # GROUP
 
-    if p.activate_group:
+    if p.activate_group and (changes['SCENE'] or changes['SELECTION'] or changes['GROUP'] or changes['VISIBILITY']):
         if global_debug:
             print(" managing group")
 
-        delay_execution(manage_group)
+        schedule_execution(manage_group)
 
 
     # ASSET DROP CLEANUP
 
-    if global_debug:
-        print(" managing asset drop cleanup")
+    if changes['OPERATOR']:
+        if global_debug:
+            print(" managing asset drop cleanup")
 
-    delay_execution(manage_asset_drop_cleanup)
+        schedule_execution(manage_asset_drop_cleanup)
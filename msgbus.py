@@ -1,11 +1,18 @@
 import bpy
 from . utils import registration as r
-from . utils.group import update_group_name
+from . utils.group import update_group_name, update_group_name_index, tag_group_name_index
 
 
 def group_name_change():
     active = bpy.context.active_object
 
+    # keep the group name index up to date, for any renamed object, as they all take up names
+    # the notification doesn't tell which object was renamed, so besides indexing the active one, have the numbers validated on the next lookup
+    tag_group_name_index()
+
+    if active:
+        update_group_name_index(active)
+
     if active and active.M3.is_group_empty and r.get_prefs().group_auto_name:
         update_group_name(active)
 
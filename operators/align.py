@@ -4,7 +4,7 @@ from mathutils import Matrix, Vector, Euler, Quaternion
 from math import radians
 from .. utils.math import get_loc_matrix, get_rot_matrix, get_sca_matrix, average_locations
 from .. utils.object import compensate_children, parent, unparent
-from .. utils.draw import draw_mesh_wire, draw_label, update_HUD_location
+from .. utils.draw import draw_mesh_wire, draw_label, update_HUD_location, clear_batches
 from .. utils.mesh import get_coords
 from .. utils.ui import init_cursor, init_status, finish_status
 from .. utils.system import printd
@@ -440,8 +440,8 @@ class AlignRelative(bpy.types.Operator):
 
     def draw_VIEW3D(self):
         for obj in self.targets:
-            for batch in self.batches[obj]:
-                draw_mesh_wire(batch, color=green if self.instance else blue, alpha=0.5)
+            for idx, batch in enumerate(self.batches[obj]):
+                draw_mesh_wire(batch, color=green if self.instance else blue, alpha=0.5, key=('AlignRelative', obj.name, idx))
 
     def modal(self, context, event):
         context.area.tag_redraw()
@@ -565,6 +565,8 @@ class AlignRelative(bpy.types.Operator):
         bpy.types.SpaceView3D.draw_handler_remove(self.VIEW3D, 'WINDOW')
         bpy.types.SpaceView3D.draw_handler_remove(self.HUD, 'WINDOW')
 
+        clear_batches(owner='AlignRelative')
+
         # reset the statusbar
         finish_status(self)
 
@@ -2,20 +2,156 @@ import bpy
 from bpy.props import StringProperty, BoolProperty, FloatProperty, EnumProperty
 import os
 from mathutils import Vector
-from .. utils.registration import get_addon, get_prefs, get_path
+from .. utils.registration import get_addon, get_prefs
+from .. utils.system import makedir
 from .. utils.ui import popup_message
-from .. utils.asset import get_asset_library_reference, set_asset_library_reference, update_asset_catalogs
+from .. utils.asset import get_asset_library_reference, set_asset_library_reference, update_asset_catalogs, create_viewport_thumbnails
 from .. utils.object import parent
 from .. utils.math import average_locations
 from .. items import create_assembly_asset_empty_location_items, create_assembly_asset_empty_collection_items
 
-import time
+import json
+import hashlib
+import subprocess
 
 
 decalmachine = None
 meshmachine = None
 
 
+# COLLECT ASSETS
+
+collect_preview_size = 256
+collect_preview_samples = 32
+
+# executed by each background blender process when collecting assets, it opens each of its files, records the materials and pre-renders their previews
+collect_worker_script = """
+import bpy
+import bmesh
+import json
+import os
+from math import radians
+
+
+def render_previews(materials, paths):
+    scene = bpy.data.scenes.new('M3_preview')
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = {samples}
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = {threads}
+    scene.render.resolution_x = scene.render.resolution_y = {size}
+    scene.render.resolution_percentage = 100
+    scene.render.film_transparent = True
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGBA'
+
+    world = bpy.data.worlds.new('M3_preview')
+    world.color = (0.2, 0.2, 0.2)
+    scene.world = world
+
+    mesh = bpy.data.meshes.new('M3_preview')
+    bm = bmesh.new()
+    bmesh.ops.create_uvsphere(bm, u_segments=64, v_segments=32, radius=1)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.polygons.foreach_set('use_smooth', [True] * len(mesh.polygons))
+
+    sphere = bpy.data.objects.new('M3_preview', mesh)
+    scene.collection.objects.link(sphere)
+
+    cam = bpy.data.objects.new('M3_preview_camera', bpy.data.cameras.new('M3_preview_camera'))
+    cam.data.type = 'ORTHO'
+    cam.data.ortho_scale = 2.1
+    cam.location = (0, -5, 0)
+    cam.rotation_euler = (radians(90), 0, 0)
+    scene.collection.objects.link(cam)
+    scene.camera = cam
+
+    sun = bpy.data.objects.new('M3_preview_sun', bpy.data.lights.new('M3_preview_sun', 'SUN'))
+    sun.data.energy = 3
+    sun.rotation_euler = (radians(45), 0, radians(-45))
+    scene.collection.objects.link(sun)
+
+    for mat, path in zip(materials, paths):
+        mesh.materials.clear()
+        mesh.materials.append(mat)
+
+        scene.render.filepath = path
+        bpy.ops.render.render(write_still=True, scene=scene.name)
+
+
+for blendpath, result_path in {jobs!r}:
+    stat = os.stat(blendpath)
+    result = {{'path': blendpath, 'mtime': stat.st_mtime, 'size': stat.st_size, 'materials': [], 'previews': {{}}, 'thumbnail': None}}
+
+    try:
+        bpy.ops.wm.open_mainfile(filepath=blendpath, load_ui=False)
+
+        materials = [mat for mat in bpy.data.materials if not mat.library]
+        result['materials'] = [mat.name for mat in materials]
+
+        # existing thumbnails next to the blend file are used for all its materials
+        basepath = os.path.splitext(blendpath)[0]
+
+        for ext in ['.jpg', '.png']:
+            if os.path.exists(basepath + ext):
+                result['thumbnail'] = basepath + ext
+                break
+
+        if not result['thumbnail']:
+            basename = os.path.basename(result_path).replace('.json', '')
+            paths = [os.path.join({previews_dir!r}, f"{{basename}}_{{idx}}.png") for idx in range(len(materials))]
+
+            render_previews(materials, paths)
+            result['previews'] = {{mat.name: path for mat, path in zip(result['materials'], paths)}}
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    # write it atomically, as the main process picks up results while the worker is still running
+    with open(result_path + '.tmp', 'w') as f:
+        json.dump(result, f)
+
+    os.replace(result_path + '.tmp', result_path)
+"""
+
+
+def get_path_hash(path):
+    return hashlib.md5(path.encode()).hexdigest()
+
+
+def load_collect_manifest(cache_dir):
+    '''
+    the manifest records the worker results of each blend file, along with its mtime and size, so unchanged files don't need to be processed again
+    it also records the names of the materials each file has been collected as, per blend file, but these are only trusted, if they still exist there
+    '''
+
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            if manifest.get('version') == 2:
+                return manifest
+
+        except (OSError, ValueError):
+            print("WARNING: Asset collection manifest could not be read, starting from scratch")
+
+    return {'version': 2, 'files': {}}
+
+
+def save_collect_manifest(cache_dir, manifest):
+    manifest_path = os.path.join(cache_dir, 'manifest.json')
+
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f)
+
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
 class CreateAssemblyAsset(bpy.types.Operator):
     bl_idname = "machin3.create_assembly_asset"
     bl_label = "MACHIN3: Create Assembly Asset"
@@ -163,9 +299,7 @@ class CreateAssemblyAsset(bpy.types.Operator):
             self.adjust_workspace(context)
 
             # render the viewport
-            if self.render_thumbnail:
-                thumbpath = os.path.join(get_path(), 'resources', 'thumb.png')
-                self.render_viewport(context, thumbpath)
+            if self.render_thumbnail and context.space_data.type == 'VIEW_3D':
 
                 # with context.temp_override(id=instance):
                 #     bpy.ops.ed.lib_id_generate_preview(filepath=thumbpath)
@@ -176,23 +310,10 @@ class CreateAssemblyAsset(bpy.types.Operator):
                 # ####: the second could have worked, but I then couldn't set the new asset as the active one
                 # ####: I could do that just fine for all existing assets though using assetbrowser space_data.activate_asset_from_id() or whatever it is called
                 # ####: but when creating said asset in the same go it wouldn't work
-                # ####: so I'm no diectly writing to the preview buffer, which takes a couple of seconds and a lot of CPU, but works without any stupid context overrides
-
-                # NOTE: it is now instant thx to the [:] syntax, wow!
-                # ####: see https://blender.stackexchange.com/a/3678/33919
-
-                # load the rendered image, as th render result's pixels (and size) can't be accessed
-                thumb = bpy.data.images.load(filepath=thumbpath)
-
-                # create the preview from the img object's pixels
-                instance.preview_ensure()
-                instance.preview.image_size = thumb.size
-                instance.preview.image_pixels_float[:] = thumb.pixels  # CodeManX is a legend
+                # ####: so I'm no diectly writing to the preview buffer, which works without any stupid context overrides
 
-                # remove the loade and rendered thumb, and remove the file from disk too
-                bpy.data.images.remove(thumb)
-                bpy.data.images.remove(bpy.data.images['Render Result'])
-                os.unlink(thumbpath)
+                # NOTE: the viewport is drawn offscreen, and the pixels go straight into the preview buffer, without saving and loading an image
+                create_viewport_thumbnails(context, [instance], lens=self.thumbnail_lens, overlays=not self.toggle_overlays)
 
             return {'FINISHED'}
 
@@ -390,47 +511,6 @@ class CreateAssemblyAsset(bpy.types.Operator):
                             # ensure the tool props are shown too, so you can set the thumbnail
                             space.show_region_tool_props = True
 
-    def render_viewport(self, context, filepath):
-        '''
-        render asset thumb
-        '''
-
-        # fetch current settings
-        resolution = (context.scene.render.resolution_x, context.scene.render.resolution_y)
-        file_format = context.scene.render.image_settings.file_format
-        lens = context.space_data.lens
-        show_overlays = context.space_data.overlay.show_overlays
-
-        # adjust for thumbnail rendering
-        context.scene.render.resolution_x = 128
-        context.scene.render.resolution_y = 128
-        context.scene.render.image_settings.file_format = 'JPEG'
-
-        context.space_data.lens = self.thumbnail_lens
-
-        if show_overlays and self.toggle_overlays:
-            context.space_data.overlay.show_overlays = False
-
-        # render
-        bpy.ops.render.opengl()
-
-
-        # fetch the render result and save it
-        thumb = bpy.data.images.get('Render Result')
-
-        if thumb:
-            thumb.save_render(filepath=filepath)
-
-        # resstore original settings
-        context.scene.render.resolution_x = resolution[0]
-        context.scene.render.resolution_y = resolution[1]
-        context.space_data.lens = lens
-
-        context.scene.render.image_settings.file_format = file_format
-
-        if show_overlays and self.toggle_overlays:
-            context.space_data.overlay.show_overlays = True
-
 
 class AssembleInstanceCollection(bpy.types.Operator):
     bl_idname = "machin3.assemble_instance_collection"
@@ -618,57 +698,257 @@ class CollectAssets(bpy.types.Operator):
             popup_message("No blend files found in Folder!", title="Info")
             return {'CANCELLED'}
 
+    def modal(self, context, event):
+
+        # poll the background processes, and append the materials of each file as soon as its results are in
+        if event.type == 'TIMER':
+            self.update_collect_workers(context)
+
+            if not self.collect_workers:
+                self.finish_collect_workers(context)
+                return {'FINISHED'}
+
+        elif event.type == 'ESC' and event.value == 'PRESS':
+            self.finish_collect_workers(context, cancel=True)
+
+            print("\nCollecting Assets cancelled, run it again to resume")
+            return {'FINISHED'}
+
+        # prevent undoing and loading files, while materials are still being appended
+        elif event.ctrl and event.type in ['Z', 'Y', 'O', 'N']:
+            return {'RUNNING_MODAL'}
+
+        return {'PASS_THROUGH'}
+
+    def cancel(self, context):
+        '''
+        the modal handler is freed, when a file is loaded, so stop the processes without touching any of the appended materials
+        '''
+
+        self.stop_collect_workers(context, terminate=True)
+        save_collect_manifest(self.cache_dir, self.manifest)
+
     def execute(self, context):
-        mcol = context.scene.collection
+        collectpath = context.scene.M3.asset_collect_path
+
+        self.cache_dir = makedir(os.path.join(collectpath, '.m3_collect'))
+        self.manifest = load_collect_manifest(self.cache_dir)
+
+        catalog = context.window_manager.M3_asset_catalogs
+        self.catalog_id = self.catalogs[catalog]['uuid'] if catalog and catalog != 'NONE' and catalog in self.catalogs else None
+
+        self.collected = []
 
         print()
 
+        # sort the files into those, that have already been collected into the current blend file, those whose worker results are still valid, and those that need to be processed
+        blendpath = bpy.data.filepath
+        pending = []
+
         for path in self.blendfiles:
-            materials = self.append_all(path, 'materials')
+            stat = os.stat(path)
+            entry = self.manifest['files'].get(path)
+
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                if blendpath and self.is_collected(entry, blendpath):
+                    print(f"Skipping unchanged {os.path.basename(path)}, already collected")
+                    continue
+
+                if all(preview is None or os.path.exists(preview) for preview in entry['previews'].values()):
+                    self.collect_file(context, entry)
+                    continue
+
+            pending.append(path)
+
+        if not pending:
+            self.finish_collect_workers(context)
+            return {'FINISHED'}
+
+        return self.start_collect_workers(context, pending)
+
+
+    # WORKERS
+
+    def start_collect_workers(self, context, paths):
+        '''
+        distribute the files among a pool of background blender processes, each gets an equal share of the CPU threads, for preview rendering
+        '''
+
+        worker_count = min(get_prefs().assetbrowser_collect_workers, len(paths))
+        threads = max(1, (os.cpu_count() or 1) // worker_count)
+
+        results_dir = makedir(os.path.join(self.cache_dir, 'results'))
+        previews_dir = makedir(os.path.join(self.cache_dir, 'previews'))
+
+        self.collect_workers = []
+        self.collect_results = {path: os.path.join(results_dir, f"{get_path_hash(path)}.json") for path in paths}
+        self.collect_count = len(paths)
+        self.collect_finished = 0
+
+        print(f"Processing {len(paths)} files in {worker_count} background processes, using {threads} threads each")
+
+        for idx in range(worker_count):
+
+            # interleave the files, so each process gets a similar mix of them
+            jobs = [(path, self.collect_results[path]) for path in paths[idx::worker_count]]
+
+            script = collect_worker_script.format(jobs=jobs, previews_dir=previews_dir, size=collect_preview_size, samples=collect_preview_samples, threads=threads)
+
+            cmd = [bpy.app.binary_path, '-b', '--factory-startup', '-noaudio', '--python-expr', script]
+            process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            self.collect_workers.append((process, [path for path, _ in jobs]))
+
+        # handlers
+        self.TIMER = context.window_manager.event_timer_add(0.5, window=context.window)
+
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def update_collect_workers(self, context):
+        '''
+        pick up the results of finished files, record them in the manifest, and append the files' materials
+        '''
+
+        # poll the processes before picking up the results, so all results of processes that have exited by now are picked up too
+        running = [(process, paths) for process, paths in self.collect_workers if process.poll() is None]
+
+        picked_up = False
+
+        for path, result_path in list(self.collect_results.items()):
+            if os.path.exists(result_path):
+                picked_up = True
+                del self.collect_results[path]
+
+                with open(result_path) as f:
+                    result = json.load(f)
+
+                os.remove(result_path)
+
+                self.collect_finished += 1
+
+                if result.get('error'):
+                    print(f"WARNING: Processing {os.path.basename(path)} failed: {result['error']}")
+                    continue
+
+                # keep which blend files the materials have been collected into, as long as the file remains unchanged
+                entry = self.manifest['files'].get(path)
+                result['collected'] = entry['collected'] if entry and entry['mtime'] == result['mtime'] and entry['size'] == result['size'] else {}
+
+                self.manifest['files'][path] = result
+                self.collect_file(context, result)
+
+        self.collect_workers = running
+
+        # write the manifest after each step that picked up results, so an interrupted collection can be resumed
+        if picked_up:
+            save_collect_manifest(self.cache_dir, self.manifest)
+
+        # progress readout
+        context.workspace.status_text_set(f"Collecting Assets: {self.collect_finished}/{self.collect_count} files processed, {len(self.collected)} materials collected    ESC: Cancel")
+
+    def finish_collect_workers(self, context, cancel=False):
+        '''
+        assign the catalog to all collected materials at once, and remove the timer and status text, and when cancelling terminate the running processes
+        '''
+
+        if not cancel:
+            for path in getattr(self, 'collect_results', []):
+                print(f"WARNING: {os.path.basename(path)} could not be processed")
+
+        self.stop_collect_workers(context, terminate=cancel)
+
+        if self.catalog_id:
+
+            # re-fetch the materials by name, as references can't be trusted across undo steps
+            materials = [mat for name in self.collected if (mat := bpy.data.materials.get(name)) and not mat.library and mat.asset_data]
+
+            print(f"Adding {len(materials)} materials to catalog {context.window_manager.M3_asset_catalogs}")
 
             for mat in materials:
-                if mat:
-                    print(f"Appended Material {mat.name} as asset")
-                    mat.asset_mark()
+                mat.asset_data.catalog_id = self.catalog_id
 
-                    catalog = context.window_manager.M3_asset_catalogs
+        save_collect_manifest(self.cache_dir, self.manifest)
 
-                    if catalog and catalog != 'NONE':
-                        mat.asset_data.catalog_id = self.catalogs[catalog]['uuid']
-                        print(f" adding to catalog {catalog}")
+    def stop_collect_workers(self, context, terminate=False):
+        '''
+        remove the timer and status text, and optionally terminate any still running processes
+        '''
 
-                    dirname = os.path.dirname(path)
-                    basename = os.path.basename(path).replace('.blend', '')
+        if getattr(self, 'TIMER', None):
+            context.window_manager.event_timer_remove(self.TIMER)
+            context.workspace.status_text_set(None)
 
-                    jpgpath = os.path.join(dirname, basename + '.jpg')
-                    pngpath = os.path.join(dirname, basename + '.png')
+            self.TIMER = None
 
-                    if os.path.exists(jpgpath):
-                        print(" using existing .jpg thumbnail")
-                        with context.temp_override(id=mat):
-                            bpy.ops.ed.lib_id_load_custom_preview(filepath=jpgpath)
-                    elif os.path.exists(pngpath):
-                        print(" using existing .png thumbnail")
-                        with context.temp_override(id=mat):
-                            bpy.ops.ed.lib_id_load_custom_preview(filepath=pngpath)
-                    else:
-                        print(" generating new preview")
-                        with context.temp_override(id=mat):
-                            bpy.ops.ed.lib_id_generate_preview()
+            if terminate:
+                for process, _ in self.collect_workers:
+                    process.terminate()
 
-                        time.sleep(0.1)
+                for process, _ in self.collect_workers:
+                    process.wait()
 
-        return {'FINISHED'}
+            self.collect_workers.clear()
+
+
+    # COLLECT
+
+    def collect_file(self, context, entry):
+        '''
+        append the materials found by the worker, mark them as assets, and load the existing thumbnail or the pre-rendered preview
+        '''
+
+        materials = self.append_all(entry['path'], 'materials', names=entry['materials'])
+        collected = []
+
+        for name, mat in zip(entry['materials'], materials):
+            if mat:
+                print(f"Appended Material {mat.name} as asset")
+                mat.asset_mark()
+
+                preview = entry['thumbnail'] or entry['previews'].get(name)
+
+                if preview and os.path.exists(preview):
+                    with context.temp_override(id=mat):
+                        bpy.ops.ed.lib_id_load_custom_preview(filepath=preview)
+
+                else:
+                    print(" WARNING: no preview available")
+
+                collected.append(mat.name)
+
+        self.collected.extend(collected)
+
+        # record the names the materials ended up with, so it can be verified later, if they made it into the saved blend file
+        blendpath = bpy.data.filepath
+
+        if blendpath:
+            entry['collected'][blendpath] = collected
+
+    def is_collected(self, entry, blendpath):
+        '''
+        a file only counts as collected, if all the materials recorded for the current blend file, still exist as local material assets
+        this isn't the case, if the blend file was closed without saving or reverted after collecting
+        '''
+
+        names = entry['collected'].get(blendpath)
+
+        if names is None or len(names) != len(entry['materials']):
+            return False
+
+        return all((mat := bpy.data.materials.get(name)) and not mat.library and mat.asset_data for name in names)
 
-    def append_all(self, filepath, collection, link=False, relative=False):
+    def append_all(self, filepath, collection, names=None, link=False, relative=False):
         if os.path.exists(filepath):
 
             with bpy.data.libraries.load(filepath, link=link, relative=relative) as (data_from, data_to):
 
-                for name in getattr(data_from, collection):
+                # with names passed in, the library contents don't need to be read again
+                for name in (getattr(data_from, collection) if names is None else names):
                     getattr(data_to, collection).append(name)
 
             return getattr(data_to, collection)
 
         else:
             print("The file %s does not exist" % (filepath))
+            return []
@@ -1,10 +1,10 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 import bmesh
-from mathutils.geometry import distance_point_to_plane
 from mathutils import Vector
-import math
+import numpy as np
 from .. utils.draw import draw_fading_label
+from .. utils.mesh import get_mesh_data, get_loose_masks, get_non_manifold_mask, get_non_planar_mask, get_redundant_edges_mask, get_redundant_verts_mask
 from .. utils.registration import get_prefs
 from .. items import cleanup_select_items
 from .. colors import white, green, red, yellow
@@ -109,13 +109,13 @@ class CleanUp(bpy.types.Operator):
         is_any_non_manifold = False
 
         for obj in sel:
-            bm, elementcounts, is_non_manifold = self.clean_up(obj)
+            bm, data, elementcounts, is_non_manifold = self.clean_up(obj)
 
             if is_non_manifold:
                 is_any_non_manifold = True
 
             if self.select:
-                self.select_geometry(bm)
+                self.select_geometry(bm, data)
 
             cleanedcounts = self.get_element_counts(bm)
             bmesh.update_edit_mesh(obj.data)
@@ -174,21 +174,23 @@ class CleanUp(bpy.types.Operator):
             bmesh.ops.dissolve_degenerate(bm, edges=bm.edges, dist=self.distance)
 
         if self.delete_loose:
-            self.delete_loose_geometry(bm)
+            self.delete_loose_geometry(active, bm)
 
         if self.dissolve_redundant:
-            self.dissolve_redundant_geometry(bm)
+            self.dissolve_redundant_geometry(active, bm)
 
         if self.recalc_normals:
             bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
 
             if self.flip_normals:
-                for f in bm.faces:
-                    f.normal_flip()
+                bmesh.ops.reverse_faces(bm, faces=bm.faces)
 
-        is_non_manifold = any([e for e in bm.edges if not e.is_manifold])
+        # analyse the cleaned up mesh once, for the non-manifold check and the selection
+        data = get_mesh_data(active)
 
-        return bm, elementcounts, is_non_manifold
+        is_non_manifold = bool(get_non_manifold_mask(data).any())
+
+        return bm, data, elementcounts, is_non_manifold
 
     def get_element_counts(self, bm):
         '''
@@ -196,38 +198,43 @@ class CleanUp(bpy.types.Operator):
         '''
         return len(bm.verts), len(bm.edges), len(bm.faces)
 
-    def delete_loose_geometry(self, bm):
-        if self.delete_loose_verts:
-            loose_verts = [v for v in bm.verts if not v.link_edges]
-            if loose_verts:
-                bmesh.ops.delete(bm, geom=loose_verts, context="VERTS")
+    def get_elements(self, seq, mask):
+        '''
+        get the bmesh elements for the indices of a mask from the mesh analysis
+        '''
+
+        seq.ensure_lookup_table()
+        return [seq[i] for i in np.flatnonzero(mask)]
+
+    def delete_loose_geometry(self, active, bm):
+        '''
+        removing loose verts and edges doesn't affect the loose-ness of other elements, so analyse the mesh only once
+        '''
+
+        loose_verts, loose_edges, loose_faces = get_loose_masks(get_mesh_data(active))
+
+        # fetch all elements before deleting any, as deleting invalidates the lookup tables
+        verts = self.get_elements(bm.verts, loose_verts) if self.delete_loose_verts else []
+        edges = self.get_elements(bm.edges, loose_edges) if self.delete_loose_edges else []
+        faces = self.get_elements(bm.faces, loose_faces) if self.delete_loose_faces else []
 
-        if self.delete_loose_edges:
-            loose_edges = [e for e in bm.edges if not e.link_faces]
-            if loose_edges:
-                bmesh.ops.delete(bm, geom=loose_edges, context="EDGES")
+        if verts:
+            bmesh.ops.delete(bm, geom=verts, context="VERTS")
 
-        if self.delete_loose_faces:
-            loose_faces = [f for f in bm.faces if all([not e.is_manifold for e in f.edges])]
-            if loose_faces:
-                bmesh.ops.delete(bm, geom=loose_faces, context="FACES")
+        if edges:
+            bmesh.ops.delete(bm, geom=edges, context="EDGES")
 
-    def dissolve_redundant_geometry(self, bm):
+        if faces:
+            bmesh.ops.delete(bm, geom=faces, context="FACES")
+
+    def dissolve_redundant_geometry(self, active, bm):
         '''
         dissolve redundant verts on straight edges
         dissolve redundant edges on flat faces
         '''
 
         if self.dissolve_redundant_edges:
-            manifold_edges = [e for e in bm.edges if e.is_manifold]
-
-            redundant_edges = []
-
-            for e in manifold_edges:
-                angle = math.degrees(e.calc_face_angle(0))
-
-                if angle < 180 - self.dissolve_redundant_angle:
-                    redundant_edges.append(e)
+            redundant_edges = self.get_elements(bm.edges, get_redundant_edges_mask(get_mesh_data(active), angle=self.dissolve_redundant_angle))
 
             bmesh.ops.dissolve_edges(bm, edges=redundant_edges, use_verts=False)
 
@@ -237,53 +244,29 @@ class CleanUp(bpy.types.Operator):
 
         # also run vert removal after edge removal to ensure verts from symmetry center lines get removed properly
         if self.dissolve_redundant_verts:
-            two_edged_verts = [v for v in bm.verts if len(v.link_edges) == 2]
-
-            redundant_verts = []
-
-            for v in two_edged_verts:
-                e1 = v.link_edges[0]
-                e2 = v.link_edges[1]
-
-                vector1 = e1.other_vert(v).co - v.co
-                vector2 = e2.other_vert(v).co - v.co
-
-                angle = min(math.degrees(vector1.angle(vector2)), 180)
-
-                if self.dissolve_redundant_angle < angle:
-                    redundant_verts.append(v)
+            redundant_verts = self.get_elements(bm.verts, get_redundant_verts_mask(get_mesh_data(active), angle=self.dissolve_redundant_angle))
 
             bmesh.ops.dissolve_verts(bm, verts=redundant_verts)
 
-    def select_geometry(self, bm):
-        for f in bm.faces:
-            f.select = False
+    def select_geometry(self, bm, data):
 
-        bm.select_flush(False)
+        # deselect only what's actually selected
+        for seq, mask in [(bm.faces, data['selected_faces']), (bm.edges, data['selected_edges']), (bm.verts, data['selected_verts'])]:
+            for element in self.get_elements(seq, mask):
+                element.select = False
 
         if self.select_type == "NON-MANIFOLD":
-            edges = [e for e in bm.edges if not e.is_manifold]
-
-            for e in edges:
+            for e in self.get_elements(bm.edges, get_non_manifold_mask(data)):
                 e.select = True
 
         elif self.select_type == "NON-PLANAR":
-            faces = [f for f in bm.faces if len(f.verts) > 3]
-
-            for f in faces:
-                distances = [distance_point_to_plane(v.co, f.calc_center_median(), f.normal) for v in f.verts]
-
-                if any([d for d in distances if abs(d) > self.planar_threshold]):
-                    f.select_set(True)
+            for f in self.get_elements(bm.faces, get_non_planar_mask(data, threshold=self.planar_threshold)):
+                f.select_set(True)
 
         elif self.select_type == "TRIS":
-            faces = [f for f in bm.faces if len(f.verts) == 3]
-
-            for f in faces:
+            for f in self.get_elements(bm.faces, data['loop_totals'] == 3):
                 f.select = True
 
         elif self.select_type == "NGONS":
-            faces = [f for f in bm.faces if len(f.verts) > 4]
-
-            for f in faces:
+            for f in self.get_elements(bm.faces, data['loop_totals'] > 4):
                 f.select = True
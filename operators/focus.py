@@ -71,17 +71,25 @@ class Focus(bpy.types.Operator):
                 for mod in mirrors:
                     mod.show_viewport = False
 
+        # the meshes keep track of the selected vert counts in edit mode, so nothing needs to be looped over to find out if anything is selected
+        # NOTE: if nothing is selected in any of the edited meshes, (de)selecting all is done in one pass by the native op, as that then can't wipe any other selection
+        # ####: only if other edited meshes have a selection, the active mesh is (de)selected via its edit bmesh
         elif mode == 'EDIT_MESH':
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            bm.normal_update()
-
-            nothing_selected = not [v for v in bm.verts if v.select]
+            nothing_selected = not context.active_object.data.total_vert_sel
 
             if nothing_selected:
-                for v in bm.verts:
-                    v.select_set(True)
+                select_all = not any(obj.data.total_vert_sel for obj in context.objects_in_mode if obj.type == 'MESH')
+
+                if select_all:
+                    bpy.ops.mesh.select_all(action='SELECT')
+
+                else:
+                    bm = bmesh.from_edit_mesh(context.active_object.data)
 
-                bm.select_flush(True)
+                    for v in bm.verts:
+                        v.select_set(True)
+
+                    bm.select_flush(True)
 
         bpy.ops.view3d.view_selected('INVOKE_DEFAULT') if get_prefs().focus_view_transition else bpy.ops.view3d.view_selected()
 
@@ -94,10 +102,14 @@ class Focus(bpy.types.Operator):
                     obj.select_set(False)
 
             elif mode == 'EDIT_MESH':
-                for f in bm.faces:
-                    f.select_set(False)
+                if select_all:
+                    bpy.ops.mesh.select_all(action='DESELECT')
+
+                else:
+                    for f in bm.faces:
+                        f.select_set(False)
 
-                bm.select_flush(False)
+                    bm.select_flush(False)
 
     def local_view(self, context, debug=False):
         def focus(context, view, sel, history, init=False, invert=False, lights=[]):
@@ -277,6 +277,10 @@ class MaterialPicker(bpy.types.Operator):
         # reset statusbar
         finish_status(self)
 
+        # free the raycasting bmeshes
+        for bm in self.bmeshes.values():
+            bm.free()
+
         if context.visible_objects:
             context.visible_objects[0].select_set(context.visible_objects[0].select_get())
 
@@ -290,6 +294,11 @@ class MaterialPicker(bpy.types.Operator):
         # get the depsgraph
         self.dg = context.evaluated_depsgraph_get()
 
+        # init edit mode raycasting caches
+        self.bmeshes = {}
+        self.bvhs = {}
+        self.bboxes = {}
+
         # init mouse cursor
         init_cursor(self, event)
         context.window.cursor_set("EYEDROPPER")
@@ -438,7 +447,11 @@ class MaterialPicker(bpy.types.Operator):
 
         elif context.mode == 'EDIT_MESH':
             # hitobj, _, _, hitindex, _, _ = cast_bvh_ray_from_mouse(self.mousepos, candidates=[obj for obj in context.visible_objects if obj.mode == 'EDIT'], debug=False)
-            hitobj, _, _, hitindex, _, _ = cast_bvh_ray_from_mouse(self.mouse_pos, candidates=[obj for obj in context.visible_objects], debug=False)
+            hitobj, _, _, hitindex, _, cache = cast_bvh_ray_from_mouse(self.mouse_pos, candidates=[obj for obj in context.visible_objects], bmeshes=self.bmeshes, bvhs=self.bvhs, bboxes=self.bboxes, debug=False)
+
+            # keep the newly created bmeshes and BVHs around for the next mouse move
+            self.bmeshes.update(cache['bmesh'])
+            self.bvhs.update(cache['bvh'])
 
         if hitobj:
 
@@ -8,7 +8,7 @@ from .. utils.object import get_eval_bbox
 from .. utils.math import compare_matrix
 from .. utils.modifier import remove_mod, get_mod_obj, move_mod
 from .. utils.ui import get_zoom_factor, get_flick_direction, init_status, finish_status
-from .. utils.draw import draw_vector, draw_circle, draw_point, draw_label, draw_bbox, draw_cross_3d
+from .. utils.draw import draw_vector, draw_circle, draw_point, draw_label, draw_bbox, draw_cross_3d, clear_batches
 from .. utils.system import printd
 from .. utils.property import step_list
 from .. utils.view import get_loc_2d
@@ -173,7 +173,7 @@ class Mirror(bpy.types.Operator):
 
             color = red if self.remove else white
             alpha = 0.2 if self.remove else 0.02
-            draw_circle(self.init_mouse, radius=self.flick_distance, width=3, color=color, alpha=alpha)
+            draw_circle(self.init_mouse, radius=self.flick_distance, width=3, color=color, alpha=alpha, key=('Mirror', 'flick_circle'))
 
             title = 'Remove' if self.remove else 'Mirror'
             alpha = 1 if self.remove else 0.8
@@ -204,7 +204,7 @@ class Mirror(bpy.types.Operator):
                 if self.passthrough:
                     self.mirror_obj_2d = get_loc_2d(context, self.mirror_obj.matrix_world.to_translation())
 
-                draw_circle(self.mirror_obj_2d, radius=10 * self.scale, width=2 * self.scale, color=blue, alpha=1)
+                draw_circle(self.mirror_obj_2d, radius=10 * self.scale, width=2 * self.scale, color=blue, alpha=1, key=('Mirror', 'mirror_obj_circle'))
 
     def draw_VIEW3D(self, context):
         for direction, axis, color in zip(self.axes.keys(), self.axes.values(), self.colors):
@@ -223,7 +223,7 @@ class Mirror(bpy.types.Operator):
 
             if self.mirror_obj.type == 'MESH':
                 bbox = get_eval_bbox(self.mirror_obj)
-                draw_bbox(bbox, mx=mx, color=yellow, corners=0.1, width=2 * self.scale, alpha=0.5)
+                draw_bbox(bbox, mx=mx, color=yellow, corners=0.1, width=2 * self.scale, alpha=0.5, key=('Mirror', 'mirror_obj_bbox'))
 
             elif self.mirror_obj.type == 'EMPTY':
                 # get cursor's local space location haha
@@ -392,6 +392,8 @@ class Mirror(bpy.types.Operator):
         bpy.types.SpaceView3D.draw_handler_remove(self.HUD, 'WINDOW')
         bpy.types.SpaceView3D.draw_handler_remove(self.VIEW3D, 'WINDOW')
 
+        clear_batches(owner='Mirror')
+
         finish_status(self)
 
         # force statusbar update
@@ -1,12 +1,30 @@
 import bpy
 from bpy.props import BoolProperty
 from .. utils.registration import get_prefs
-from .. utils.system import makedir
+from .. utils.system import makedir, get_temp_dir
 from .. utils.math import dynamic_format
 import os
 import datetime
 import time
 import platform
+import subprocess
+import numpy as np
+
+
+# executed by each background blender process of a parallel seed render
+seed_worker_script = """
+import bpy
+
+scene = bpy.data.scenes[{scene!r}]
+
+scene.cycles.seed = {seed}
+scene.render.threads_mode = 'FIXED'
+scene.render.threads = {threads}
+scene.render.use_compositing = {compositing}
+
+bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene=scene.name)
+bpy.data.images['Render Result'].save_render(filepath={path!r}, scene=scene)
+"""
 
 
 class Render(bpy.types.Operator):
@@ -34,6 +52,9 @@ class Render(bpy.types.Operator):
 
         if properties.seed:
             desc = f"Render {get_prefs().render_seed_count} seeds, combine all, and save to {outpath + os.sep}"
+
+            if get_prefs().render_seed_parallel:
+                desc += f"\nSeeds are rendered in parallel, in {get_prefs().render_seed_workers} background processes"
         else:
             desc = f"Render and save to {outpath + os.sep}"
 
@@ -89,6 +110,41 @@ class Render(bpy.types.Operator):
 
         return self.execute(context)
 
+    def modal(self, context, event):
+
+        # poll the background processes of a parallel seed render
+        if event.type == 'TIMER':
+            self.update_seed_workers(context)
+
+            if not self.seed_queue and not self.seed_workers:
+                self.finish_seed_workers(context)
+
+                # combine the seed renderings that made it
+                seedpaths = sorted(self.seed_paths.items())
+
+                if not seedpaths:
+                    print("\nWARNING: All Seed Renderings failed")
+                    self.reset_render_settings()
+                    return {'CANCELLED'}
+
+                save_path = self.combine_seed_renderings(seedpaths)
+
+                # the cryptomatte is exported by the last seed's process, so it's only available if that one succeeded
+                matte_path = self.rename_file_output(self.seed_matte_basename) if self.seed_matte_basename and self.settings['seed_count'] - 1 in self.seed_paths else None
+
+                self.finish_render(self.starttime, save_path, matte_path)
+                return {'FINISHED'}
+
+        elif event.type == 'ESC' and event.value == 'PRESS':
+            self.finish_seed_workers(context, cancel=True)
+
+            print("\nSeed Rendering cancelled")
+
+            self.reset_render_settings()
+            return {'CANCELLED'}
+
+        return {'PASS_THROUGH'}
+
     def execute(self, context):
 
         # fetch initial time
@@ -106,36 +162,27 @@ class Render(bpy.types.Operator):
         # prepare rendering terminial output, disable compositing open render view
         self.prepare_rendering()
 
+        # only final renders export a cryptomatte
+        matte_path = None
+
         # seed render
         if self.seed:
 
             # clear out compositing nodes, and remove potential previous seed renderings
             self.clear_out_compositor()
 
-            # do count renderings, each with a different seed
-            seedpaths, matte_path = self.seed_render()
-
-            # load previously saved seed renderings
-            images = self.load_seed_renderings(seedpaths)
-
-            # setup the compositor for firefly removal by mixing the seed renderings
-            basename = self.get_save_path(suffix='seed')
-            self.setup_compositor_for_firefly_removal(images, basename)
+            # prepare combining the seed renderings, as they come in
+            self.init_seed_combiner()
 
-            # render compositor
-            bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+            # fan out the seeds to background processes, and keep the UI responsive while they render
+            if get_prefs().render_seed_parallel:
+                return self.start_seed_workers(context, starttime)
 
-            # remove the frame number from the composed image, and properly set the datetime
-            save_path = self.rename_file_output(basename)
-
-            # remove individual seed renderings
-            if not get_prefs().render_keep_seed_renderings:
-                for _, path in seedpaths:
-                    os.remove(path)
+            # do count renderings, each with a different seed
+            seedpaths, matte_path = self.seed_render()
 
-                # clear out the compositor too, but note that when final is enabled this happens anyway
-                if not self.final:
-                    self.clear_out_compositor()
+            # combine them, removing the fireflies
+            save_path = self.combine_seed_renderings(seedpaths)
 
         # quick render
         else:
@@ -159,6 +206,14 @@ class Render(bpy.types.Operator):
             img = bpy.data.images.get('Render Result')
             img.save_render(filepath=save_path)
 
+        self.finish_render(starttime, save_path, matte_path)
+        return {'FINISHED'}
+
+    def finish_render(self, starttime, save_path, matte_path):
+        '''
+        print out the render time, reset the render settings and bring the cryptomatte into the compositor for final renders
+        '''
+
         # final terminal output
         rendertime = datetime.timedelta(seconds=int(time.time() - starttime))
         print(f"\nRendering finished after {rendertime}")
@@ -168,11 +223,9 @@ class Render(bpy.types.Operator):
         self.reset_render_settings()
 
         # bring cryptomatte into compositor
-        if self.final:
+        if self.final and matte_path:
             self.setup_compositor_for_final_composing(save_path, matte_path)
 
-        return {'FINISHED'}
-
 
     # GENERAL
 
@@ -409,8 +462,8 @@ class Render(bpy.types.Operator):
         scene.use_nodes = self.settings['use_nodes']
         render.use_compositing = self.settings['use_compositing']
 
-        # for seed rendings, but non-final ones, where the seed renderings are kept, and where use_nodes was disabled initially, enable it, otherwise the previews in the compositor won't work
-        if get_prefs().render_keep_seed_renderings and self.seed and not self.final and not scene.use_nodes:
+        # for seed rendings, but non-final ones, where the seed renderings are kept in the compositor, and where use_nodes was disabled initially, enable it, otherwise the previews in the compositor won't work
+        if get_prefs().render_keep_seed_renderings and self.seed and not self.seed_streaming and not self.final and not scene.use_nodes:
             scene.use_nodes = True
 
     def rename_file_output(self, basename):
@@ -428,6 +481,20 @@ class Render(bpy.types.Operator):
 
         comp_path = os.path.join(outpath, f"{basename}{str(scene.frame_current).zfill(4)}.{ext}")
 
+        save_path = self.get_datetime_path(basename)
+        os.rename(comp_path, save_path)
+
+        return save_path
+
+    def get_datetime_path(self, basename):
+        '''
+        replace the DATETIME placeholder of a suffix basename, and return the full path
+        a tiny delay is created, to ensure the time code is later than the one of the last seed rendering
+        '''
+
+        outpath = self.settings['outpath']
+        ext = self.settings['ext']
+
         time.sleep(1)
         now = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
 
@@ -436,10 +503,7 @@ class Render(bpy.types.Operator):
 
         basename = basename.replace('DATETIME', now)
 
-        save_path = os.path.join(outpath, f"{basename}.{ext}")
-        os.rename(comp_path, save_path)
-
-        return save_path
+        return os.path.join(outpath, f"{basename}.{ext}")
 
 
     # SEED
@@ -482,6 +546,9 @@ class Render(bpy.types.Operator):
             img.save_render(filepath=save_path)
             seedpaths.append((i, save_path))
 
+            # fold it into the combined image right away
+            self.add_seed_rendering(save_path)
+
             # temporaryily change the Render Result image name and update the UI as simple progress indication
             img.name = f"Render Seed {i} ({i + 1}/{count})"
             bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)
@@ -489,6 +556,46 @@ class Render(bpy.types.Operator):
 
         return seedpaths, matte_path
 
+    def combine_seed_renderings(self, seedpaths):
+        '''
+        combine the seed renderings to remove fireflies, and return the path of the combined image
+        usually they have already been combined as they came in, and only need to be saved out, but multilayer EXRs are still combined in the compositor
+        '''
+
+        if self.seed_streaming:
+            save_path = self.save_combined_seed_rendering()
+
+            # remove individual seed renderings
+            if not get_prefs().render_keep_seed_renderings:
+                for _, path in seedpaths:
+                    os.remove(path)
+
+            return save_path
+
+        # load previously saved seed renderings
+        images = self.load_seed_renderings(seedpaths)
+
+        # setup the compositor for firefly removal by mixing the seed renderings
+        basename = self.get_save_path(suffix='seed')
+        self.setup_compositor_for_firefly_removal(images, basename)
+
+        # render compositor
+        bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+
+        # remove the frame number from the composed image, and properly set the datetime
+        save_path = self.rename_file_output(basename)
+
+        # remove individual seed renderings
+        if not get_prefs().render_keep_seed_renderings:
+            for _, path in seedpaths:
+                os.remove(path)
+
+            # clear out the compositor too, but note that when final is enabled this happens anyway
+            if not self.final:
+                self.clear_out_compositor()
+
+        return save_path
+
     def load_seed_renderings(self, seedpaths):
         '''
         load the previously saved seed renderings
@@ -511,7 +618,7 @@ class Render(bpy.types.Operator):
         setup compositing node tree, combining the individual seed renderings using darke mix mode to remove fireflies
         '''
 
-        count = self.settings['seed_count']
+        count = len(images)
         scene = self.settings['scene']
         render = self.settings['render']
         tree = self.settings['tree']
@@ -579,6 +686,219 @@ class Render(bpy.types.Operator):
         output.save_as_render = False
 
 
+    # SEED COMBINER
+
+    def init_seed_combiner(self):
+        '''
+        seed renderings are combined into a running per-pixel minimum, as they come in, which is what the Darken mix does too
+        multilayer EXRs can't be accessed as a single pixel buffer, so those are still combined in the compositor
+        '''
+
+        self.seed_streaming = self.settings['render'].image_settings.file_format != 'OPEN_EXR_MULTILAYER'
+
+        self.seed_combined = None
+        self.seed_buffer = None
+        self.seed_carrier_path = None
+        self.seed_combined_count = 0
+
+    def add_seed_rendering(self, path):
+        '''
+        load a seed rendering and fold its pixels into the combined minimum
+        only the combined and the incoming pixel buffers are kept around, the loaded image is removed immediately
+        '''
+
+        if not self.seed_streaming:
+            return
+
+        img = bpy.data.images.load(filepath=path, check_existing=False)
+
+        width, height = img.size
+        channels = img.channels
+        size = width * height * channels
+
+        # the first seed initializes the combined buffer, and its file is later used to save out the combined pixels in the same format
+        if self.seed_combined is None:
+            self.seed_combined = np.empty(size, dtype=np.float32)
+            img.pixels.foreach_get(self.seed_combined)
+
+            self.seed_carrier_path = path
+
+        elif size != self.seed_combined.size:
+            print(f" WARNING: Seed rendering {path} doesn't match the size of the previous ones, ignoring it")
+
+            bpy.data.images.remove(img)
+            return
+
+        else:
+            if self.seed_buffer is None:
+                self.seed_buffer = np.empty(size, dtype=np.float32)
+
+            img.pixels.foreach_get(self.seed_buffer)
+
+            # darken the color channels, but leave the alpha alone
+            color = slice(0, min(channels, 3))
+
+            combined = self.seed_combined.reshape(-1, channels)
+            buffer = self.seed_buffer.reshape(-1, channels)
+
+            np.minimum(combined[:, color], buffer[:, color], out=combined[:, color])
+
+        self.seed_combined_count += 1
+        bpy.data.images.remove(img)
+
+    def save_combined_seed_rendering(self):
+        '''
+        write the combined pixels into the first seed's image, and save it under the combined name
+        using Image.save() instead of save_render(), avoids applying the view transform a second time
+        '''
+
+        print(f"\nCombined {self.seed_combined_count} Renders")
+
+        save_path = self.get_datetime_path(self.get_save_path(suffix='seed'))
+
+        img = bpy.data.images.load(filepath=self.seed_carrier_path, check_existing=False)
+        img.pixels.foreach_set(self.seed_combined)
+
+        img.filepath_raw = save_path
+        img.save()
+
+        bpy.data.images.remove(img)
+
+        self.seed_combined = None
+        self.seed_buffer = None
+
+        return save_path
+
+
+    # PARALLEL SEED
+
+    def start_seed_workers(self, context, starttime):
+        '''
+        save a copy of the current file, to be rendered by a pool of background blender processes, one process per seed
+        each process gets an equal share of the CPU threads, and seeds are streamed back, as the processes finish
+        '''
+
+        count = self.settings['seed_count']
+        scene = self.settings['scene']
+
+        self.starttime = starttime
+
+        # for final renders, set up the cryptomatte export before saving the copy, it's only enabled for the last seed's process
+        self.seed_matte_basename = None
+
+        if self.final:
+            self.seed_matte_basename = self.get_save_path(suffix='clownmatte' if get_prefs().render_use_clownmatte_naming else 'cryptomatte')
+            self.setup_compositor_for_cryptomatte_export(self.seed_matte_basename)
+
+        # the copy holds the current, potentially unsaved state, including the adjusted render quality
+        self.seed_blend_path = os.path.join(get_temp_dir(context), f"{self.settings['blendname']}_seed_render_{os.getpid()}.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=self.seed_blend_path, check_existing=False, copy=True)
+
+        if self.final:
+            self.clear_out_compositor()
+
+        worker_count = min(get_prefs().render_seed_workers, count)
+
+        self.seed_threads = max(1, (os.cpu_count() or 1) // worker_count)
+        self.seed_worker_count = worker_count
+        self.seed_scene_name = scene.name
+
+        self.seed_queue = list(range(count))
+        self.seed_workers = {}
+        self.seed_paths = {}
+
+        print(f" Rendering in {worker_count} background processes, using {self.seed_threads} threads each")
+
+        self.update_seed_workers(context)
+
+        # handlers
+        self.TIMER = context.window_manager.event_timer_add(0.5, window=context.window)
+
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def update_seed_workers(self, context):
+        '''
+        collect finished seed renderings, and start new processes for the remaining seeds
+        '''
+
+        count = self.settings['seed_count']
+
+        for seed, (process, path, log) in list(self.seed_workers.items()):
+            returncode = process.poll()
+
+            if returncode is None:
+                continue
+
+            del self.seed_workers[seed]
+            log.close()
+
+            if returncode == 0 and os.path.exists(path):
+                self.seed_paths[seed] = path
+                print(" Seed:", seed)
+
+                # fold it into the combined image right away
+                self.add_seed_rendering(path)
+
+                os.remove(log.name)
+
+            else:
+                print(f" WARNING: Seed {seed} failed with return code {returncode}, see {log.name}")
+
+                # print the tail of the log, which is where a python error in the worker script ends up
+                with open(log.name, errors='replace') as f:
+                    for line in f.readlines()[-10:]:
+                        print("  ", line.rstrip())
+
+        while self.seed_queue and len(self.seed_workers) < self.seed_worker_count:
+            seed = self.seed_queue.pop(0)
+            path = self.get_save_path(seed=seed)
+
+            script = seed_worker_script.format(scene=self.seed_scene_name, seed=seed, threads=self.seed_threads, compositing=self.final and seed == count - 1, path=path)
+
+            # without --python-exit-code, an error in the script would still exit with 0
+            cmd = [bpy.app.binary_path, '-b', self.seed_blend_path, '-noaudio', '--python-exit-code', '1', '--python-expr', script]
+
+            log = open(os.path.join(get_temp_dir(context), f"{self.settings['blendname']}_seed_render_{os.getpid()}_{seed}.log"), 'w')
+            process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=log)
+
+            self.seed_workers[seed] = (process, path, log)
+
+        # progress readout
+        context.workspace.status_text_set(f"Seed Rendering: {len(self.seed_paths)}/{count} finished, {len(self.seed_workers)} rendering    ESC: Cancel")
+
+    def finish_seed_workers(self, context, cancel=False):
+        '''
+        remove the timer, status text and file copy, and when cancelling, terminate running processes and remove their partial results
+        '''
+
+        context.window_manager.event_timer_remove(self.TIMER)
+        context.workspace.status_text_set(None)
+
+        if cancel:
+            self.seed_queue.clear()
+
+            for process, _, _ in self.seed_workers.values():
+                process.terminate()
+
+            for process, _, log in self.seed_workers.values():
+                process.wait()
+                log.close()
+
+                if os.path.exists(log.name):
+                    os.remove(log.name)
+
+            self.seed_workers.clear()
+
+            if not get_prefs().render_keep_seed_renderings:
+                for path in self.seed_paths.values():
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        if os.path.exists(self.seed_blend_path):
+            os.remove(self.seed_blend_path)
+
+
     # FINAL
 
     def setup_compositor_for_cryptomatte_export(self, basename):
@@ -3,7 +3,7 @@ from bpy.props import EnumProperty, BoolProperty, StringProperty
 from mathutils import Vector
 from .. utils.draw import draw_fading_label, get_text_dimensions
 from .. utils.modifier import get_mod_obj
-from .. utils.object import get_object_hierarchy_layers, get_parent
+from .. utils.object import get_parent, get_hierarchy_children, get_hierarchy_idx, get_top_hierarchy_objects
 from .. utils.registration import get_prefs
 from .. utils.view import ensure_visibility
 from .. colors import yellow, red, green, white
@@ -141,14 +141,11 @@ class SelectHierarchy(bpy.types.Operator):
         time = get_prefs().HUD_fade_select_hierarchy
         scale = context.preferences.system.ui_scale
 
-        # sort view_layer objects into hierarchical list of lists of layers based on their parent child relationships
-        layers = get_object_hierarchy_layers(context, debug=False)
-
 
         # SELECT UP
 
         if self.direction == 'UP':
-            ret = self.select_up(context, context.selected_objects, layers)
+            ret = self.select_up(context, context.selected_objects)
 
             # REACHED TOP
 
@@ -198,7 +195,7 @@ class SelectHierarchy(bpy.types.Operator):
         # SELECT DOWN
 
         elif self.direction == 'DOWN':
-            ret = self.select_down(context, context.selected_objects, layers)
+            ret = self.select_down(context, context.selected_objects)
 
             # REACHED BOTTOM
 
@@ -251,13 +248,15 @@ class SelectHierarchy(bpy.types.Operator):
 
     # UTILS
 
-    def select_up(self, context, objects, layers, debug=False): 
+    def select_up(self, context, objects, debug=False): 
         '''
         based on the current selection select down
         '''
 
         # debug = True
 
+        view_layer = context.view_layer
+
         parents = set()
         init_selection = set(objects)
 
@@ -274,7 +273,7 @@ class SelectHierarchy(bpy.types.Operator):
 
             # then collect the parent's  or recursive parentst for actual selection use
             if self.recursive_up:
-                parents.update({p for p in get_parent(obj, recursive=True) if p.name in context.view_layer.objects})
+                parents.update({p for p in get_parent(obj, recursive=True) if get_hierarchy_idx(view_layer, p) is not None})
 
             elif obj.parent:
                 parents.add(obj.parent)
@@ -342,33 +341,31 @@ class SelectHierarchy(bpy.types.Operator):
         # selection did change, ensure the active object - if there is one initially - that it is now among the top level children
         elif active := context.active_object:
 
-            # find first layer in the view_layer's object hierarchy, where now selected visible children are present, this is out top layer
-            for layer in layers:
-                if (top_lvl_parents := set(layer) & visible_parents):
+            # find the top most of the now selected visible parents in the view_layer's object hierarchy
+            top_lvl_parents = get_top_hierarchy_objects(view_layer, visible_parents)
 
-                    # NOTE: has to be a separate line, because we alwas want the break once we find top_lvl_parents
-                    # while we only want to change the active, if it's not among those already, whic his a separate action
-                    if active not in top_lvl_parents:
-                        
-                        # check if there are group empties, and if so prefer to make a group empty active, instead of a regular object
-                        group_empties = [obj for obj in top_lvl_parents if obj.M3.is_group_empty]
+            # only change the active, if it's not among those already
+            if top_lvl_parents and active not in top_lvl_parents:
 
-                        if group_empties:
-                            context.view_layer.objects.active = group_empties[0]
-                        else:
-                            context.view_layer.objects.active = top_lvl_parents.pop()
+                # check if there are group empties, and if so prefer to make a group empty active, instead of a regular object
+                group_empties = [obj for obj in top_lvl_parents if obj.M3.is_group_empty]
 
-                    break
+                if group_empties:
+                    context.view_layer.objects.active = group_empties[0]
+                else:
+                    context.view_layer.objects.active = top_lvl_parents.pop()
 
         return True
 
-    def select_down(self, context, objects, layers, debug=False): 
+    def select_down(self, context, objects, debug=False): 
         '''
         based on the current selection select down
         '''
         
         # debug = True
 
+        view_layer = context.view_layer
+
         children = set()
         init_selection = set(objects)
 
@@ -384,10 +381,7 @@ class SelectHierarchy(bpy.types.Operator):
         for obj in init_selection:
 
             # then collect the children or recursive children for actual selection use
-            if self.recursive_down:
-                children.update({c for c in obj.children_recursive if c.name in context.view_layer.objects})
-            else:
-                children.update({c for c in obj.children if c.name in context.view_layer.objects})
+            children.update(get_hierarchy_children(view_layer, obj, recursive=self.recursive_down))
 
             # optionally collect mod objects too
             if self.include_mod_objects:
@@ -395,7 +389,7 @@ class SelectHierarchy(bpy.types.Operator):
                     if mod.show_viewport:
                         modobj = get_mod_obj(mod)
 
-                        if modobj and modobj.name in context.view_layer.objects:
+                        if modobj and get_hierarchy_idx(view_layer, modobj) is not None:
                             children.add(modobj)
 
         # unhide (and ensure objects are in local view)
@@ -453,22 +447,18 @@ class SelectHierarchy(bpy.types.Operator):
         # selection did change, ensure the active object - if there is one initially - that it is now among the top level children
         elif active := context.active_object:
 
-            # find first layer in the view_layer's object hierarchy, where now selected visible children are present, this is out top layer
-            for layer in layers:
-                if (top_lvl_children := set(layer) & visible_children):
+            # find the top most of the now selected visible children in the view_layer's object hierarchy
+            top_lvl_children = get_top_hierarchy_objects(view_layer, visible_children)
 
-                    # NOTE: has to be a separate line, because we alwas want the break once we find top_lvl_children
-                    # while we only want to change the active, if it's not among those already, which his a separate action
-                    if active not in top_lvl_children:
-                    
-                        # check if there are group empties, and if so prefer to make a group empty active, instead of a regular object
-                        group_empties = [obj for obj in top_lvl_children if obj.M3.is_group_empty]
+            # only change the active, if it's not among those already
+            if top_lvl_children and active not in top_lvl_children:
 
-                        if group_empties:
-                            context.view_layer.objects.active = group_empties[0]
-                        else:
-                            context.view_layer.objects.active = top_lvl_children.pop()
+                # check if there are group empties, and if so prefer to make a group empty active, instead of a regular object
+                group_empties = [obj for obj in top_lvl_children if obj.M3.is_group_empty]
 
-                    break
+                if group_empties:
+                    context.view_layer.objects.active = group_empties[0]
+                else:
+                    context.view_layer.objects.active = top_lvl_children.pop()
 
         return True
@@ -41,14 +41,18 @@ class SmartFace(bpy.types.Operator):
         bm.normal_update()
         bm.verts.ensure_lookup_table()
 
+        # the mesh keeps track of the selected element counts in edit mode, so the verts only need to be collected for F3
+        self.verts = []
+
         # vert and edge mode - create new face
         if self.mode[0] or self.mode[1]:
-            self.verts = [v for v in bm.verts if v.select]
+            vert_count = active.data.total_vert_sel
 
-            if self.verts:
+            if vert_count:
 
                 # F3
-                if len(self.verts) < 3:
+                if vert_count < 3:
+                    self.verts = [v for v in bm.verts if v.select]
                     self.f3(active, bm)
 
                 # Blender's face creation
@@ -59,9 +63,7 @@ class SmartFace(bpy.types.Operator):
 
         # face mode - duplicate and separate selection
         elif self.mode[2]:
-            faces = [f for f in bm.faces if f.select]
-
-            if faces:
+            if active.data.total_face_sel:
                 bpy.ops.mesh.duplicate()
                 bpy.ops.mesh.separate(type='SELECTED')
 
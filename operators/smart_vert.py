@@ -6,7 +6,7 @@ from mathutils import Vector
 from mathutils.geometry import intersect_point_line, intersect_line_line, intersect_line_plane
 from .. utils.graph import get_shortest_path
 from .. utils.ui import popup_message, init_status, finish_status
-from .. utils.draw import draw_lines, draw_point, draw_tris
+from .. utils.draw import draw_lines, draw_point, draw_tris, clear_batches
 from .. utils.snap import Snap
 from .. utils.math import average_locations, get_center_between_verts, get_face_center
 from .. utils.selection import get_edges_vert_sequences, get_selection_islands
@@ -122,17 +122,17 @@ class SmartVert(bpy.types.Operator):
         if self.is_snapping:
             if self.snap_element == 'EDGE':
                 if self.snap_coords:
-                    draw_lines(self.snap_coords, color=(1, 0, 0), width=3, alpha=0.75)
+                    draw_lines(self.snap_coords, color=(1, 0, 0), width=3, alpha=0.75, key=('SmartVert', 'snap_coords'))
 
                 if self.snap_proximity_coords:
-                    draw_lines(self.snap_proximity_coords, mx=self.mx, color=(1, 0, 0), width=1, alpha=0.3)
+                    draw_lines(self.snap_proximity_coords, mx=self.mx, color=(1, 0, 0), width=1, alpha=0.3, key=('SmartVert', 'snap_proximity_coords'))
 
                 if self.snap_ortho_coords:
                     draw_lines(self.snap_ortho_coords, mx=self.mx, color=(1, 0.7, 0), width=1, alpha=0.3)
 
             elif self.snap_element == 'FACE':
                 if self.snap_tri_coords:
-                    draw_tris(self.snap_tri_coords, color=(1, 0, 0), alpha=0.1)
+                    draw_tris(self.snap_tri_coords, color=(1, 0, 0), alpha=0.1, key=('SmartVert', 'snap_tri_coords'))
 
                 if self.snap_ortho_coords:
                     draw_lines(self.snap_ortho_coords, mx=self.mx, color=(1, 0.7, 0), width=1, alpha=0.3)
@@ -270,6 +270,9 @@ class SmartVert(bpy.types.Operator):
     def finish(self, context):
         bpy.types.SpaceView3D.draw_handler_remove(self.VIEW3D, 'WINDOW')
 
+        # free the retained snapping batches
+        clear_batches(owner='SmartVert')
+
         # reset the statusbar
         finish_status(self)
 
@@ -530,21 +533,22 @@ class SmartVert(bpy.types.Operator):
             return history
         return None
 
-    def get_paths(self, bm, history, topo):
+    def get_paths(self, active, bm, history, topo):
         pair1 = history[0:2]
         pair2 = history[2:4]
         pair2.reverse()
 
-        path1 = get_shortest_path(bm, *pair1, topo=topo, select=True)
-        path2 = get_shortest_path(bm, *pair2, topo=topo, select=True)
+        # the mesh graph is cached, so it's only built once for all paths, as the mesh doesn't change in between
+        path1 = get_shortest_path(active, bm, *pair1, topo=topo, select=True)
+        path2 = get_shortest_path(active, bm, *pair2, topo=topo, select=True)
 
         # in some rare situations with TOPO pathtype, a verts can end up in both paths, which will cause an exception later one
         is_any_in_both = any(v in path2 for v in path1)
 
         # so check for that and get the paths again with the other path type
         if is_any_in_both:
-            path1 = get_shortest_path(bm, *pair1, topo=not topo, select=True)
-            path2 = get_shortest_path(bm, *pair2, topo=not topo, select=True)
+            path1 = get_shortest_path(active, bm, *pair1, topo=not topo, select=True)
+            path2 = get_shortest_path(active, bm, *pair2, topo=not topo, select=True)
 
             self.pathtype = step_enum(self.pathtype, smartvert_path_type_items, step=1, loop=True)
 
@@ -621,7 +625,7 @@ class SmartVert(bpy.types.Operator):
                     history = self.validate_history(active, bm)
 
                     if history:
-                        path1, path2 = self.get_paths(bm, history, topo)
+                        path1, path2 = self.get_paths(active, bm, history, topo)
                         self.merge_paths(active, bm, path1, path2)
                         return True
 
@@ -633,7 +637,7 @@ class SmartVert(bpy.types.Operator):
                 history = self.validate_history(active, bm)
 
                 if history:
-                    path1, path2 = self.get_paths(bm, history, topo)
+                    path1, path2 = self.get_paths(active, bm, history, topo)
 
                     self.connect(active, bm, path1, path2)
                     return True
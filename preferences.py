@@ -263,6 +263,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     show_instance_collection_assembly_in_modes_pie: BoolProperty(name="Show Collection Instance Assembly in Modes Pie", default=True)
     hide_wire_objects_when_creating_assembly_asset: BoolProperty(name="Hide Wire Objects when creating Assembly Asset", default=True)
     hide_wire_objects_when_assembling_instance_collection: BoolProperty(name="Hide Wire Objects when assembling Collection Instance", default=True)
+    assetbrowser_collect_workers: IntProperty(name="Asset Collection Workers", description="Amount of Background Blender Processes used to read Blend Files and render Material Previews when Collecting Assets, each gets an equal share of the CPU Threads", default=4, min=1, max=64)
 
 
     # Region tool
@@ -284,7 +285,9 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     render_show: BoolProperty(name="Show Render Preferences", default=False)
 
     render_folder_name: StringProperty(name="Render Folder Name", description="Folder used to stored rended images relative to the Location of the .blend file", default='out')
-    render_seed_count: IntProperty(name="Seed Render Count", description="Set the Amount of Seed Renderings used to remove Fireflies", default=3, min=2, max=9)
+    render_seed_count: IntProperty(name="Seed Render Count", description="Set the Amount of Seed Renderings used to remove Fireflies", default=3, min=2, max=64, soft_max=9)
+    render_seed_parallel: BoolProperty(name="Parallel Seed Rendering", description="Render Seeds in parallel, in a Pool of Background Blender Processes, keeping the UI responsive", default=False)
+    render_seed_workers: IntProperty(name="Seed Render Workers", description="Amount of Background Blender Processes used for Parallel Seed Rendering, each gets an equal share of the CPU Threads", default=4, min=1, max=64)
     render_keep_seed_renderings: BoolProperty(name="Keep Individual Renderings", description="Keep the individual Seed Renderings, after they've been combined into a single Image", default=False)
     render_use_clownmatte_naming: BoolProperty(name="Use Clownmatte Name", description="""It's a better name than "Cryptomatte", believe me""", default=True)
     render_show_buttons_in_light_properties: BoolProperty(name="Show Render Buttons in Light Properties Panel", description="Show Render Buttons in Light Properties Panel", default=True)
@@ -355,6 +358,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     screencast_use_screencast_keys: BoolProperty(name="Use Screencast Keys (addon)", default=True)
 
     save_pie_use_undo_save: BoolProperty(name="Make Pre-Undo Saving available in the Pie", default=False)
+    save_pie_undo_save_generations: IntProperty(name="Pre-Undo Save Generations", description="Amount of Pre-Undo Saves to keep around, the oldest one is removed when a new one is saved", default=3, min=1, max=20)
 
 
     # Shading Pie
@@ -757,6 +761,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
                 draw_split_row(self, column, prop='preferred_assetbrowser_workspace_name', label='Preferred Workspace for Assembly Asset Creation')
                 draw_split_row(self, column, prop='hide_wire_objects_when_creating_assembly_asset', label='Hide Wire Objects when creatinng Assembly Asset')
                 draw_split_row(self, column, prop='hide_wire_objects_when_assembling_instance_collection', label='Hide Wire Objects when assemgling Instance Collection')
+                draw_split_row(self, column, prop='assetbrowser_collect_workers', label='Background Processes used when Collecting Assets')
 
                 if getattr(bpy.types, "MACHIN3_MT_modes_pie", False):
                     draw_split_row(self, column, prop='show_instance_collection_assembly_in_modes_pie', label='Show Instance Collection Assembly in Modes Pie')
@@ -802,6 +807,11 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
                 draw_split_row(self, column, prop='render_folder_name', label='Folder Name (relative to the .blend file)')
                 draw_split_row(self, column, prop='render_seed_count', label='Seed Render Count')
+                draw_split_row(self, column, prop='render_seed_parallel', label='Render Seeds in Parallel, in Background Processes')
+
+                if self.render_seed_parallel:
+                    draw_split_row(self, column, prop='render_seed_workers', label='Background Processes')
+
                 draw_split_row(self, column, prop='render_keep_seed_renderings', label='Keep Individual Seed Renderings')
                 draw_split_row(self, column, prop='render_use_clownmatte_naming', label='Use Clownmatte Naming')
                 draw_split_row(self, column, prop='render_show_buttons_in_light_properties', label='Show Render Buttons in Light Properties Panel')
@@ -1037,6 +1047,9 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
                 column = bb.column(align=True)
                 draw_split_row(self, column, prop='save_pie_use_undo_save', label='Make Pre-Undo Saving available in the Pie', info='Useful if you notice Undo causing crashes')
 
+                if self.save_pie_use_undo_save:
+                    draw_split_row(self, column, prop='save_pie_undo_save_generations', label='Pre-Undo Save Generations to keep')
+
 
                 # VERSIONED STARTUP FILE
 
@@ -3,6 +3,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty
 import random
 from ... utils.registration import get_addon
 from ... utils.material import get_last_node, lighten_color
+from ... utils.object import get_cached_poll
 from ... colors import group_colors
 
 
@@ -46,7 +47,7 @@ class ColorizeObjectsFromMaterials(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return [obj for obj in context.selected_objects if obj.type != 'EMPTY']
+        return get_cached_poll(context, 'COLORIZE_OBJECTS', lambda context: any(obj.type != 'EMPTY' for obj in context.selected_objects))
 
     def execute(self, context):
         objects = [obj for obj in context.selected_objects if obj.type != 'EMPTY']
@@ -198,7 +199,7 @@ class ColorizeObjectsFromGroups(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'OBJECT':
-            return [obj for obj in context.selected_objects if obj.M3.is_group_empty]
+            return get_cached_poll(context, 'COLORIZE_GROUPS', lambda context: any(obj.M3.is_group_empty for obj in context.selected_objects))
 
     @classmethod
     def description(cls, context, properties):
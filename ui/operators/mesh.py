@@ -2,9 +2,11 @@ import bpy
 from bpy.props import IntProperty, BoolProperty, EnumProperty
 import bmesh
 from math import radians
+import numpy as np
 from ... utils.registration import get_addon
 from ... utils.system import printd
 from ... utils.bmesh import ensure_custom_data_layers
+from ... utils.mesh import set_attribute
 from ... items import shade_mode_items
 
 
@@ -276,29 +278,34 @@ class Shade(bpy.types.Operator):
         return edge_bevelled_edges
 
     def clear_obj_sharps(self, obj):
-        obj.data.use_auto_smooth = False
+        '''
+        clear the edge data in one pass per attribute, instead of round tripping the mesh through bmesh
+        '''
 
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-        bm.normal_update()
+        mesh = obj.data
+        mesh.use_auto_smooth = False
 
-        _, bw, cr = ensure_custom_data_layers(bm)
+        if self.clear_sharps:
+            set_attribute(mesh.edges, 'use_edge_sharp', False)
 
-        for e in bm.edges:
-            if self.clear_sharps:
-                e.smooth = True
+        if self.clear_seams:
+            set_attribute(mesh.edges, 'use_seam', False)
 
-            if self.clear_bweights:
-                e[bw] = 0
+        for clear, prop, name in [(self.clear_bweights, 'bevel_weight', 'bevel_weight_edge'), (self.clear_creases, 'crease', 'crease_edge')]:
+            if clear:
+                weights = np.zeros(len(mesh.edges), dtype=np.float32)
 
-            if self.clear_creases:
-                e[cr] = 0
+                # with 4.0 bevel weights and creases are generic attributes, and only exist if they have been set before
+                if bpy.app.version >= (4, 0, 0):
+                    attr = mesh.attributes.get(name)
 
-            if self.clear_seams:
-                e.seam = False
+                    if attr:
+                        attr.data.foreach_set('value', weights)
+
+                else:
+                    set_attribute(mesh.edges, prop, weights)
 
-        bm.to_mesh(obj.data)
-        bm.clear()
+        mesh.update()
 
     def clear_mesh_sharps(self, mesh):
         mesh.use_auto_smooth = False
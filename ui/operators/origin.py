@@ -5,7 +5,7 @@ import bmesh
 from ... utils.math import get_loc_matrix, get_rot_matrix, get_sca_matrix, create_rotation_matrix_from_vertex, create_rotation_matrix_from_edge, get_center_between_verts, create_rotation_matrix_from_face
 from ... utils.math import average_locations
 from ... utils.ui import popup_message
-from ... utils.object import set_obj_origin, get_eval_bbox
+from ... utils.object import set_obj_origin, get_eval_bbox, get_cached_poll
 from ... utils.mesh import get_bbox
 from ... utils.draw import draw_point 
 from ... utils.registration import get_addon
@@ -34,11 +34,11 @@ class OriginToActive(bpy.types.Operator):
 
         if active:
             if context.mode == 'OBJECT':
-                return [obj for obj in context.selected_objects if obj != active and obj.type not in ['EMPTY', 'FONT']]
+                return get_cached_poll(context, 'ORIGIN_TO_ACTIVE', lambda context: any(obj != context.active_object and obj.type not in ['EMPTY', 'FONT'] for obj in context.selected_objects))
 
+            # the mesh keeps track of the selected vert count in edit mode, so there's no need to create a bmesh and go over all verts
             elif context.mode == 'EDIT_MESH' and tuple(context.scene.tool_settings.mesh_select_mode) in [(True, False, False), (False, True, False), (False, False, True)]:
-                bm = bmesh.from_edit_mesh(active.data)
-                return [v for v in bm.verts if v.select]
+                return active.data.total_vert_sel
 
     def invoke(self, context, event):
         if event.alt and event.ctrl:
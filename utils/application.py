@@ -6,3 +6,55 @@ def delay_execution(func, delay=0, persistent=False):
         bpy.app.timers.unregister(func)
 
     bpy.app.timers.register(func, first_interval=delay, persistent=persistent)
+
+
+# COALESCED EXECUTION
+
+scheduled = {}
+failed = {}
+
+def schedule_execution(func):
+    '''
+    queue up a function to be executed in the next timer tick
+    unlike delay_execution, all scheduled functions share a single timer, so scheduling the same or multiple functions repeatedly in one event loop cycle, results in each of them being run only once
+    functions that raised an exception in their previous run, are queued up again as well, so they get another go, once anything else is scheduled
+    NOTE: a dict is used as an ordered set, so the functions are executed in the order they were first scheduled
+    '''
+
+    if failed:
+        scheduled.update(failed)
+        failed.clear()
+
+    scheduled[func] = None
+
+    if not bpy.app.timers.is_registered(execute_scheduled):
+        bpy.app.timers.register(execute_scheduled, first_interval=0)
+
+
+def execute_scheduled():
+    '''
+    run all scheduled functions, isolating them from each other, so a failing one doesn't prevent the remaining ones from running
+    '''
+
+    funcs = list(scheduled)
+    scheduled.clear()
+
+    for func in funcs:
+        try:
+            func()
+
+        except Exception:
+            import traceback
+
+            print(f"WARNING: {func.__name__}() failed, and will be run again on the next update")
+            traceback.print_exc()
+
+            failed[func] = None
+
+
+def clear_scheduled():
+    scheduled.clear()
+    failed.clear()
+
+    if bpy.app.timers.is_registered(execute_scheduled):
+        bpy.app.timers.unregister(execute_scheduled)
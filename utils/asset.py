@@ -1,5 +1,8 @@
 import bpy
+import gpu
 import os
+import numpy as np
+from mathutils import Matrix
 from . system import printd
 from . registration import get_prefs
 
@@ -47,61 +50,151 @@ def get_asset_ids(context):
     return None, None, None
 
 
-# CATALOGS
+# CATALOG INDEX
 
-def get_catalogs_from_asset_libraries(context, debug=False):
+catalog_files = {}
+catalog_index = {'key': None, 'catalogs': {}, 'uuids': {}}
+registered_catalogs = None
+
+def get_catalog_file_stamp(cat_path):
+    try:
+        stat = os.stat(cat_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    except OSError:
+        return None
+
+
+def parse_catalog_file(cat_path, stamp):
     '''
-    scan cat files of all asset libraries and get the uuid for each catalog
-    if different catalogs share a name, only take the first one
+    parse a cat file into (uuid, catalog, simple_name) tuples, and cache them by path, mtime and size, so each file is only read again once it has changed
+    '''
+
+    cached = catalog_files.get(cat_path)
+
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    catalogs = []
+
+    with open(cat_path) as f:
+        for line in f:
+            if line != '\n' and not line.startswith(('#', 'VERSION')):
+                split = line.rstrip('\n').split(':')
+
+                if len(split) == 3:
+                    catalogs.append(tuple(split))
+
+    catalog_files[cat_path] = (stamp, catalogs)
+    return catalogs
+
+
+def get_catalog_index(context, debug=False):
+    '''
+    get the catalogs of all asset libraries by name and by uuid
+    the index is only rebuilt if libraries have been added, removed or changed, or one of the cat files has changed on disk
     '''
 
-    asset_libraries = context.preferences.filepaths.asset_libraries
-    all_catalogs = []
+    libs = []
 
-    for lib in asset_libraries:
-        libname = lib.name
-        libpath = lib.path
+    for lib in context.preferences.filepaths.asset_libraries:
+        cat_path = os.path.join(lib.path, 'blender_assets.cats.txt')
+        libs.append((lib.name, lib.path, cat_path, get_catalog_file_stamp(cat_path)))
 
-        cat_path = os.path.join(libpath, 'blender_assets.cats.txt')
+    key = tuple(libs)
 
-        if os.path.exists(cat_path):
+    if key == catalog_index['key']:
+        return catalog_index
+
+    if debug:
+        print("rebuilding catalog index")
+
+    catalogs = {}
+    uuids = {}
+
+    for libname, libpath, cat_path, stamp in libs:
+        if stamp:
             if debug:
                 print(libname, cat_path)
 
-            with open(cat_path) as f:
-                lines = f.readlines()
+            for uuid, catalog, simple_name in parse_catalog_file(cat_path, stamp):
+                catdata = {'uuid': uuid,
+                           'simple_name': simple_name,
+                           'libname': libname,
+                           'libpath': libpath}
 
-            for line in lines:
-                if line != '\n' and not any([line.startswith(skip) for skip in ['#', 'VERSION']]) and len(line.split(':')) == 3:
-                    all_catalogs.append(line[:-1].split(':') + [libname, libpath])
+                # if different catalogs share a name, only take the first one
+                if catalog not in catalogs:
+                    catalogs[catalog] = catdata
 
-    catalogs = {}
+                if uuid not in uuids:
+                    uuids[uuid] = catdata
 
-    for uuid, catalog, simple_name, libname, libpath in all_catalogs:
-        if catalog not in catalogs:
-            catalogs[catalog] = {'uuid': uuid,
-                                 'simple_name': simple_name,
-                                 'libname': libname,
-                                 'libpath': libpath}
+    catalog_index['key'] = key
+    catalog_index['catalogs'] = catalogs
+    catalog_index['uuids'] = uuids
 
     if debug:
         printd(catalogs)
 
-    return catalogs
+    return catalog_index
+
+
+def clear_catalog_index():
+    global registered_catalogs
+
+    catalog_files.clear()
+    catalog_index.update({'key': None, 'catalogs': {}, 'uuids': {}})
+    registered_catalogs = None
+
+
+# CATALOGS
+
+def get_catalogs_from_asset_libraries(context, debug=False):
+    '''
+    get the uuid for each catalog of all asset libraries, from the catalog index
+    if different catalogs share a name, only take the first one
+    '''
+
+    return get_catalog_index(context, debug=debug)['catalogs']
+
+
+def get_catalog_from_uuid(context, uuid):
+    return get_catalog_index(context)['uuids'].get(uuid)
 
 
 def update_asset_catalogs(self, context):
+    '''
+    the catalogs EnumProperty is only re-registered, if the catalogs or the preferred default catalog have changed
+    NOTE: so the last chosen catalog is kept between invocations too
+    '''
+
+    global registered_catalogs
+
     self.catalogs = get_catalogs_from_asset_libraries(context, debug=False)
 
+    default = get_prefs().preferred_default_catalog if get_prefs().preferred_default_catalog in self.catalogs else 'NONE'
+
+    # the property is also registered with empty items on addon registration, so verify it's still the one registered here
+    prop = bpy.types.WindowManager.bl_rna.properties.get('M3_asset_catalogs')
+
+    if registered_catalogs and prop and len(prop.enum_items) == len(self.catalogs) + 1 and registered_catalogs[2] == default:
+
+        # an unchanged index is the same dict, otherwise compare the catalog names
+        if registered_catalogs[0] is self.catalogs or registered_catalogs[1] == tuple(self.catalogs):
+            registered_catalogs = (self.catalogs, registered_catalogs[1], default)
+            return
+
     items = [('NONE', 'None', '')]
 
     for catalog in self.catalogs:
         # print(catalog)
         items.append((catalog, catalog, ""))
 
-    default = get_prefs().preferred_default_catalog if get_prefs().preferred_default_catalog in self.catalogs else 'NONE'
     bpy.types.WindowManager.M3_asset_catalogs = bpy.props.EnumProperty(name="Asset Categories", items=items, default=default)
 
+    registered_catalogs = (self.catalogs, tuple(self.catalogs), default)
+
 
 # ASSET
 
@@ -145,17 +238,14 @@ def get_asset_details_from_space(context, space, debug=False):
         if debug:
             print(" WARNING: asset library ref is ALL and directory is not set!")
 
-        catalogs = get_catalogs_from_asset_libraries(context, debug=False)
+        catdata = get_catalog_from_uuid(context, catalog_id)
 
-        for catdata in catalogs.values():
-            if catalog_id == catdata['uuid']:
-                libname = catdata['libname']
-                libpath = catdata['libpath']
+        if catdata:
+            libname = catdata['libname']
+            libpath = catdata['libpath']
 
-                if debug:
-                    print(" INFO: found libname and libpath via asset catalogs:", libname, "at", libpath)
-
-                break
+            if debug:
+                print(" INFO: found libname and libpath via asset catalogs:", libname, "at", libpath)
 
     if debug:
         print()
@@ -165,3 +255,112 @@ def get_asset_details_from_space(context, space, debug=False):
 
     else:
         return None, None, None, None
+
+
+# THUMBNAILS
+
+def get_thumbnail_projection_matrix(context, lens, size):
+    '''
+    build the projection matrix of a square viewport render using the passed in lens, like bpy.ops.render.opengl() does with a square resolution
+    in camera view, the camera's own projection is used
+    '''
+
+    space = context.space_data
+    r3d = space.region_3d
+
+    if r3d.view_perspective == 'CAMERA' and context.scene.camera:
+        return context.scene.camera.calc_matrix_camera(context.evaluated_depsgraph_get(), x=size, y=size)
+
+    near, far = space.clip_start, space.clip_end
+
+    # the viewport uses a sensor width of 72mm
+    if r3d.is_perspective:
+        f = lens / 36
+
+        return Matrix(((f, 0, 0, 0),
+                       (0, f, 0, 0),
+                       (0, 0, (far + near) / (near - far), 2 * far * near / (near - far)),
+                       (0, 0, -1, 0)))
+
+    else:
+        s = 2 / (r3d.view_distance * 72 / lens)
+
+        return Matrix(((s, 0, 0, 0),
+                       (0, s, 0, 0),
+                       (0, 0, -1 / far, 0),
+                       (0, 0, 0, 1)))
+
+
+def render_viewport_thumbnails(context, view_matrices=None, lens=None, overlays=True, size=128, supersample=2):
+    '''
+    draw the 3d view into an offscreen buffer, once for each passed in view matrix, or the current view for None
+    the buffer is rendered at a multiple of the size, and downsampled with NumPy
+    return the pixels of each thumbnail as a flat float array, ready to be written into a preview
+    '''
+
+    space = context.space_data
+    r3d = space.region_3d
+
+    if view_matrices is None:
+        view_matrices = [None]
+
+    buffer_size = size * supersample
+
+    projection = get_thumbnail_projection_matrix(context, lens if lens else space.lens, buffer_size)
+    show_overlays = space.overlay.show_overlays
+
+    if show_overlays and not overlays:
+        space.overlay.show_overlays = False
+
+    offscreen = gpu.types.GPUOffScreen(buffer_size, buffer_size)
+    thumbnails = []
+
+    try:
+        for view_matrix in view_matrices:
+            if view_matrix is None:
+                view_matrix = context.scene.camera.matrix_world.inverted() if r3d.view_perspective == 'CAMERA' and context.scene.camera else r3d.view_matrix
+
+            offscreen.draw_view3d(context.scene, context.view_layer, space, context.region, view_matrix, projection, do_color_management=True, draw_background=True)
+
+            # the texture is read bottom to top, just like previews expect their pixels, and the buffer is accessed directly, without creating python lists
+            buffer = offscreen.texture_color.read()
+            pixels = np.asarray(buffer, dtype=np.uint8).reshape(buffer_size, buffer_size, 4).astype(np.float32) / 255
+
+            # box filter the supersampled buffer down to the thumbnail size
+            if supersample > 1:
+                pixels = pixels.reshape(size, supersample, size, supersample, 4).mean(axis=(1, 3))
+
+            thumbnails.append(pixels.ravel())
+
+    finally:
+        offscreen.free()
+
+        if show_overlays and not overlays:
+            space.overlay.show_overlays = True
+
+    return thumbnails
+
+
+def set_preview_pixels(id, pixels, size=128):
+    id.preview_ensure()
+    id.preview.image_size = (size, size)
+    id.preview.image_pixels_float.foreach_set(pixels)
+
+
+def create_viewport_thumbnails(context, ids, view_matrices=None, lens=None, overlays=True, size=128):
+    '''
+    render thumbnails for any number of IDs in one go, without touching the disk, and write them into the IDs' previews
+    without view matrices, each ID gets a thumbnail of the current view, and with a single one, they all share it
+    '''
+
+    if view_matrices and len(view_matrices) not in [1, len(ids)]:
+        raise ValueError(f"Expected 1 or {len(ids)} view matrices for {len(ids)} IDs, got {len(view_matrices)}")
+
+    thumbnails = render_viewport_thumbnails(context, view_matrices=view_matrices, lens=lens, overlays=overlays, size=size)
+
+    # only render the current view once, if it's used for all IDs
+    if len(thumbnails) == 1:
+        thumbnails *= len(ids)
+
+    for id, pixels in zip(ids, thumbnails):
+        set_preview_pixels(id, pixels, size)
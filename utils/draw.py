@@ -1,13 +1,15 @@
 import bpy
 from mathutils import Vector, Matrix, Quaternion
-from math import sin, cos, pi
 import gpu
 from gpu_extras.batch import batch_for_shader
 import blf
+import numpy as np
+from . math import get_world_space_normal
 from . wm import get_last_operators
 from . registration import get_prefs, get_addon
 from . ui import get_zoom_factor
 from . tools import get_active_tool
+from . object import get_poll_update_count
 from .. colors import red, green, blue, black, white
 
 
@@ -24,19 +26,133 @@ def get_builtin_shader_name(name, prefix='3D'):
         return f"{prefix}_{name}"
 
 
+# SHADER and BATCH CACHE
+
+shaders = {}
+batches = {}
+
+def get_shader(name):
+    '''
+    fetch a builtin shader, from the cache shared across all draw calls
+    '''
+
+    shader = shaders.get(name)
+
+    if shader is None:
+        shader = shaders[name] = gpu.shader.from_builtin(name)
+
+    return shader
+
+
+def get_transformed_coords(coords, mx=None):
+    '''
+    turn coords into a float32 array, optionally transformed by mx in a single batched operation, instead of doing mx @ co for each of them
+    '''
+
+    coords = np.array(coords, dtype=float)
+
+    if mx is not None and mx != Matrix() and len(coords):
+        mx = np.array(mx, dtype=float)
+        coords = coords @ mx[:3, :3].T + mx[:3, 3]
+
+    return np.float32(coords)
+
+
+def get_cached_batch(key, inputs=(), values=()):
+    '''
+    fetch a previously built batch for the passed in key, if its inputs and values haven't changed
+
+        inputs are compared by identity, and should be the coords, indices, etc. passed in to the drawing function
+        values are compared by equality, and should be matrices, colors, sizes, etc. which affect the batch
+        
+    NOTE: inputs are compared by identity, so coords that are changed in place, need to be passed in under a different key, or have their batch cleared
+    '''
+
+    if key is not None and (cached := batches.get(key)):
+        if len(cached['inputs']) == len(inputs) and all(a is b for a, b in zip(cached['inputs'], inputs)) and cached['values'] == values:
+            return cached['batch']
+
+
+def cache_batch(key, batch, inputs=(), values=()):
+    if key is not None:
+        batches[key] = {'batch': batch, 'inputs': inputs, 'values': values}
+
+    return batch
+
+
+def clear_batches(owner=None):
+    '''
+    clear all cached batches, or only those whose key tuple starts with the passed in owner, usually the class name of a modal operator
+    '''
+
+    if owner is None:
+        batches.clear()
+        clear_axes_batches()
+
+    else:
+        for key in [key for key in batches if isinstance(key, tuple) and key and key[0] == owner]:
+            del batches[key]
+
+
+def get_batch(shader, type, coords, indices=None, mx=None, colors=None, key=None, values=()):
+    '''
+    get a batch from the cache, or build it from pre-transformed coords
+    pass in a key tuple, usually (owner, name), to have the batch retained between redraws, and rebuilt only when the coords, indices, colors or the matrix change
+    '''
+
+    inputs = (coords, indices, colors)
+    values = (mx.copy() if mx is not None else None, len(coords), *values)
+
+    batch = get_cached_batch(key, inputs, values)
+
+    if batch is None:
+        content = {"pos": get_transformed_coords(coords, mx)}
+
+        if colors is not None:
+            content["color"] = colors
+
+        batch = cache_batch(key, batch_for_shader(shader, type, content, indices=indices), inputs, values)
+
+    return batch
+
+
+def get_uniform_color_shader(color, alpha):
+    shader = get_shader(get_builtin_shader_name('UNIFORM_COLOR'))
+    shader.bind()
+    shader.uniform_float("color", (*color, alpha))
+
+    return shader
+
+
+def get_polyline_shader(name='POLYLINE_UNIFORM_COLOR', color=None, alpha=1, width=1):
+    shader = get_shader(name)
+
+    if color is not None:
+        shader.uniform_float("color", (*color, alpha))
+
+    shader.uniform_float("lineWidth", width)
+    shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
+    shader.bind()
+
+    return shader
+
+
 # BASIC
 
-def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False):
+def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False, key=None):
     def draw():
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
+        shader = get_uniform_color_shader(color, alpha)
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co]})
+        values = (mx.copy(), tuple(co))
+        batch = get_cached_batch(key, values=values)
+
+        if batch is None:
+            batch = cache_batch(key, batch_for_shader(shader, 'POINTS', {"pos": [mx @ co]}), values=values)
+
         batch.draw(shader)
 
     if modal:
@@ -49,28 +165,15 @@ def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, mod
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False):
+def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False, key=None):
     def draw():
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
+        shader = get_uniform_color_shader(color, alpha)
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        if indices:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]}, indices=indices)
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords}, indices=indices)
-
-        else:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]})
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords})
-
+        batch = get_batch(shader, 'POINTS', coords, indices=indices if indices else None, mx=mx, key=key)
         batch.draw(shader)
 
     if modal:
@@ -83,7 +186,7 @@ def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alph
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width=1, xray=True, modal=True, screen=False):
+def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width=1, xray=True, modal=True, screen=False, key=None):
     '''
     takes coordinates and draws a single line
     can optionally take an indices argument to specify how it should be drawn
@@ -93,19 +196,14 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width
         nonlocal indices
 
         if indices is None:
-            indices = [(i, i + 1) for i in range(0, len(coords)) if i < len(coords) - 1]
-            # TODO: simplify
+            indices = [(i, i + 1) for i in range(0, len(coords) - 1)]
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+        batch = get_batch(shader, 'LINES', coords, indices=indices, mx=mx, key=key)
         batch.draw(shader)
 
     if modal:
@@ -118,28 +216,19 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, screen=False):
+def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, screen=False, key=None):
     '''
     takes an even amount of coordinates and draws half as many 2-point lines
+    NOTE: without indices passed in, the batch is drawn non-indexed, which for LINES results in the same 2-point lines
     '''
 
     def draw():
-        nonlocal indices
-
-        if not indices:
-            indices = [(i, i + 1) for i in range(0, len(coords), 2)]
-            # TODO: simplifiy?
-
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+        batch = get_batch(shader, 'LINES', coords, indices=indices if indices else None, mx=mx, key=key)
         batch.draw(shader)
 
     if modal:
@@ -169,10 +258,7 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_SMOOTH_COLOR')
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+        shader = get_polyline_shader(name='POLYLINE_SMOOTH_COLOR', width=width)
 
         batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors})
         batch.draw(shader)
@@ -187,36 +273,47 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, fade=False, normal=False, xray=True, modal=True, screen=False):
+def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, fade=False, normal=False, xray=True, modal=True, screen=False, key=None):
     '''
     takes a list of vectors and origins and draws a line for each pair, fading from the origin to the tip!
     '''
 
     def draw():
-        coords = []
-        colors = []
+        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
+        gpu.state.blend_set('ALPHA')
 
-        for v, o in zip(vectors, origins):
-            coords.append(mx @ o)
+        shader = get_polyline_shader(name='POLYLINE_SMOOTH_COLOR', width=width)
+
+        inputs = (vectors, origins)
+        values = (mx.copy(), len(vectors), tuple(color), alpha, fade, normal)
+
+        batch = get_cached_batch(key, inputs, values)
+
+        if batch is None:
+            origins_world = get_transformed_coords(origins, mx)
 
             if normal:
-                coords.append(mx @ o + get_world_space_normal(v, mx))
+                nmx = np.array(mx.inverted_safe().transposed().to_3x3(), dtype=float)
             else:
-                coords.append(mx @ o + mx.to_3x3() @ v)
+                nmx = np.array(mx.to_3x3(), dtype=float)
 
-            colors.extend([(*color, alpha), (*color, alpha / 10 if fade else alpha)])
+            vectors_world = np.array(vectors, dtype=float) @ nmx.T
 
-        indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+            if normal:
+                lengths = np.linalg.norm(vectors_world, axis=1, keepdims=True)
+                vectors_world = np.divide(vectors_world, lengths, out=np.zeros_like(vectors_world), where=lengths != 0)
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA')
+            # interleave origin and tip coords
+            coords = np.empty((len(origins_world) * 2, 3), dtype=np.float32)
+            coords[0::2] = origins_world
+            coords[1::2] = origins_world + vectors_world
 
-        shader = gpu.shader.from_builtin('POLYLINE_SMOOTH_COLOR')
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+            colors = np.empty((len(coords), 4), dtype=np.float32)
+            colors[0::2] = (*color, alpha)
+            colors[1::2] = (*color, alpha / 10 if fade else alpha)
+
+            batch = cache_batch(key, batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors}), inputs, values)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors})
         batch.draw(shader)
 
     if modal:
@@ -231,7 +328,7 @@ def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=
 
 # ADVANCED
 
-def draw_circle(loc=Vector(), rot=Quaternion(), radius=100, segments='AUTO', width=1, color=(1, 1, 1), alpha=1, xray=True, modal=True, screen=False):
+def draw_circle(loc=Vector(), rot=Quaternion(), radius=100, segments='AUTO', width=1, color=(1, 1, 1), alpha=1, xray=True, modal=True, screen=False, key=None):
     '''
     draw a circle
     no need to pass in a rotation if you draw in 2d space of course
@@ -249,43 +346,36 @@ def draw_circle(loc=Vector(), rot=Quaternion(), radius=100, segments='AUTO', wid
         else:
             segments = max(segments, 16)
 
-        # create the indices to create a cyclic line
-        indices = [(i, i + 1) if i < segments - 1 else (i, 0) for i in range(segments)]
+        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
+        gpu.state.blend_set('ALPHA')
 
-        # create circle coords in the origin, of it facing upwards, so all z coords will be 0
-        coords = []
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        for i in range(segments):
+        values = (tuple(loc), tuple(rot), radius, segments)
+        batch = get_cached_batch(key, values=values)
 
-            # get the angle for each segment
-            theta = 2 * pi * i / segments
+        if batch is None:
 
-            # then the x and y coords
-            x = radius * cos(theta)
-            y = radius * sin(theta)
+            # create the indices to create a cyclic line
+            indices = [(i, i + 1) if i < segments - 1 else (i, 0) for i in range(segments)]
 
-            # collect the coords
-            coords.append(Vector((x, y, 0)))
+            # create circle coords in the origin, of it facing upwards, so all z coords will be 0
+            theta = 2 * np.pi * np.arange(segments) / segments
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA')
+            coords = np.zeros((segments, 3), dtype=float)
+            coords[:, 0] = radius * np.cos(theta)
+            coords[:, 1] = radius * np.sin(theta)
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+            # 2d circle (but note the coords are still 3 items)
+            if len(loc) == 2:
+                mx = Matrix()
+                mx.col[3] = loc.resized(4)
 
-        # 2d circle (but note the coords are still 3 items)
-        if len(loc) == 2:
-            mx = Matrix()
-            mx.col[3] = loc.resized(4)
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+            # 3d circle
+            else:
+                mx = Matrix.LocRotScale(loc, rot, Vector.Fill(3, 1))
 
-        # 3d circle
-        else:
-            mx = Matrix.LocRotScale(loc, rot, Vector.Fill(3, 1))
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+            batch = cache_batch(key, batch_for_shader(shader, 'LINES', {"pos": get_transformed_coords(coords, mx)}, indices=indices), values=values)
 
         batch.draw(shader)
 
@@ -320,13 +410,9 @@ def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1,
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+        batch = get_batch(shader, 'LINES', coords, indices=indices, mx=mx)
         batch.draw(shader)
 
     if modal:
@@ -336,30 +422,18 @@ def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1,
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, xray=True, modal=True):
+def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, xray=True, modal=True, key=None):
     ''''
     draw triangles, like those from mesh.calc_loop_triangles
     '''
 
     def draw():
-        # nonlocal indices
-
-        # if not indices:
-            # indices = [(i, i + 1) for i in range(0, len(coords), 2)]
-
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
+        shader = get_uniform_color_shader(color, alpha)
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'TRIS', {"pos": [mx @ co for co in coords]}, indices=indices)
-
-        else:
-            batch = batch_for_shader(shader, 'TRIS', {"pos": coords}, indices=indices)
-
+        batch = get_batch(shader, 'TRIS', coords, indices=indices, mx=mx, key=key)
         batch.draw(shader)
 
     if modal:
@@ -369,30 +443,22 @@ def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, xray=
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None):
     '''
     takes tupple of (coords, indices) and draws a line for each edge index
     '''
 
     def draw():
-        nonlocal batch
         coords, indices = batch
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        b = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
+        b = get_batch(shader, 'LINES', coords, indices=indices, key=key)
         b.draw(shader)
 
-        del shader
-        del b
-
     if modal:
         draw()
 
@@ -400,51 +466,50 @@ def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=Tr
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_bbox(bbox, mx=Matrix(), color=(1, 1, 1), corners=0, width=1, alpha=1, xray=True, modal=True):
+def draw_bbox(bbox, mx=Matrix(), color=(1, 1, 1), corners=0, width=1, alpha=1, xray=True, modal=True, key=None):
     '''
     draw bbox conrners, useful to highlight objects without drawing the wire
     pass in a corners value > 0 to draw only the corners, not the entire bbox
     '''
 
     def draw():
-        if corners:
-            length = corners
-
-            coords = [bbox[0], bbox[0] + (bbox[1] - bbox[0]) * length, bbox[0] + (bbox[3] - bbox[0]) * length, bbox[0] + (bbox[4] - bbox[0]) * length,
-                      bbox[1], bbox[1] + (bbox[0] - bbox[1]) * length, bbox[1] + (bbox[2] - bbox[1]) * length, bbox[1] + (bbox[5] - bbox[1]) * length,
-                      bbox[2], bbox[2] + (bbox[1] - bbox[2]) * length, bbox[2] + (bbox[3] - bbox[2]) * length, bbox[2] + (bbox[6] - bbox[2]) * length,
-                      bbox[3], bbox[3] + (bbox[0] - bbox[3]) * length, bbox[3] + (bbox[2] - bbox[3]) * length, bbox[3] + (bbox[7] - bbox[3]) * length,
-                      bbox[4], bbox[4] + (bbox[0] - bbox[4]) * length, bbox[4] + (bbox[5] - bbox[4]) * length, bbox[4] + (bbox[7] - bbox[4]) * length,
-                      bbox[5], bbox[5] + (bbox[1] - bbox[5]) * length, bbox[5] + (bbox[4] - bbox[5]) * length, bbox[5] + (bbox[6] - bbox[5]) * length,
-                      bbox[6], bbox[6] + (bbox[2] - bbox[6]) * length, bbox[6] + (bbox[5] - bbox[6]) * length, bbox[6] + (bbox[7] - bbox[6]) * length,
-                      bbox[7], bbox[7] + (bbox[3] - bbox[7]) * length, bbox[7] + (bbox[4] - bbox[7]) * length, bbox[7] + (bbox[6] - bbox[7]) * length]
-
-            indices = [(0, 1), (0, 2), (0, 3),
-                       (4, 5), (4, 6), (4, 7),
-                       (8, 9), (8, 10), (8, 11),
-                       (12, 13), (12, 14), (12, 15),
-                       (16, 17), (16, 18), (16, 19),
-                       (20, 21), (20, 22), (20, 23),
-                       (24, 25), (24, 26), (24, 27),
-                       (28, 29), (28, 30), (28, 31)]
+        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
+        gpu.state.blend_set('ALPHA')
 
+        shader = get_polyline_shader(color=color, alpha=alpha, width=width)
 
-        else:
-            coords = bbox
-            indices = [(0, 1), (1, 2), (2, 3), (3, 0),
-                       (4, 5), (5, 6), (6, 7), (7, 4),
-                       (0, 4), (1, 5), (2, 6), (3, 7)]
+        # the bbox is usually freshly created on each redraw, so compare it by value
+        values = (mx.copy(), tuple(tuple(co) for co in bbox), corners)
+        batch = get_cached_batch(key, values=values)
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA')
+        if batch is None:
+            if corners:
+                length = corners
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-        shader.uniform_float("color", (*color, alpha))
-        shader.uniform_float("lineWidth", width)
-        shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-        shader.bind()
+                # for each corner, draw a line towards its 3 neighbours
+                neighbours = [(1, 3, 4), (0, 2, 5), (1, 3, 6), (0, 2, 7), (0, 5, 7), (1, 4, 6), (2, 5, 7), (3, 4, 6)]
+
+                coords = []
+                indices = []
+
+                for idx, nbs in enumerate(neighbours):
+                    co = bbox[idx]
+                    start = len(coords)
+
+                    coords.append(co)
+
+                    for i, nb in enumerate(nbs):
+                        coords.append(co + (bbox[nb] - co) * length)
+                        indices.append((start, start + i + 1))
+
+            else:
+                coords = bbox
+                indices = [(0, 1), (1, 2), (2, 3), (3, 0),
+                           (4, 5), (5, 6), (6, 7), (7, 4),
+                           (0, 4), (1, 5), (2, 6), (3, 7)]
+
+            batch = cache_batch(key, batch_for_shader(shader, 'LINES', {"pos": get_transformed_coords(coords, mx)}, indices=indices), values=values)
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
         batch.draw(shader)
 
     if modal:
@@ -461,6 +526,29 @@ def draw_init(self, event):
     self.offset = 0
 
 
+text_dimensions = {}
+
+def get_cached_text_dimensions(font, size, text):
+    '''
+    get blf dimensions of text at size, from a cache of pre-measured texts
+    NOTE: unlike blf.dimensions() this doesn't rely on the current font size, but it does change it on a cache miss, and as blf can't be queried for the previous size, always set it explicitely before drawing
+    '''
+
+    key = (font, size, text)
+    dims = text_dimensions.get(key)
+
+    if dims is None:
+
+        # keep the cache from growing indefinitely
+        if len(text_dimensions) > 1000:
+            text_dimensions.clear()
+
+        blf.size(font, size)
+        dims = text_dimensions[key] = blf.dimensions(font, text)
+
+    return dims
+
+
 def get_text_dimensions(context, text='', size=12):
     '''
     get dimensions of passed in text at size, taking into account the same scale adjustment done when using draw_label()
@@ -583,8 +671,58 @@ def draw_split_row(self, layout, prop='prop', text='', label='Label', factor=0.2
 # AXES
 
 hypercursor = None
+axes_batches = {}
+
+def clear_axes_batches():
+    axes_batches.clear()
+
+
+def get_zoom_factors(context, origins, scale=300):
+    '''
+    vectorized get_zoom_factor() for an array of locations
+    the zoom factor is linear in the depth along the view direction, for both perspective and ortho views,
+    so it only needs to be evaluated at two depths, from which the factors for all other locations can be derived
+    '''
+
+    viewmx = context.region_data.view_matrix.inverted_safe()
+    eye = viewmx.to_translation()
+    forward = -viewmx.col[2].xyz.normalized()
+
+    f1 = get_zoom_factor(context, eye + forward, scale=scale, ignore_obj_scale=True)
+    f2 = get_zoom_factor(context, eye + forward * 2, scale=scale, ignore_obj_scale=True)
+
+    depths = (origins - np.array(eye + forward)) @ np.array(forward)
+    return np.abs(f1 + (f2 - f1) * depths)
+
+
+def get_axes_coords(matrices, size, factors):
+    '''
+    get the 2-point line coords for all 3 axes of all the passed in world matrices in one go
+    the axes are the normalized matrix columns, and are flipped for negatively scaled matrices, just like mx.to_quaternion() does
+    '''
+
+    origins = matrices[:, :3, 3]
+    axes = matrices[:, :3, :3].transpose(0, 2, 1)
+
+    axes = axes / np.linalg.norm(axes, axis=2, keepdims=True).clip(min=1e-12)
+    axes *= np.sign(np.linalg.det(matrices[:, :3, :3])).reshape(-1, 1, 1)
+
+    lengths = (size * factors).reshape(-1, 1, 1)
+
+    # (object, axis, start/end, xyz)
+    coords = np.empty((len(matrices), 3, 2, 3), dtype=float)
+    coords[:, :, 0] = origins[:, None] + axes * lengths * 0.1
+    coords[:, :, 1] = origins[:, None] + axes * lengths
+
+    return coords
+
 
 def draw_axes_HUD(context, objects):
+    '''
+    draw the axes of all objects, and optionally of the cursor, as a single multi-color line batch
+    the batch is retained per region, and only rebuilt, when the depsgraph has been updated or the frame has changed, which covers any matrix change, or when the view parameters have changed
+    '''
+
     global hypercursor
     
     if hypercursor is None:
@@ -602,81 +740,73 @@ def draw_axes_HUD(context, objects):
         show_cursor = context.space_data.overlay.show_cursor
         show_hyper_cursor = hypercursor and get_active_tool(context).idname in ['machin3.tool_hyper_cursor', 'machin3.tool_hyper_cursor_simple'] and context.scene.HC.show_gizmos
 
-        axes = [(Vector((1, 0, 0)), red), (Vector((0, 1, 0)), green), (Vector((0, 0, 1)), blue)]
-
-        for axis, color in axes:
-            coords = []
+        # only show the cursor axes when the hyper cursor gizmo isn't shown
+        draw_cursor = 'CURSOR' in objects and not show_hyper_cursor
+        objects = [obj for obj in objects if obj != 'CURSOR' and str(obj) != '<bpy_struct, Object invalid>']
 
-            # draw object(s)
-            for obj in objects:
+        cursor_mx = context.scene.cursor.matrix if draw_cursor else None
 
-                # CURSOR
+        # view parameters only affect the axes, when drawing in screen space
+        view = (tuple(map(tuple, context.region_data.perspective_matrix)), context.region.width, context.region.height) if screenspace else None
+        values = (get_poll_update_count(), context.scene.frame_current, len(objects), size, alpha, scale, screenspace, show_cursor, tuple(map(tuple, cursor_mx)) if cursor_mx is not None else None, view)
 
-                if obj == 'CURSOR':
+        key = context.region.as_pointer()
+        cached = axes_batches.get(key)
 
-                    # only show the cursor axes when the hyper cursor gizmo isn't shown
-                    if not show_hyper_cursor:
-                        mx = context.scene.cursor.matrix
-                        rot = mx.to_quaternion()
-                        origin = mx.to_translation()
+        if cached and cached['values'] == values:
+            batch = cached['batch']
 
-                        factor = get_zoom_factor(context, origin, scale=300, ignore_obj_scale=True) if screenspace else 1
-
-                        if show_cursor and screenspace:
-                            coords.append(origin + (rot @ axis).normalized() * 0.1 * scale * factor * 0.8)
-                            coords.append(origin + (rot @ axis).normalized() * 0.1 * scale * factor * 1.2)
-
-                        else:
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.9)
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor)
+        else:
+            matrices = np.array([obj.matrix_world for obj in objects], dtype=float).reshape(-1, 4, 4)
 
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.1)
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.7)
+            coords = []
+            colors = []
 
-                # OBJECT
+            # OBJECTS
 
-                elif str(obj) != '<bpy_struct, Object invalid>':
-                    mx = obj.matrix_world
-                    rot = mx.to_quaternion()
-                    origin = mx.to_translation()
+            if len(matrices):
+                factors = get_zoom_factors(context, matrices[:, :3, 3]) if screenspace else np.ones(len(matrices))
+                coords.append(get_axes_coords(matrices, size * scale, factors).reshape(-1, 3))
+                colors.append(np.tile(np.repeat([(*red, alpha), (*green, alpha), (*blue, alpha)], 2, axis=0), (len(matrices), 1)))
 
-                    factor = get_zoom_factor(context, origin, scale=300, ignore_obj_scale=True) if screenspace else 1
+            # CURSOR
 
-                    coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.1)
-                    coords.append(origin + (rot @ axis).normalized() * size * scale * factor)
+            if cursor_mx is not None:
+                rot = cursor_mx.to_quaternion()
+                origin = cursor_mx.to_translation()
 
-                    """
-                    # debuging stash + stashtargtmx for object origin changes
-                    for stash in obj.MM.stashes:
-                        if s tash.obj:
-                            smx = sta sh.obj.MM.stashmx
-                            sorigin = smx.decompose()[0]
+                factor = get_zoom_factor(context, origin, scale=300, ignore_obj_scale=True) if screenspace else 1
 
-                            coords.append(sorigin + smx.to_3x3() @ axis * size * 0.1)
-                            coords.append(sorigin + smx.to_3x3() @ axis * size)
+                if show_cursor and screenspace:
+                    ranges = [(0.1 * 0.8, 0.1 * 1.2)]
+                    length = scale * factor
 
+                else:
+                    ranges = [(0.9, 1), (0.1, 0.7)]
+                    length = size * scale * factor
 
-                            stmx = stash.obj.MM.stashtargetmx
-                            storigin = stmx.decompose()[0]
+                for axis, color in [(Vector((1, 0, 0)), red), (Vector((0, 1, 0)), green), (Vector((0, 0, 1)), blue)]:
+                    direction = (rot @ axis).normalized()
 
-                            coords.append(storigin + stmx.to_3x3() @ axis * size * 0.1)
-                            coords.append(storigin + stmx.to_3x3() @ axis * size)
-                    """
+                    for start, end in ranges:
+                        coords.append(np.array([origin + direction * length * start, origin + direction * length * end]))
+                        colors.append(np.array([(*color, alpha), (*color, alpha)]))
 
             if coords:
-                indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+                shader = get_shader('POLYLINE_SMOOTH_COLOR')
+                batch = batch_for_shader(shader, 'LINES', {"pos": np.float32(np.concatenate(coords)), "color": np.float32(np.concatenate(colors))})
 
-                gpu.state.depth_test_set('NONE')
-                gpu.state.blend_set('ALPHA')
+            else:
+                batch = None
 
-                shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-                shader.uniform_float("color", (*color, alpha))
-                shader.uniform_float("lineWidth", 2)
-                shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-                shader.bind()
+            axes_batches[key] = {'values': values, 'batch': batch}
 
-                batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-                batch.draw(shader)
+        if batch:
+            gpu.state.depth_test_set('NONE')
+            gpu.state.blend_set('ALPHA')
+
+            shader = get_polyline_shader(name='POLYLINE_SMOOTH_COLOR', width=2)
+            batch.draw(shader)
 
 
 # REGION FRAMES
@@ -826,14 +956,16 @@ def draw_screen_cast_HUD(context):
 
     # get addon prefix offset, based on widest possiblestring 'MM', and based on empasized last op's size
     if p.screencast_show_addon:
-        blf.size(font, round(p.screencast_fontsize * scale * emphasize))
-        addon_offset_x = blf.dimensions(font, 'MM')[0]
+        addon_offset_x = get_cached_text_dimensions(font, round(p.screencast_fontsize * scale * emphasize), 'MM')[0]
     else:
         addon_offset_x = 0
 
     y = 0
     hgap = 10
 
+    # the previous op's size, which the vertical offset of the next op is based on
+    prev_size = None
+
     for idx, (addon, label, idname, prop) in enumerate(reversed(operators)):
         size = round(p.screencast_fontsize * scale * (emphasize if idx == 0 else 1))
         vgap = round(size / 2)
@@ -854,7 +986,7 @@ def draw_screen_cast_HUD(context):
         text = f"{label}: {prop}" if prop else label
 
         x = offset_x + addon_offset_x
-        y = offset_y if idx == 0 else y + (blf.dimensions(font, text)[1] + vgap)
+        y = offset_y if idx == 0 else y + (get_cached_text_dimensions(font, prev_size, text)[1] + vgap)
 
         blf.size(font, size)
         blf.color(font, *color, alpha)
@@ -866,7 +998,7 @@ def draw_screen_cast_HUD(context):
         # idname
 
         if p.screencast_show_idname:
-            x += blf.dimensions(font, text)[0] + hgap
+            x += get_cached_text_dimensions(font, size, text)[0] + hgap
 
             blf.size(font, size - 2)
             blf.color(font, *color, alpha * 0.3)
@@ -886,14 +1018,15 @@ def draw_screen_cast_HUD(context):
         # addon prefix
 
         if addon and p.screencast_show_addon:
-            blf.size(font, size)
-
-            x = offset_x + addon_offset_x - blf.dimensions(font, addon)[0] - (hgap / 2)
+            x = offset_x + addon_offset_x - get_cached_text_dimensions(font, size, addon)[0] - (hgap / 2)
 
+            blf.size(font, size)
             blf.color(font, *white, alpha * 0.3)
             blf.position(font, x, y, 0)
 
             blf.draw(font, addon)
 
         if idx == 0:
-            y += blf.dimensions(font, text)[1]
+            y += get_cached_text_dimensions(font, size, text)[1]
+
+        prev_size = size
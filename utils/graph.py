@@ -1,93 +1,162 @@
-import sys
+from math import dist
+from heapq import heappush, heappop
+import numpy as np
+from . mesh import get_attribute
+from . object import get_mesh_update_count
 
 
-def build_mesh_graph(verts, edges, topo=True):
-    mg = {}
-    for v in verts:
-        mg[v] = []
+# GRAPH
 
-    for e in edges:
-        distance = 1 if topo else e.calc_length()
+mesh_graphs = {}
 
-        mg[e.verts[0]].append((e.verts[1], distance))
-        mg[e.verts[1]].append((e.verts[0], distance))
+def build_mesh_graph(mesh):
+    '''
+    build a compact CSR adjacency of the mesh's vert graph, with the edge lengths as weights, from the vert and edge arrays fetched in one pass each
+        offsets - for each vert index i, its neighbours are found in targets[offsets[i]:offsets[i + 1]]
+        targets - the neighbouring vert indices
+        lengths - the lengths of the edges leading to them
 
-    return mg
+    the same graph serves both, topological and geometric path finding
+    NOTE: the arrays are turned into lists, as indexing those is much faster than indexing NumPy arrays in the Dijkstra loop
+    '''
 
+    vert_count = len(mesh.vertices)
 
-def get_shortest_path(bm, vstart, vend, topo=False, select=False):
-    """
-    author: "G Bantle, Bagration, MACHIN3",
-    source: "https://blenderartists.org/forum/showthread.php?58564-Path-Select-script(Update-20060307-Ported-to-C-now-in-CVS",
-    video: https://www.youtube.com/watch?v=_lHSawdgXpI
-    """
+    coords = get_attribute(mesh.vertices, 'co', np.float32, 3).astype(float)
+    edges = get_attribute(mesh.edges, 'vertices', np.int32, 2).astype(np.int64)
+
+    lengths = np.linalg.norm(coords[edges[:, 0]] - coords[edges[:, 1]], axis=1)
+
+    # each edge is traversable in both directions
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+    lengths = np.concatenate((lengths, lengths))
+
+    order = np.argsort(sources, kind='stable')
+
+    offsets = np.zeros(vert_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=vert_count), out=offsets[1:])
+
+    return {'vert_count': vert_count,
+            'edge_count': len(mesh.edges),
+            'coords': coords.tolist(),
+            'offsets': offsets.tolist(),
+            'targets': targets[order].tolist(),
+            'lengths': lengths[order].tolist()}
+
+
+def get_mesh_graph(obj, bm=None):
+    '''
+    get the obj's mesh graph, cached by mesh pointer, and validated by the mesh name, its geometry update count and its element counts
+    in edit mode pass in the edit bmesh, the mesh is then only synced from it, if the graph has to be rebuilt
+    NOTE: the mesh's elements are written in the bmesh's order, so the graph's vert indices match the bmesh's
+    '''
+
+    mesh = obj.data
+
+    counts = (len(bm.verts), len(bm.edges)) if bm else (len(mesh.vertices), len(mesh.edges))
+    key = (mesh.name, get_mesh_update_count(mesh)) + counts
+
+    graph = mesh_graphs.get(mesh.as_pointer())
+
+    if graph and graph['key'] == key:
+        return graph
+
+    if bm:
+        obj.update_from_editmode()
 
-    def dijkstra(mg, vstart, vend, topo=True):
-        # initiate dict to collect distances from stat vert to every other vert
-        d = dict.fromkeys(mg.keys(), sys.maxsize)
+    graph = build_mesh_graph(mesh)
+    graph['key'] = key
 
-        # predecessor dict to track the path walked
-        predecessor = dict.fromkeys(mg.keys())
+    mesh_graphs[mesh.as_pointer()] = graph
+    return graph
 
-        # the distance of the start vert to itself is 0
-        d[vstart] = 0
 
-        # keep track of what verts are seen and add the the accumulated distances to those verts
-        unknownverts = [(0, vstart)]
+def clear_mesh_graphs():
+    mesh_graphs.clear()
 
-        # with topo you can exit as soon as you hit the vend, without topo you can't, because the shorter distance my involve more vert hops
-        # while (topo and vstart != vend) or (not topo and unknownverts):
-        while unknownverts:
-            # sorting actually doesn't seem to  be required, but it was in the original source
-            # I question why the list needs to be sorted by index at all. also, doing it via the lambda function is very slow for some reason
-            # unknownverts.sort(key=lambda x: x[1].index)
 
-            # get the next vert that is closest to vstart
-            dist, vcurrent = unknownverts[0]
+def dijkstra(graph, start, end, topo=False, astar=True):
+    '''
+    binary heap Dijkstra on the CSR mesh graph, terminating as soon as the end vert is settled
+    for geometric distances, the euclidean distance to the end vert is used as an A* heuristic, which never overestimates, so the found path is still the shortest
+    returns a list of vert indices from start to end, or None if the end can't be reached
+    '''
 
-            # use the mesh graph to retrieve the other verts connected
-            others = mg[vcurrent]
+    offsets = graph['offsets']
+    targets = graph['targets']
+    lengths = graph['lengths']
+    coords = graph['coords']
 
-            # choose the next vert with the shortest accumulated distance
-            for vother, distance in others:
-                if d[vother] > d[vcurrent] + distance:
-                    d[vother] = d[vcurrent] + distance
+    endco = coords[end]
+    use_heuristic = astar and not topo
 
-                    unknownverts.append((d[vother], vother))
-                    predecessor[vother] = vcurrent
+    distances = {start: 0}
+    predecessor = {start: None}
+    settled = set()
 
-            # we've finished exploring this vert, pop it
-            unknownverts.pop(0)
+    heap = [(dist(coords[start], endco) if use_heuristic else 0, 0, start)]
 
-            # you can break out early when determening the topological distances
-            if topo and vcurrent == vend:
-                break
+    while heap:
+        _, d, current = heappop(heap)
 
-        # backtrace from the end vertex using the predecessor dict
-        path = []
-        endvert = vend
+        if current in settled:
+            continue
 
-        while endvert is not None:
-            path.append(endvert)
-            endvert = predecessor[endvert]
+        if current == end:
+            break
 
-        return reversed(path)
+        settled.add(current)
 
-    def f7(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
+        for i in range(offsets[current], offsets[current + 1]):
+            other = targets[i]
+
+            if other in settled:
+                continue
+
+            d_other = d + (1 if topo else lengths[i])
+
+            if d_other < distances.get(other, float('inf')):
+                distances[other] = d_other
+                predecessor[other] = current
+
+                heappush(heap, (d_other + dist(coords[other], endco) if use_heuristic else d_other, d_other, other))
+
+    if end not in predecessor:
+        return None
+
+    # backtrace from the end vertex using the predecessor dict
+    path = []
+    current = end
+
+    while current is not None:
+        path.append(current)
+        current = predecessor[current]
+
+    path.reverse()
+    return path
+
+
+def get_shortest_path(obj, bm, vstart, vend, topo=False, select=False):
+    """
+    get the shortest path of verts between vstart and vend of the obj's edit bmesh, either topologically or geometrically
+    the mesh graph is cached, so repeated path finding on the same, unchanged mesh doesn't rebuild it
+
+    originally based on
+    author: "G Bantle, Bagration, MACHIN3",
+    source: "https://blenderartists.org/forum/showthread.php?58564-Path-Select-script(Update-20060307-Ported-to-C-now-in-CVS",
+    video: https://www.youtube.com/watch?v=_lHSawdgXpI
+    """
 
-    verts = [v for v in bm.verts]
-    edges = [e for e in bm.edges]
+    graph = get_mesh_graph(obj, bm)
 
-    mg = build_mesh_graph(verts, edges, topo)
+    bm.verts.index_update()
+    bm.verts.ensure_lookup_table()
 
-    # vert list, shortest dist from vstart to vend
-    path = dijkstra(mg, vstart, vend, topo)
+    indices = dijkstra(graph, vstart.index, vend.index, topo=topo)
 
-    # remove duplicates, keeps order, see https://stackoverflow.com/a/480227
-    path = f7(path)
+    # like before, if the end can't be reached, the path is just the end vert
+    path = [bm.verts[i] for i in indices] if indices else [vend]
 
     # optionally select the path
     if select:
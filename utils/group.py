@@ -1,6 +1,7 @@
 import bpy
 from mathutils import Vector, Quaternion
-from . object import parent, unparent
+from heapq import heappush, heappop
+from . object import parent, unparent, get_hierarchy_children, get_indexed_visible_objects, get_cached_poll
 from . math import average_locations, get_loc_matrix, get_rot_matrix
 from . import registration as r
 
@@ -11,6 +12,7 @@ def group(context, sel, location='AVERAGE', rotation='WORLD'):
     col = get_group_collection(context, sel)
 
     empty = bpy.data.objects.new(name=get_group_default_name(), object_data=None)
+    update_group_name_index(empty)
     empty.M3.is_group_empty = True
     empty.matrix_world = get_group_matrix(context, sel, location, rotation)
     col.objects.link(empty)
@@ -70,19 +72,36 @@ def clean_up_groups(context):
 # CONTEXT
 
 def get_group_polls(context):
+    '''
+    the group polls are evaluated for every redraw of the group menus and panels, so only re-evaluate them when the depsgraph or selection has changed
+    '''
+
+    return get_cached_poll(context, 'GROUP', evaluate_group_polls)
+
+
+def evaluate_group_polls(context):
     active_group = active if (active := context.active_object) and active.M3.is_group_empty and active.select_get() else None
     active_child = active if (active := context.active_object) and active.parent and active.M3.is_group_object and active.select_get() else None
 
-    group_empties = bool([obj for obj in context.visible_objects if obj.M3.is_group_empty])
-    groupable = bool([obj for obj in context.selected_objects if (obj.parent and obj.parent.M3.is_group_empty) or not obj.parent])
-    ungroupable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty]) if group_empties else False
+    sel = context.selected_objects
+
+    group_empties = bool(get_indexed_visible_objects(context, category='GROUP_EMPTY'))
+    groupable = any((obj.parent and obj.parent.M3.is_group_empty) or not obj.parent for obj in sel)
+    ungroupable = any(obj.M3.is_group_empty for obj in sel) if group_empties else False
+
+    if active_group or active_child:
+        group = active_group if active_group else active_child.parent
+        members = set(group.children)
 
-    addable = bool([obj for obj in context.selected_objects if obj != (active_group if active_group else active_child.parent) and obj not in (active_group.children if active_group else active_child.parent.children) and (not obj.parent or (obj.parent and obj.parent.M3.is_group_empty and not obj.parent.select_get()))]) if active_group or active_child else False
+        addable = any(obj != group and obj not in members and (not obj.parent or (obj.parent and obj.parent.M3.is_group_empty and not obj.parent.select_get())) for obj in sel)
 
-    removable = bool([obj for obj in context.selected_objects if obj.M3.is_group_object])
-    selectable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty or obj.M3.is_group_object])
-    duplicatable = bool([obj for obj in context.selected_objects if obj.M3.is_group_empty])
-    groupifyable = bool([obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children])
+    else:
+        addable = False
+
+    removable = any(obj.M3.is_group_object for obj in sel)
+    selectable = any(obj.M3.is_group_empty or obj.M3.is_group_object for obj in sel)
+    duplicatable = any(obj.M3.is_group_empty for obj in sel)
+    groupifyable = any(obj.type == 'EMPTY' and not obj.M3.is_group_empty and obj.children for obj in sel)
 
     return bool(active_group), bool(active_child), group_empties, groupable, ungroupable, addable, removable, selectable, duplicatable, groupifyable
 
@@ -157,7 +176,7 @@ def select_group_children(view_layer, empty, recursive=False):
     they might not be visible when you are in local view, focusing on some of the group's objects
     '''
 
-    children = [c for c in empty.children if c.M3.is_group_object and c.name in view_layer.objects]
+    children = [c for c in get_hierarchy_children(view_layer, empty) if c.M3.is_group_object]
 
     # unhide any hidden group emtpies you may encounter
     if empty.hide_get():
@@ -175,21 +194,43 @@ def select_group_children(view_layer, empty, recursive=False):
 
 
 def get_child_depth(self, children, depth=0, init=False):
+    '''
+    get the depth of the deepest child chain below the passed in children
+    the heights of all objects are memoized, so shared sub-hierarchies are only walked once
+    NOTE: like obj.children, this covers children in excluded collections too, which the view layer's hierarchy index doesn't
+    '''
+
     if init or depth > self.depth:
         self.depth = depth
 
+    heights = {}
+
+    def get_height(obj):
+        height = heights.get(obj)
+
+        if height is None:
+            height = heights[obj] = 1 + max(get_height(c) for c in obj.children) if obj.children else 0
+
+        return height
+
     for child in children:
-        if child.children:
-            get_child_depth(self, child.children, depth + 1, init=False)
+        height = get_height(child)
+
+        if height and depth + height > self.depth:
+            self.depth = depth + height
 
     return self.depth
 
 
-def fade_group_sizes(context, size=None, groups=[], init=False):
+def fade_group_sizes(context, size=None, groups=None, init=False):
+    '''
+    fade the sizes of all group empties in the scene, including those in excluded collections, so this deliberately uses the scene's objects and obj.children, instead of the view layer's hierarchy index
+    '''
+
     if init:
         groups = [obj for obj in context.scene.objects if obj.M3.is_group_empty and not obj.parent]
 
-    for group in groups:
+    for group in groups or []:
         if size:
             factor = r.get_prefs().group_fade_factor
 
@@ -202,34 +243,208 @@ def fade_group_sizes(context, size=None, groups=[], init=False):
             fade_group_sizes(context, size=group.M3.group_size, groups=sub_groups, init=False)
 
 
+# NAME INDEX
+
+group_name_index = {}
+
+def parse_group_name(name, prefix='', suffix=''):
+    '''
+    split a name of the form prefix + basename + _001 + suffix into a (prefix, basename, suffix) key and the number
+    prefix and suffix are optional, and only names with at least 3 digit, zero padded numbers are considered
+    '''
+
+    if prefix and name.startswith(prefix):
+        name = name[len(prefix):]
+    else:
+        prefix = ''
+
+    if suffix and name.endswith(suffix):
+        name = name[:-len(suffix)]
+    else:
+        suffix = ''
+
+    basename, _, digits = name.rpartition('_')
+
+    if basename and digits.isdigit() and str(int(digits)).zfill(3) == digits:
+        return (prefix, basename, suffix), int(digits)
+
+
+def get_group_name_index():
+    '''
+    lazily index the numbered names of all objects per prefix, basename and suffix
+    the index is only fully built on first use, so after file loading, and when the naming prefs change, and then kept up to date incrementally
+    '''
+
+    global group_name_index
+
+    p = r.get_prefs()
+
+    signature = (p.group_prefix, p.group_suffix)
+
+    if group_name_index and group_name_index['signature'] == signature:
+        return group_name_index
+
+    group_name_index = {'signature': signature,
+                        'generation': 0,
+                        'keys': {},
+                        'objects': {}}
+
+    for obj in bpy.data.objects:
+        update_group_name_index(obj)
+
+    return group_name_index
+
+
+def tag_group_name_index():
+    '''
+    called on any object rename, and when objects have been added or removed, as the notifications don't tell which objects are affected
+    nothing is re-synced here, instead the numbers of a key are validated on its next lookup
+    '''
+
+    if group_name_index:
+        group_name_index['generation'] += 1
+
+
+def get_group_name_key_entry(key):
+    entry = group_name_index['keys'].get(key)
+
+    if entry is None:
+        entry = group_name_index['keys'][key] = {'used': {}, 'free': [], 'next': 1, 'generation': group_name_index['generation']}
+
+    return entry
+
+
+def validate_group_name_key_entry(key, entry):
+    '''
+    release the numbers of a key, whose objects have been removed or renamed since the index was last tagged
+    only the key's own names are looked up, so this is independent of the total object count
+    '''
+
+    if entry['generation'] == group_name_index['generation']:
+        return
+
+    prefix, basename, suffix = key
+
+    for number, ptr in list(entry['used'].items()):
+        obj = bpy.data.objects.get(f"{prefix}{basename}_{str(number).zfill(3)}{suffix}")
+
+        if not obj or obj.as_pointer() != ptr:
+            if ptr in group_name_index['objects']:
+                release_group_name_number(ptr)
+
+            else:
+                entry['used'].pop(number, None)
+                heappush(entry['free'], number)
+
+    entry['generation'] = group_name_index['generation']
+
+
+def release_group_name_number(ptr):
+    name, parsed = group_name_index['objects'].pop(ptr)
+
+    if parsed:
+        key, number = parsed
+        entry = get_group_name_key_entry(key)
+
+        if entry['used'].get(number) == ptr:
+            del entry['used'][number]
+            heappush(entry['free'], number)
+
+
+def update_group_name_index(obj):
+    '''
+    (re-)index an object's name, releasing its previous number, if it has been renamed
+    called for the renamed active object, and for all objects updated by the depsgraph, which includes newly added ones
+    '''
+
+    if not group_name_index:
+        return
+
+    ptr = obj.as_pointer()
+    name = obj.name
+
+    previous = group_name_index['objects'].get(ptr)
+
+    if previous and previous[0] == name:
+        return
+
+    prefix, suffix = group_name_index['signature']
+    parsed = parse_group_name(name, prefix, suffix)
+
+    if previous:
+        release_group_name_number(ptr)
+
+    if parsed:
+        key, number = parsed
+        get_group_name_key_entry(key)['used'][number] = ptr
+
+    group_name_index['objects'][ptr] = (name, parsed)
+
+
+def clear_group_name_index():
+    global group_name_index
+
+    group_name_index = {}
+
+
+def get_free_group_name(prefix, basename, suffix):
+    '''
+    get the name with the lowest free number for prefix, basename and suffix
+    released numbers are kept in a heap, and the remaining ones are handed out in order, so this is O(log n) instead of testing every name
+    nothing is reserved, the number is only taken, once an object is indexed with the name, and it's double checked against bpy.data.objects, in case the index is out of date
+    '''
+
+    get_group_name_index()
+
+    key = (prefix, basename, suffix)
+
+    entry = get_group_name_key_entry(key)
+    validate_group_name_key_entry(key, entry)
+
+    used = entry['used']
+    free = entry['free']
+
+    while True:
+
+        # prefer previously released numbers, skipping those that have been taken again since
+        while free and free[0] in used:
+            heappop(free)
+
+        if free and free[0] < entry['next']:
+            number = free[0]
+
+        else:
+            while entry['next'] in used:
+                entry['next'] += 1
+
+            number = entry['next']
+
+        name = f"{prefix}{basename}_{str(number).zfill(3)}{suffix}"
+
+        obj = bpy.data.objects.get(name)
+
+        if not obj:
+            return name
+
+        # the index is out of date, so index the object, that already has the name, and try the next number
+        update_group_name_index(obj)
+        used[number] = obj.as_pointer()
+
+
 # NAMING
 
 def get_group_default_name():
     '''
     create default group name, based on group naming prefs
     '''
-    
+
     p = r.get_prefs()
 
     if r.get_prefs().group_auto_name:
-        name = f"{p.group_prefix}{p.group_basename + '_001'}{p.group_suffix}"
-
-        c = 0
-        while name in bpy.data.objects:
-            c += 1
-            name = f"{p.group_prefix}{p.group_basename + '_' + str(c).zfill(3)}{p.group_suffix}"
-
-        return name
+        return get_free_group_name(p.group_prefix, p.group_basename, p.group_suffix)
 
     else:
-        name = f"{p.group_basename}_001"
-
-        c = 0
-        while name in bpy.data.objects:
-            c += 1
-            name = f"{p.group_basename + '_' + str(c).zfill(3)}"
-
-        return name
+        return get_free_group_name('', p.group_basename, '')
 
 
 def update_group_name(group):
@@ -249,12 +464,11 @@ def update_group_name(group):
     if name == newname:
         return
 
-    c = 0
-    while newname in bpy.data.objects:
-        c += 1
-        newname = f"{p.group_prefix}{name + '_' + str(c).zfill(3)}{p.group_suffix}"
+    if newname in bpy.data.objects:
+        newname = get_free_group_name(p.group_prefix, name, p.group_suffix)
 
     group.name = newname
+    update_group_name_index(group)
     
    
 def get_group_base_name(name, debug=False):
@@ -1,11 +1,94 @@
 import bpy
 
 
+# LIGHT REGISTRY
+
+light_registry = {}
+
+def build_light_registry(scene):
+    '''
+    collect the light objects of the scene, the view layers each of them is in, and the data of area lights, with a single pass over bpy.data.objects
+    '''
+
+    lights = [obj for obj in bpy.data.objects if obj.type == 'LIGHT' and obj.data]
+
+    light_registry['scene'] = scene.as_pointer()
+    light_registry['lights'] = [obj.name for obj in lights]
+    light_registry['area_lights'] = list({obj.data.name for obj in lights if obj.data.type == 'AREA'})
+
+    # per view layer, keep the names of the lights in it, in the original object order, so syncing gives the same result as a full scan
+    light_registry['view_layers'] = {view_layer.name: [obj.name for obj in lights if view_layer.objects.get(obj.name)] for view_layer in scene.view_layers}
+
+    # the hide states haven't been synced yet
+    light_registry['dirty'] = True
+
+
+def get_light_registry(scene=None, debug=False):
+    '''
+    get the light registry, and rebuild it lazily, if it has been invalidated or was built for a different scene
+    '''
+
+    if scene is None:
+        scene = bpy.context.scene
+
+    if not light_registry or light_registry['scene'] != scene.as_pointer() or set(light_registry['view_layers']) != {view_layer.name for view_layer in scene.view_layers}:
+        if debug:
+            print("  rebuilding light registry")
+
+        build_light_registry(scene)
+
+    return light_registry
+
+
+def tag_light_update(rebuild=False):
+    '''
+    called from the depsgraph handler
+        lights have to be re-collected, if objects have been added or removed, or lights have changed their type
+        otherwise, flag the hide states as possibly diverged from hide_render, which happens on scene updates, as hiding objects only changes base flags
+    '''
+
+    if rebuild:
+        light_registry.clear()
+
+    elif light_registry:
+        light_registry['dirty'] = True
+
+
+def clear_light_registry():
+    light_registry.clear()
+
+
+def get_registered_lights(names):
+    '''
+    fetch the light objects by name
+    if any of them is gone or no longer a light, which is the case after renames, invalidate the registry and return None, so the caller can start over
+    '''
+
+    lights = []
+
+    for name in names:
+        obj = bpy.data.objects.get(name)
+
+        if obj and obj.type == 'LIGHT':
+            lights.append(obj)
+
+        else:
+            light_registry.clear()
+            return None
+
+    return lights
+
+
+# LIGHTS
+
 def adjust_lights_for_rendering(mode='DECREASE', debug=False):
     divider = bpy.context.scene.M3.adjust_lights_on_render_divider
 
-    for light in bpy.data.lights:
-        if light.type == 'AREA':
+    # NOTE: light data shared by multiple objects is only adjusted once, and orphan lights are ignored
+    for name in get_light_registry()['area_lights']:
+        light = bpy.data.lights.get(name)
+
+        if light and light.type == 'AREA':
 
             if mode == 'DECREASE':
                 if debug:
@@ -21,4 +104,4 @@ def adjust_lights_for_rendering(mode='DECREASE', debug=False):
 
 
 def get_area_light_poll():
-    return [obj for obj in bpy.data.objects if obj.type == 'LIGHT' and obj.data.type == 'AREA']
+    return bool(get_light_registry()['area_lights'])
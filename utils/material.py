@@ -1,8 +1,8 @@
 import bpy
 from mathutils import Vector
+import numpy as np
 from . registration import get_addon
-from . math import get_sca_matrix
-from . mesh import get_bbox
+from . object import get_mesh_update_count
 
 
 decalmachine = None
@@ -27,6 +27,74 @@ def lighten_color(color, amount):
     return tuple(remap(c, amount) for c in color)
 
 
+# BEVEL SHADER CACHE
+
+mesh_dimensions = {}
+bevel_materials = {}
+
+def get_mesh_dimensions(mesh):
+    '''
+    get the dimensions of the non-evaluated mesh, cached per mesh pointer and only re-calculated if the mesh's geometry was updated
+    unlike get_bbox(), no corner and center vectors are created, as only the dimensions are needed here
+    '''
+
+    ptr = mesh.as_pointer()
+    vert_count = len(mesh.vertices)
+    key = (mesh.name, get_mesh_update_count(mesh), vert_count)
+
+    cached = mesh_dimensions.get(ptr)
+
+    if cached and cached[0] == key:
+        return cached[1]
+
+    if vert_count:
+        coords = np.empty(vert_count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        dims = tuple(np.ptp(coords.reshape(-1, 3), axis=0).tolist())
+
+    else:
+        dims = (0, 0, 0)
+
+    mesh_dimensions[ptr] = (key, dims)
+    return dims
+
+
+def get_bevel_material_key(mat):
+    '''
+    node and link counts change whenever the bevel setup is created or removed, or the material output is re-connected
+    '''
+
+    tree = mat.node_tree
+    return (mat.name, tree.as_pointer(), len(tree.nodes), len(tree.links)) if tree else (mat.name, None, 0, 0)
+
+
+def get_bevel_material_state(mat):
+    '''
+    get the cached bevel setup state of a material, which is either
+        'BEVEL', if it carries the MACHIN3tools Bevel nodes
+        'NONE', if it doesn't, and none can be created, as there is no free normal input
+    or None, if it's unknown or outdated
+    '''
+
+    cached = bevel_materials.get(mat.as_pointer())
+
+    if cached and cached[0] == get_bevel_material_key(mat):
+        return cached[1]
+
+
+def set_bevel_material_state(mat, state):
+    if state:
+        bevel_materials[mat.as_pointer()] = (get_bevel_material_key(mat), state)
+
+    else:
+        bevel_materials.pop(mat.as_pointer(), None)
+
+
+def clear_bevel_shader_cache():
+    mesh_dimensions.clear()
+    bevel_materials.clear()
+
+
 # BEVEL SHADER
 
 def adjust_bevel_shader(context, debug=False):
@@ -114,7 +182,7 @@ def adjust_bevel_shader(context, debug=False):
         if m3.use_bevel_shader:
 
             # for panel decal objects, ensure the radius mod is the same as the parent object's
-            if decalmachine and obj.DM.decaltype == 'PANEL' and obj.parent:
+            if decalmachine and obj.DM.decaltype == 'PANEL' and obj.parent and obj.M3.bevel_shader_radius_mod != obj.parent.M3.bevel_shader_radius_mod:
                 obj.M3.avoid_update = True
                 obj.M3.bevel_shader_radius_mod = obj.parent.M3.bevel_shader_radius_mod
 
@@ -132,34 +200,30 @@ def adjust_bevel_shader(context, debug=False):
                 if dimobj.type == 'MESH':
                     # print(obj.name)
                     
-                    # get mesh dimensios as vector
-                    dims = Vector(get_bbox(dimobj.data)[2])
+                    # get the cached mesh dimensions
+                    dims = get_mesh_dimensions(dimobj.data)
 
-                    # get scalemx
-                    scalemx = get_sca_matrix(dimobj.matrix_world.to_scale())
-                    
-                    # get the maxdims by getting the length of the scalemx @ dis vector
-                    maxdim = (scalemx @ dims).length
+                    # get the maxdims by getting the length of the scaled dims vector
+                    maxdim = Vector([d * s for d, s in zip(dims, dimobj.matrix_world.to_scale())]).length
                     # print(maxdim)
                 
                 # fall back to obj.dims for non-mesh objects
                 else:
                     maxdim = max(dimobj.dimensions)
 
-                if debug:
-                    print(" setting bevel dimensions to:", maxdim)
-
-                obj.M3.bevel_shader_dimensions_mod = maxdim
-
             # re-set dimensions factor to 1
             else:
+                maxdim = 1
+
+            # only touch objects, whose dimensions factor actually changes
+            if abs(obj.M3.bevel_shader_dimensions_mod - maxdim) > 1e-6:
                 if debug:
-                    print(" re-setting bevel dimensions")
+                    print(" setting bevel dimensions to:", maxdim)
 
-                obj.M3.bevel_shader_dimensions_mod = 1
+                obj.M3.bevel_shader_dimensions_mod = maxdim
 
-            # this seems to be required, or toggling m3.bevel_shader_use_dimenions won't update the shader effect, unless you toggle in and out of obect mode
-            obj.update_tag()
+                # this seems to be required, or toggling m3.bevel_shader_use_dimenions won't update the shader effect, unless you toggle in and out of obect mode
+                obj.update_tag()
 
     # print("\nvisible mats:", [mat.name for mat in visible_mats])
 
@@ -173,6 +237,24 @@ def adjust_bevel_shader(context, debug=False):
 
         tree = mat.node_tree
 
+        state = get_bevel_material_state(mat)
+
+        if debug:
+            print(" cached state:", state)
+
+        # materials, that are known to not carry a bevel setup, and to not support one, can be skipped right away
+        if state == 'NONE':
+            continue
+
+        # for materials known to carry the bevel setup, only the nodes that are adjusted need to be fetched, when the shader is in use
+        elif state == 'BEVEL' and m3.use_bevel_shader:
+            bevel = tree.nodes.get('MACHIN3tools Bevel')
+            global_radius = tree.nodes.get('MACHIN3tools Bevel Shader Global Radius')
+
+            if bevel and global_radius:
+                adjust_bevel_shader_nodes(m3, bevel, global_radius, debug=debug)
+                continue
+
         bevel = tree.nodes.get('MACHIN3tools Bevel')
         math = tree.nodes.get('MACHIN3tools Bevel Shader Radius Math')
         math2 = tree.nodes.get('MACHIN3tools Bevel Shader Radius Math2')
@@ -217,6 +299,7 @@ def adjust_bevel_shader(context, debug=False):
 
                     # non-panel decals, ignore
                     else:
+                        set_bevel_material_state(mat, 'NONE')
                         continue
 
                 # fallback to any other node or node group
@@ -234,32 +317,19 @@ def adjust_bevel_shader(context, debug=False):
 
                 # couldn't find a normal input, moving on to the next material
                 else:
+                    set_bevel_material_state(mat, 'NONE')
                     continue
 
             # couldn't find last node, moving on to the next material
             else:
+                set_bevel_material_state(mat, 'NONE')
                 continue
 
         # set bevel node props
         if m3.use_bevel_shader:
-            samples = bevel.samples
-            radius = global_radius.outputs[0].default_value
+            adjust_bevel_shader_nodes(m3, bevel, global_radius, debug=debug)
 
-            if samples != m3.bevel_shader_samples:
-                if debug:
-                    print(" setting bevel samples to:", m3.bevel_shader_samples)
-
-                bevel.samples = m3.bevel_shader_samples
-
-            if radius != m3.bevel_shader_radius:
-                if debug:
-                    print(" setting bevel radius to:", m3.bevel_shader_radius)
-                
-                # set the radius on the bevel node itself, even if it's overwritten by the input from the math node
-                bevel.inputs[0].default_value = m3.bevel_shader_radius
-
-                # then set it on the global radius value node
-                global_radius.outputs[0].default_value = m3.bevel_shader_radius
+            set_bevel_material_state(mat, 'BEVEL')
 
 
         # REMOVE BEVEL NODE and WHITE BEVEL MAT mat
@@ -272,6 +342,7 @@ def adjust_bevel_shader(context, debug=False):
                 if debug:
                     print(" removing white bevel material")
 
+                ptr = mat.as_pointer()
                 bpy.data.materials.remove(mat, do_unlink=True)
                 
                 for obj in white_bevel_objs:
@@ -280,12 +351,39 @@ def adjust_bevel_shader(context, debug=False):
                     if debug:
                         print("  clearing material slots on", obj.name)
 
+                # the material is gone, so get rid of its entry by pointer, before it can be re-used
+                bevel_materials.pop(ptr, None)
+
 
             # REMOVE BEVEL NODE SETUP
 
             else:
                 remove_bevel_shader_setup(mat, bevel, math, math2, global_radius, obj_modulation, dim_modulation, decalmachine, get_decalgroup_from_decalmat, get_trimsheetgroup_from_trimsheetmat, debug)
 
+                set_bevel_material_state(mat, None)
+
+
+def adjust_bevel_shader_nodes(m3, bevel, global_radius, debug=False):
+    '''
+    set the bevel samples and radius, but only if they differ from the m3 props
+    '''
+
+    if bevel.samples != m3.bevel_shader_samples:
+        if debug:
+            print(" setting bevel samples to:", m3.bevel_shader_samples)
+
+        bevel.samples = m3.bevel_shader_samples
+
+    if global_radius.outputs[0].default_value != m3.bevel_shader_radius:
+        if debug:
+            print(" setting bevel radius to:", m3.bevel_shader_radius)
+
+        # set the radius on the bevel node itself, even if it's overwritten by the input from the math node
+        bevel.inputs[0].default_value = m3.bevel_shader_radius
+
+        # then set it on the global radius value node
+        global_radius.outputs[0].default_value = m3.bevel_shader_radius
+
 
 def create_and_connect_bevel_shader_setup(mat, last_node, normal_inputs, math=None, math2=None, global_radius=None, obj_modulation=None, dim_modulation=None, decalmachine=False, debug=False):
     '''
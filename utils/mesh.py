@@ -91,103 +91,388 @@ def get_coords(mesh, mx=None, offset=0, indices=False):
     return coords
 
 
+# MESH ANALYSIS
+
+def get_mesh_data(obj):
+    '''
+    pull coords, edge, loop and face topology of an edit mode object in bulk via foreach_get
+    the edit mode bmesh is written to the mesh first, which preserves the element order, so indices in the returned arrays match the bmesh's element indices
+    '''
+
+    obj.update_from_editmode()
+    mesh = obj.data
+
+    vert_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+    loop_count = len(mesh.loops)
+    face_count = len(mesh.polygons)
+
+    coords = np.empty((vert_count, 3), float)
+    mesh.vertices.foreach_get('co', np.reshape(coords, vert_count * 3))
+
+    edges = np.empty((edge_count, 2), np.int32)
+    mesh.edges.foreach_get('vertices', np.reshape(edges, edge_count * 2))
+
+    loop_verts = np.empty(loop_count, np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+
+    loop_edges = np.empty(loop_count, np.int32)
+    mesh.loops.foreach_get('edge_index', loop_edges)
+
+    loop_starts = np.empty(face_count, np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+
+    loop_totals = np.empty(face_count, np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+
+    normals = np.empty((face_count, 3), float)
+    mesh.polygons.foreach_get('normal', np.reshape(normals, face_count * 3))
+
+    selected_verts = np.empty(vert_count, bool)
+    mesh.vertices.foreach_get('select', selected_verts)
+
+    selected_edges = np.empty(edge_count, bool)
+    mesh.edges.foreach_get('select', selected_edges)
+
+    selected_faces = np.empty(face_count, bool)
+    mesh.polygons.foreach_get('select', selected_faces)
+
+    return {'coords': coords,
+            'edges': edges,
+            'loop_verts': loop_verts,
+            'loop_edges': loop_edges,
+            'loop_starts': loop_starts,
+            'loop_totals': loop_totals,
+            'loop_faces': np.repeat(np.arange(face_count), loop_totals),
+            'normals': normals,
+            'selected_verts': selected_verts,
+            'selected_edges': selected_edges,
+            'selected_faces': selected_faces,
+            'vert_edge_counts': np.bincount(edges.ravel(), minlength=vert_count),
+            'edge_face_counts': np.bincount(loop_edges, minlength=edge_count)}
+
+
+def get_non_manifold_mask(data):
+    '''
+    like BMEdge.is_manifold, an edge is manifold, if it has exactly 2 faces
+    '''
+
+    return data['edge_face_counts'] != 2
+
+
+def get_loose_masks(data):
+    '''
+    return vert, edge and face masks of loose geometry
+        loose verts don't have any edges
+        loose edges don't have any faces
+        loose faces don't have a single manifold edge
+    '''
+
+    loose_verts = data['vert_edge_counts'] == 0
+    loose_edges = data['edge_face_counts'] == 0
+
+    if len(data['loop_starts']):
+        manifold_loops = data['edge_face_counts'][data['loop_edges']] == 2
+        loose_faces = ~np.logical_or.reduceat(manifold_loops, data['loop_starts'])
+    else:
+        loose_faces = np.zeros(0, bool)
+
+    return loose_verts, loose_edges, loose_faces
+
+
+def get_redundant_edges_mask(data, angle=179.999):
+    '''
+    manifold edges, whose face angle is below 180 - angle, so edges on flat surfaces
+    '''
+
+    manifold = data['edge_face_counts'] == 2
+    mask = np.zeros(len(manifold), bool)
+
+    if not manifold.any():
+        return mask
+
+    # sort the loops by edge, so the two faces of each manifold edge are found next to each other
+    order = np.argsort(data['loop_edges'], kind='stable')
+    starts = np.concatenate(([0], np.cumsum(data['edge_face_counts'])[:-1]))[manifold]
+
+    faces = data['loop_faces'][order]
+    normals = data['normals']
+
+    dots = np.einsum('ij,ij->i', normals[faces[starts]], normals[faces[starts + 1]])
+    angles = np.degrees(np.arccos(np.clip(dots, -1, 1)))
+
+    mask[manifold] = angles < 180 - angle
+    return mask
+
+
+def get_redundant_verts_mask(data, angle=179.999):
+    '''
+    verts with exactly 2 edges, whose edges are straight enough, so the angle between them is above the passed in angle
+    '''
+
+    two_edged = data['vert_edge_counts'] == 2
+    mask = np.zeros(len(two_edged), bool)
+
+    if not two_edged.any():
+        return mask
+
+    # sort the edge slots by vert, the other vert of each slot is found in the neighbouring slot of the same edge
+    flat = data['edges'].ravel()
+    order = np.argsort(flat, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(data['vert_edge_counts'])[:-1]))[two_edged]
+
+    coords = data['coords']
+    vco = coords[two_edged]
+
+    vector1 = coords[flat[order[starts] ^ 1]] - vco
+    vector2 = coords[flat[order[starts + 1] ^ 1]] - vco
+
+    lengths = np.linalg.norm(vector1, axis=1) * np.linalg.norm(vector2, axis=1)
+
+    # zero length edges have no angle, and are left to dissolve_degenerate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosines = np.einsum('ij,ij->i', vector1, vector2) / lengths
+
+    angles = np.degrees(np.arccos(np.clip(np.nan_to_num(cosines, nan=1, posinf=1, neginf=1), -1, 1)))
+
+    mask[two_edged] = angle < angles
+    return mask
+
+
+def get_non_planar_mask(data, threshold=0.001):
+    '''
+    faces with more than 3 verts, with at least one vert further away from the plane through the face's median center than the threshold
+    '''
+
+    totals = data['loop_totals']
+
+    if not len(totals):
+        return np.zeros(0, bool)
+
+    faces = data['loop_faces']
+    loop_coords = data['coords'][data['loop_verts']]
+
+    centers = np.add.reduceat(loop_coords, data['loop_starts'], axis=0) / totals[:, None]
+    distances = np.abs(np.einsum('ij,ij->i', loop_coords - centers[faces], data['normals'][faces]))
+
+    return (totals > 3) & (np.maximum.reduceat(distances, data['loop_starts']) > threshold)
+
+
+# BULK ATTRIBUTES
+
+bool_arrays = {}
+
+def get_bool_array(size, value=True):
+    '''
+    get a cached, constant bool array of the passed in size, to be used with foreach_set
+    NOTE: the arrays are shared, so don't modify them
+    '''
+
+    key = (size, bool(value))
+    array = bool_arrays.get(key)
+
+    if array is None:
+
+        # only the sizes of the most recently used meshes are worth keeping around
+        if len(bool_arrays) > 16:
+            bool_arrays.clear()
+
+        array = bool_arrays[key] = np.full(size, bool(value), dtype=bool)
+
+    return array
+
+
+def get_attribute(collection, attr, dtype=bool, width=1):
+    '''
+    get a mesh element attribute of all elements in a single pass, as a 2d array for attributes with multiple components
+    '''
+
+    array = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attr, array)
+    return array.reshape(-1, width) if width > 1 else array
+
+
+def set_attribute(collection, attr, value):
+    '''
+    set a mesh element attribute of all elements in a single pass, from either a single bool value, or a mask/array
+    '''
+
+    if isinstance(value, (bool, np.bool_)):
+        value = get_bool_array(len(collection), value)
+
+    collection.foreach_set(attr, value)
+
+
+def set_mesh_attribute(mesh, attr, value, domains=('polygons', 'edges', 'vertices')):
+    for domain in domains:
+        set_attribute(getattr(mesh, domain), attr, value)
+
+
+def get_face_mask(mesh, prop='selected', material_index=None):
+    '''
+    get a face mask from the face's selected, hidden or visible states, or from the material index
+    '''
+
+    if material_index is not None:
+        return get_attribute(mesh.polygons, 'material_index', dtype=np.int32) == material_index
+
+    if prop == 'selected':
+        return get_attribute(mesh.polygons, 'select')
+
+    hidden = get_attribute(mesh.polygons, 'hide')
+    return hidden if prop == 'hidden' else ~hidden
+
+
+def get_face_element_masks(mesh, mask):
+    '''
+    get the vert and edge masks of all verts and edges used by the masked faces
+    '''
+
+    loop_verts = get_attribute(mesh.loops, 'vertex_index', dtype=np.int32)
+    loop_edges = get_attribute(mesh.loops, 'edge_index', dtype=np.int32)
+    loop_totals = get_attribute(mesh.polygons, 'loop_total', dtype=np.int32)
+
+    loop_mask = np.repeat(mask, loop_totals)
+
+    verts = np.zeros(len(mesh.vertices), dtype=bool)
+    verts[loop_verts[loop_mask]] = True
+
+    edges = np.zeros(len(mesh.edges), dtype=bool)
+    edges[loop_edges[loop_mask]] = True
+
+    return verts, edges
+
+
+def select_faces(mesh, mask, extend=False):
+    '''
+    select the masked faces, and the verts and edges used by them, optionally keeping the existing selection
+    '''
+
+    if extend:
+        mask = mask | get_attribute(mesh.polygons, 'select')
+
+    verts, edges = get_face_element_masks(mesh, mask)
+
+    if extend:
+        verts |= get_attribute(mesh.vertices, 'select')
+        edges |= get_attribute(mesh.edges, 'select')
+
+    set_attribute(mesh.polygons, 'select', mask)
+    set_attribute(mesh.edges, 'select', edges)
+    set_attribute(mesh.vertices, 'select', verts)
+
+    mesh.update()
+
+
+def hide_faces(mesh, mask, deselect=True):
+    '''
+    hide the masked faces, as well as the verts and edges, that aren't used by any of the remaining visible faces
+    '''
+
+    hidden = mask | get_attribute(mesh.polygons, 'hide')
+
+    visible_verts, visible_edges = get_face_element_masks(mesh, ~hidden)
+    hidden_verts, hidden_edges = get_face_element_masks(mesh, hidden)
+
+    set_attribute(mesh.polygons, 'hide', hidden)
+    set_attribute(mesh.edges, 'hide', hidden_edges & ~visible_edges)
+    set_attribute(mesh.vertices, 'hide', hidden_verts & ~visible_verts)
+
+    # hidden elements shouldn't remain selected
+    if deselect:
+        set_attribute(mesh.polygons, 'select', get_attribute(mesh.polygons, 'select') & ~hidden)
+        set_attribute(mesh.edges, 'select', get_attribute(mesh.edges, 'select') & visible_edges)
+        set_attribute(mesh.vertices, 'select', get_attribute(mesh.vertices, 'select') & visible_verts)
+
+    mesh.update()
+
+
+def hide_selected(mesh):
+    hide_faces(mesh, get_face_mask(mesh, 'selected'))
+
+
+def select_material(mesh, material_index, extend=False):
+    select_faces(mesh, get_face_mask(mesh, material_index=material_index), extend=extend)
+
+
 # MESH
 
 def hide(mesh):
-    mesh.polygons.foreach_set('hide', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [True] * len(mesh.vertices))
+    set_mesh_attribute(mesh, 'hide', True)
 
     mesh.update()
 
 
 def unhide(mesh):
-    mesh.polygons.foreach_set('hide', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('hide', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('hide', [False] * len(mesh.vertices))
+    set_mesh_attribute(mesh, 'hide', False)
 
     mesh.update()
 
 
 def unhide_select(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
-
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
-
-    mesh.polygons.foreach_set('select', [True] * polygons)
-    mesh.edges.foreach_set('select', [True] * edges)
-    mesh.vertices.foreach_set('select', [True] * vertices)
+    set_mesh_attribute(mesh, 'hide', False)
+    set_mesh_attribute(mesh, 'select', True)
 
     mesh.update()
 
 
 def unhide_deselect(mesh):
-    polygons = len(mesh.polygons)
-    edges = len(mesh.edges)
-    vertices = len(mesh.vertices)
-
-    mesh.polygons.foreach_set('hide', [False] * polygons)
-    mesh.edges.foreach_set('hide', [False] * edges)
-    mesh.vertices.foreach_set('hide', [False] * vertices)
-
-    mesh.polygons.foreach_set('select', [False] * polygons)
-    mesh.edges.foreach_set('select', [False] * edges)
-    mesh.vertices.foreach_set('select', [False] * vertices)
+    set_mesh_attribute(mesh, 'hide', False)
+    set_mesh_attribute(mesh, 'select', False)
 
     mesh.update()
 
 
 def select(mesh):
-    mesh.polygons.foreach_set('select', [True] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [True] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [True] * len(mesh.vertices))
+    set_mesh_attribute(mesh, 'select', True)
 
     mesh.update()
 
 
 def deselect(mesh):
-    mesh.polygons.foreach_set('select', [False] * len(mesh.polygons))
-    mesh.edges.foreach_set('select', [False] * len(mesh.edges))
-    mesh.vertices.foreach_set('select', [False] * len(mesh.vertices))
+    set_mesh_attribute(mesh, 'select', False)
 
     mesh.update()
 
 
-# BMESH
+def smooth(mesh, smooth=True, mask=None):
+    '''
+    set the face smoothing of all faces, or only of the masked ones
+    '''
 
-def blast(mesh, prop, type):
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    bm.normal_update()
-    bm.verts.ensure_lookup_table()
+    if mask is None:
+        set_attribute(mesh.polygons, 'use_smooth', smooth)
 
-    if prop == "hidden":
-        faces = [f for f in bm.faces if f.hide]
+    else:
+        use_smooth = get_attribute(mesh.polygons, 'use_smooth')
+        use_smooth[mask] = smooth
 
-    elif prop == "visible":
-        faces = [f for f in bm.faces if not f.hide]
+        set_attribute(mesh.polygons, 'use_smooth', use_smooth)
 
-    elif prop == "selected":
-        faces = [f for f in bm.faces if f.select]
+    mesh.update()
 
-    bmesh.ops.delete(bm, geom=faces, context=type)
 
-    bm.to_mesh(mesh)
-    bm.clear()
+# BMESH
 
+def blast(mesh, prop, type):
+    '''
+    delete the hidden, visible or selected faces
+    NOTE: there's no way to delete geometry via attributes without losing custom data, so bmesh is still used for the deletion, but the faces are found via the face mask in one pass
+    '''
+
+    mask = get_face_mask(mesh, prop)
+
+    if not mask.any():
+        return
 
-def smooth(mesh, smooth=True):
     bm = bmesh.new()
     bm.from_mesh(mesh)
     bm.normal_update()
-    bm.verts.ensure_lookup_table()
+    bm.faces.ensure_lookup_table()
+
+    faces = [bm.faces[i] for i in np.flatnonzero(mask)]
 
-    for f in bm.faces:
-        f.smooth = smooth
+    bmesh.ops.delete(bm, geom=faces, context=type)
 
     bm.to_mesh(mesh)
     bm.free()
@@ -203,51 +488,242 @@ def flip_normals(mesh):
     bm.free()
 
 
+# JOIN
+
+# foreach_get/set keys, component counts and dtypes for generic attributes
+attribute_data_types = {'FLOAT': ('value', 1, np.float32),
+                        'INT': ('value', 1, np.int32),
+                        'INT8': ('value', 1, np.int8),
+                        'BOOLEAN': ('value', 1, bool),
+                        'FLOAT_VECTOR': ('vector', 3, np.float32),
+                        'FLOAT2': ('vector', 2, np.float32),
+                        'INT32_2D': ('value', 2, np.int32),
+                        'QUATERNION': ('value', 4, np.float32),
+                        'FLOAT_COLOR': ('color', 4, np.float32),
+                        'BYTE_COLOR': ('color', 4, np.float32)}
+
+attribute_domains = {'POINT': 'vertices',
+                     'EDGE': 'edges',
+                     'CORNER': 'loops',
+                     'FACE': 'polygons'}
+
+# element props, that are joined explicitly, rather than as generic attributes
+join_element_props = {'vertices': [('select', bool), ('hide', bool)],
+                      'edges': [('select', bool), ('hide', bool), ('use_seam', bool), ('use_edge_sharp', bool)] + ([('bevel_weight', np.float32), ('crease', np.float32)] if bpy.app.version < (4, 0, 0) else []),
+                      'polygons': [('select', bool), ('hide', bool), ('use_smooth', bool), ('material_index', np.int32)]}
+
+join_skip_attributes = {'position', 'material_index', 'sharp_face', 'sharp_edge', 'Machin3FaceSelect'}
+
+
+def get_join_attributes(meshes, counts):
+    '''
+    concatenate the generic attributes of all meshes, elements of meshes without the attribute get zeroed values
+    has to be called before elements are added to the first mesh, as its arrays would no longer match its counts otherwise
+    NOTE: internal attributes, whose names start with a dot, are skipped, the relevant ones are joined via element props
+    '''
+
+    attributes = {}
+
+    for m in meshes:
+        for attr in m.attributes:
+            if attr.name.startswith('.') or attr.name in join_skip_attributes or attr.name in attributes:
+                continue
+
+            if attr.data_type in attribute_data_types and attr.domain in attribute_domains:
+                attributes[attr.name] = (attr.domain, attr.data_type)
+
+    joined = {}
+
+    for name, (domain, data_type) in attributes.items():
+        key, width, dtype = attribute_data_types[data_type]
+        domain_counts = counts[attribute_domains[domain]]
+
+        arrays = []
+
+        for m, count in zip(meshes, domain_counts):
+            attr = m.attributes.get(name)
+            array = np.zeros((count, width), dtype=dtype)
+
+            if attr and attr.domain == domain and attr.data_type == data_type:
+                attr.data.foreach_get(key, array.ravel())
+
+            arrays.append(array)
+
+        joined[name] = (domain, data_type, np.concatenate(arrays))
+
+    return joined
+
+
+def set_join_attributes(mesh, attributes):
+    '''
+    set the attributes gathered by get_join_attributes() on the joined mesh, creating them if necessary
+    '''
+
+    for name, (domain, data_type, array) in attributes.items():
+        attr = mesh.attributes.get(name)
+
+        if not attr:
+            attr = mesh.attributes.new(name, data_type, domain)
+
+        attr.data.foreach_set(attribute_data_types[data_type][0], array.ravel())
+
+
+def get_join_vertex_groups(objects, offsets):
+    '''
+    collect the vertex group weights of the joined objects by group name, as joined vertex indices grouped by weight
+    NOTE: there is no bulk access for deform weights, so this loops over the vertices, but only of objects that actually have vertex groups
+    '''
+
+    groups = {}
+
+    for obj, offset in zip(objects, offsets):
+        if not obj.vertex_groups:
+            continue
+
+        names = {vg.index: vg.name for vg in obj.vertex_groups}
+
+        for v in obj.data.vertices:
+            for g in v.groups:
+                name = names.get(g.group)
+
+                if name:
+                    groups.setdefault(name, {}).setdefault(g.weight, []).append(int(v.index + offset))
+
+    return groups
+
+
+def set_join_vertex_groups(obj, groups):
+    '''
+    add the vertex group weights collected by get_join_vertex_groups() to the obj, creating the groups if necessary
+    '''
+
+    for name, weights in groups.items():
+        vg = obj.vertex_groups.get(name)
+
+        if not vg:
+            vg = obj.vertex_groups.new(name=name)
+
+        for weight, indices in weights.items():
+            vg.add(indices, weight, 'REPLACE')
+
+
+def get_join_normals(meshes, matrices):
+    '''
+    concatenate the loop normals of all meshes, brought into the target's local space via the inverse transpose of the passed in matrices
+    '''
+
+    normals = []
+
+    for m, mx in zip(meshes, matrices):
+
+        # before 4.1 the split normals have to be calculated explicitly
+        if bpy.app.version < (4, 1, 0):
+            m.calc_normals_split()
+
+        loop_normals = get_attribute(m.loops, 'normal', np.float32, 3)
+
+        if mx is not None:
+            loop_normals = loop_normals @ np.linalg.inv(mx[:3, :3])
+            lengths = np.linalg.norm(loop_normals, axis=1, keepdims=True)
+            loop_normals = np.divide(loop_normals, lengths, out=np.zeros_like(loop_normals), where=lengths > 0)
+
+        normals.append(loop_normals)
+
+    return np.concatenate(normals)
+
+
 def join(target, objects, select=[]):
+    '''
+    join the meshes of the passed in objects into the target's mesh, by concatenating their element arrays with NumPy, instead of merging bmeshes
+    the elements are appended to the target mesh, so its own custom data is kept, the joined objects' vertex groups are carried over by name
+    faces of each object are tagged with the object's index + 1 in the Machin3FaceSelect face attribute, and those of the objects in select, get selected
+    NOTE: if any of the meshes has custom normals, the loop normals of all of them are set as custom normals on the joined mesh
+    '''
+
+    mesh = target.data
     mxi = target.matrix_world.inverted_safe()
 
-    bm = bmesh.new()
-    bm.from_mesh(target.data)
-    bm.normal_update()
-    bm.verts.ensure_lookup_table()
+    if any([obj.data.use_auto_smooth for obj in objects]):
+        mesh.use_auto_smooth = True
 
-    select_layer = bm.faces.layers.int.get('Machin3FaceSelect')
+    meshes = [mesh] + [obj.data for obj in objects]
+    counts = {domain: [len(getattr(m, domain)) for m in meshes] for domain in ['vertices', 'edges', 'loops', 'polygons']}
+    offsets = {domain: np.cumsum([0] + c[:-1]) for domain, c in counts.items()}
 
-    if not select_layer:
-        select_layer = bm.faces.layers.int.new('Machin3FaceSelect')
+    # vertex coords, with the objects' coords brought into the target's local space
+    coords = [get_attribute(mesh.vertices, 'co', np.float32, 3)]
+    matrices = [None]
 
-    if any([obj.data.use_auto_smooth for obj in objects]):
-        target.data.use_auto_smooth = True
+    for obj, m in zip(objects, meshes[1:]):
+        mx = np.array(mxi @ obj.matrix_world, dtype=np.float32)
+        coords.append(get_attribute(m.vertices, 'co', np.float32, 3) @ mx[:3, :3].T + mx[:3, 3])
+        matrices.append(mx)
 
-    for idx, obj in enumerate(objects):
-        mesh = obj.data
-        mx = obj.matrix_world
-        mesh.transform(mxi @ mx)
+    # topology, with the indices offset by the element counts of the preceeding meshes
+    edges = np.concatenate([get_attribute(m.edges, 'vertices', np.int32, 2) + offsets['vertices'][i] for i, m in enumerate(meshes)])
+    loop_verts = np.concatenate([get_attribute(m.loops, 'vertex_index', np.int32) + offsets['vertices'][i] for i, m in enumerate(meshes)])
+    loop_edges = np.concatenate([get_attribute(m.loops, 'edge_index', np.int32) + offsets['edges'][i] for i, m in enumerate(meshes)])
+    loop_starts = np.concatenate([get_attribute(m.polygons, 'loop_start', np.int32) + offsets['loops'][i] for i, m in enumerate(meshes)])
+    loop_totals = np.concatenate([get_attribute(m.polygons, 'loop_total', np.int32) for m in meshes])
 
-        bmm = bmesh.new()
-        bmm.from_mesh(mesh)
-        bmm.normal_update()
-        bmm.verts.ensure_lookup_table()
+    # element props
+    props = {domain: {prop: np.concatenate([get_attribute(getattr(m, domain), prop, dtype) for m in meshes]) for prop, dtype in domain_props} for domain, domain_props in join_element_props.items()}
 
-        obj_select_layer = bmm.faces.layers.int.get('Machin3FaceSelect')
+    # face tags, the target's faces keep the tags of previous joins
+    tag_attr = mesh.attributes.get('Machin3FaceSelect')
+    tags = [get_attribute(tag_attr.data, 'value', np.int32) if tag_attr else np.zeros(counts['polygons'][0], dtype=np.int32)]
+    tags.extend(np.full(count, idx + 1, dtype=np.int32) for idx, count in enumerate(counts['polygons'][1:]))
+    tags = np.concatenate(tags)
 
-        if not obj_select_layer:
-            obj_select_layer = bmm.faces.layers.int.new('Machin3FaceSelect')
+    # generic attributes, vertex groups and custom normals, all gathered before the target mesh's element counts change
+    attributes = get_join_attributes(meshes, counts)
+    vertex_groups = get_join_vertex_groups(objects, offsets['vertices'][1:])
+    normals = get_join_normals(meshes, matrices) if any(m.has_custom_normals for m in meshes) else None
 
-        for f in bmm.faces:
-            f[obj_select_layer] = idx + 1
+    # append the new elements to the target mesh, and set everything in one pass per attribute
+    mesh.vertices.add(sum(counts['vertices'][1:]))
+    mesh.edges.add(sum(counts['edges'][1:]))
+    mesh.loops.add(sum(counts['loops'][1:]))
+    mesh.polygons.add(sum(counts['polygons'][1:]))
 
-        bmm.to_mesh(mesh)
-        bmm.free()
+    mesh.vertices.foreach_set('co', np.concatenate(coords).ravel())
+    mesh.edges.foreach_set('vertices', edges.ravel())
+    mesh.loops.foreach_set('vertex_index', loop_verts)
+    mesh.loops.foreach_set('edge_index', loop_edges)
+    mesh.polygons.foreach_set('loop_start', loop_starts)
 
-        bm.from_mesh(mesh)
+    # with 4.0 the loop totals are derived from the loop starts
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', loop_totals)
 
-        bpy.data.meshes.remove(mesh, do_unlink=True)
+    for domain, domain_props in props.items():
+        for prop, array in domain_props.items():
+            getattr(mesh, domain).foreach_set(prop, array)
 
-    if select:
-        for f in bm.faces:
-            if f[select_layer] in select:
-                f.select_set(True)
+    set_join_attributes(mesh, attributes)
 
-    bm.to_mesh(target.data)
-    bm.free()
+    # adding elements invalidates previously fetched attribute references, so get it again
+    tag_attr = mesh.attributes.get('Machin3FaceSelect')
+
+    if not tag_attr:
+        tag_attr = mesh.attributes.new('Machin3FaceSelect', 'INT', 'FACE')
+
+    tag_attr.data.foreach_set('value', tags)
+
+    set_join_vertex_groups(target, vertex_groups)
+
+    mesh.update()
+
+    if normals is not None:
+
+        # before 4.1 custom normals require auto smooth
+        if bpy.app.version < (4, 1, 0):
+            mesh.use_auto_smooth = True
+
+        mesh.normals_split_custom_set(normals)
+
+    for m in meshes[1:]:
+        bpy.data.meshes.remove(m, do_unlink=True)
+
+    if select:
+        select_faces(mesh, np.isin(tags, select), extend=True)
@@ -217,49 +217,461 @@ def get_visible_objects(context, local_view=False) -> list[bpy.types.Object]:
     return []
 
 
-def get_object_hierarchy_layers(context, debug=False):
+# VISIBLE OBJECT INDEX
+
+visible_index = {}
+
+def get_visible_index_key(view_layer):
+    '''
+    key the index by scene and view layer name, as pointers change on undo
+    '''
+
+    return (view_layer.id_data.name, view_layer.name)
+
+
+def get_index_categories(obj):
+    '''
+    get the index categories an object belongs to
+    NOTE: MM and DM props are only present, if MESHmachine and DECALmachine are registered
+    '''
+
+    categories = []
+
+    if obj.M3.is_group_empty:
+        categories.append('GROUP_EMPTY')
+
+    if obj.M3.draw_axes:
+        categories.append('AXES')
+
+    if (mm := getattr(obj, 'MM', None)) and mm.isstashobj:
+        categories.append('STASH')
+
+    if (dm := getattr(obj, 'DM', None)) and dm.isbackup:
+        categories.append('DECAL_BACKUP')
+
+    return categories
+
+
+def build_visible_index(view_layer):
     '''
-    go through all objects of the view_layer, and sort them into hierarchicaly layers, creating a list of lists
+    sort all view layer objects into categories of pointer: name dicts
+    visibility itself is deliberately not indexed, but checked when fetching objects, so hide/unhide events never require a rebuild
     '''
 
-    def add_layer(layers, depth, debug=False):
-        '''
-        for each object in the last object layer, fetch the children, and create a new layer from them
-        do it recursively
-        '''
-        
+    index = {'count': len(view_layer.objects),
+             'categories': {'GROUP_EMPTY': {}, 'AXES': {}, 'STASH': {}, 'DECAL_BACKUP': {}}}
+
+    for obj in view_layer.objects:
+        if obj:
+            for category in get_index_categories(obj):
+                index['categories'][category][obj.as_pointer()] = obj.name
+
+    visible_index[get_visible_index_key(view_layer)] = index
+    return index
+
+
+def update_visible_index(view_layer, objects=None, rebuild=False):
+    '''
+    update the index from the (original) objects of the depsgraph updates, and only invalidate the index entirely when a rebuild is requested,
+    which is the case, when collections were updated, as objects could have been linked or unlinked, or collection visibility could have changed
+    the actual rebuild happens lazily on the next fetch
+    '''
+
+    key = get_visible_index_key(view_layer)
+    index = visible_index.get(key)
+
+    if index:
+        if rebuild:
+            del visible_index[key]
+
+        elif objects:
+            for obj in objects:
+                ptr = obj.as_pointer()
+
+                for category, indexed in index['categories'].items():
+                    indexed.pop(ptr, None)
+
+                for category in get_index_categories(obj):
+                    index['categories'][category][ptr] = obj.name
+
+
+def clear_visible_index():
+    visible_index.clear()
+
+
+def get_indexed_visible_objects(context, category='GROUP_EMPTY', debug=False) -> list[bpy.types.Object]:
+    '''
+    fetch the visible objects of a category, from the persistent visible object index, instead of scanning all objects of the view layer
+    categories are GROUP_EMPTY, AXES, STASH and DECAL_BACKUP
+
+    the index is rebuilt, if the number of view layer objects changed, or if an indexed object can't be resolved anymore, which happens on renames and undo
+    like context.visible_objects, local view is taken into account, when called from a 3d view
+    '''
+
+    view_layer = context.view_layer
+    objects = getattr(view_layer, 'objects', None)
+
+    if not objects:
+        return []
+
+    viewport = get_local_view_space(context)
+
+    index = visible_index.get(get_visible_index_key(view_layer))
+
+    if not index or index['count'] != len(objects):
         if debug:
-            print()
-            print("layer", depth)
+            print("building visible object index for", view_layer.name)
+
+        index = build_visible_index(view_layer)
+
+    visible = []
 
-        children = []
+    for ptr, name in index['categories'][category].items():
+        obj = objects.get(name)
 
-        for obj in layers[-1]:
+        if not obj or obj.as_pointer() != ptr:
             if debug:
-                print("", obj.name)
+                print("rebuilding stale visible object index for", view_layer.name)
+
+            build_visible_index(view_layer)
+            return [obj for obj in objects if obj and category in get_index_categories(obj) and obj.visible_get(view_layer=view_layer, viewport=viewport)]
+
+        if obj.visible_get(view_layer=view_layer, viewport=viewport):
+            visible.append(obj)
+
+    return visible
+
+
+def get_local_view_space(context):
+    space = getattr(context, 'space_data', None)
+
+    if space and space.type == 'VIEW_3D' and space.local_view:
+        return space
+
+
+# GEOMETRY UPDATES
+
+geometry_updates = {}
+mesh_geometry_updates = {}
+
+def tag_geometry_update(obj):
+    '''
+    count the geometry updates of an object by pointer, as reported by the depsgraph, allowing caches of evaluated meshes to detect if they are still valid
+    for mesh objects, also count them per mesh pointer, so caches of the original mesh data are invalidated, no matter which of the objects sharing the mesh was edited
+    '''
+
+    ptr = obj.as_pointer()
+    geometry_updates[ptr] = geometry_updates.get(ptr, 0) + 1
+
+    if obj.type == 'MESH' and obj.data:
+        ptr = obj.data.as_pointer()
+        mesh_geometry_updates[ptr] = mesh_geometry_updates.get(ptr, 0) + 1
+
+
+def get_geometry_update_count(obj):
+    return geometry_updates.get(obj.as_pointer(), 0)
+
+
+def prune_geometry_updates():
+    '''
+    drop the counts of removed objects and meshes, so their pointers can't pass on stale counts when they are re-used
+    '''
+
+    for updates, collection in [(geometry_updates, bpy.data.objects), (mesh_geometry_updates, bpy.data.meshes)]:
+        if updates:
+            ptrs = {id.as_pointer() for id in collection}
+
+            for ptr in [ptr for ptr in updates if ptr not in ptrs]:
+                del updates[ptr]
+
+
+def get_mesh_update_count(mesh):
+    return mesh_geometry_updates.get(mesh.as_pointer(), 0)
+
+
+def clear_geometry_updates():
+    geometry_updates.clear()
+    mesh_geometry_updates.clear()
+
+
+# POLL CACHE
+
+poll_update_count = 0
+poll_cache = {}
+
+def tag_poll_update():
+    '''
+    count depsgraph updates, which covers selection and object prop changes, so cached poll results can tell if they are still valid
+    '''
+
+    global poll_update_count
+
+    poll_update_count += 1
+
+
+def get_poll_update_count():
+    return poll_update_count
+
+
+def get_poll_key(context):
+    '''
+    besides the update count, key on the mode, the view layer, the local view, the active object and the amount of selected objects, all of which are cheap to fetch
+    NOTE: the length of view_layer.objects.selected is determined without creating a python list, unlike context.selected_objects
+    '''
+
+    view_layer = context.view_layer
+    active = view_layer.objects.active if view_layer else None
+    local_view = get_local_view_space(context)
+
+    return (poll_update_count, context.mode, view_layer.as_pointer() if view_layer else None, local_view.as_pointer() if local_view else None, active.as_pointer() if active else None, len(view_layer.objects.selected) if view_layer else 0)
+
+
+def get_cached_poll(context, name, func):
+    '''
+    get the result of a poll function from the cache, and only evaluate it, if the key has changed
+    '''
+
+    key = get_poll_key(context)
+    cached = poll_cache.get(name)
 
-            for obj in obj.children:
-                children.append(obj)
+    if cached and cached[0] == key:
+        return cached[1]
 
-        if children:
-            depth += 1
+    result = func(context)
+    poll_cache[name] = (key, result)
 
-            layers.append(children)
+    return result
 
-            add_layer(layers, depth=depth, debug=debug)
 
-    depth = 0
+def clear_poll_cache():
+    poll_cache.clear()
 
-    # start by fetching the objects at the very top, which are those without any parent
-    top_level_objects = [obj for obj in context.view_layer.objects if not obj.parent]
 
-    # initiate the list of lists, with the first top level layer
-    layers = [top_level_objects]
+# HIERARCHY INDEX
 
-    # add addiational layers, recursively for as long as there are children
-    add_layer(layers, depth, debug=debug)
+hierarchy_index = {}
 
-    return layers
+def build_hierarchy_index(view_layer):
+    '''
+    index the parent/child relationships of all view layer objects as flat lists, with each object's position in them keyed by its pointer
+        parents  - index of the parent, -1 if there is none, -2 if the parent isn't in the view layer
+        children - indices of the children
+        depths   - hierarchy depth, with 0 being the top level, -1 for objects, that can't be reached from the top, because a parent isn't in the view layer
+        layers   - indices per depth, so objects at depth 0 are found in layers[0] and so on
+    '''
+
+    objects = [obj for obj in view_layer.objects if obj]
+    pointers = {obj.as_pointer(): idx for idx, obj in enumerate(objects)}
+
+    parents = [(pointers.get(obj.parent.as_pointer(), -2) if obj.parent else -1) for obj in objects]
+    children = [[] for _ in objects]
+
+    for idx, parent_idx in enumerate(parents):
+        if parent_idx >= 0:
+            children[parent_idx].append(idx)
+
+    depths = [-1] * len(objects)
+
+    layer = [idx for idx, parent_idx in enumerate(parents) if parent_idx == -1]
+    layers = []
+
+    while layer:
+        layers.append(layer)
+
+        for idx in layer:
+            depths[idx] = len(layers) - 1
+
+        layer = [child for idx in layer for child in children[idx]]
+
+    index = {'count': len(view_layer.objects),
+             'pointers': pointers,
+             'ptrs': list(pointers),
+             'names': [obj.name for obj in objects],
+             'parents': parents,
+             'children': children,
+             'depths': depths,
+             'layers': layers}
+
+    hierarchy_index[get_visible_index_key(view_layer)] = index
+    return index
+
+
+def get_hierarchy_index(view_layer, debug=False):
+    '''
+    fetch the hierarchy index of the view layer, building it, if there is none, or if the number of view layer objects changed
+    '''
+
+    index = hierarchy_index.get(get_visible_index_key(view_layer))
+
+    if not index or index['count'] != len(view_layer.objects):
+        if debug:
+            print("building hierarchy index for", view_layer.name)
+
+        index = build_hierarchy_index(view_layer)
+
+    return index
+
+
+def update_hierarchy_index(view_layer, objects=None, rebuild=False):
+    '''
+    check the (original) objects of the depsgraph updates for parenting changes, and only invalidate the index, if there are any, or if a rebuild is requested
+    renames are updated in place
+    '''
+
+    key = get_visible_index_key(view_layer)
+    index = hierarchy_index.get(key)
+
+    if index:
+        if rebuild:
+            del hierarchy_index[key]
+            return
+
+        pointers = index['pointers']
+
+        for obj in objects or []:
+            idx = pointers.get(obj.as_pointer())
+
+            if idx is None:
+                continue
+
+            parent_idx = pointers.get(obj.parent.as_pointer(), -2) if obj.parent else -1
+
+            if index['parents'][idx] != parent_idx:
+                del hierarchy_index[key]
+                return
+
+            index['names'][idx] = obj.name
+
+
+def clear_hierarchy_index():
+    hierarchy_index.clear()
+
+
+def get_hierarchy_idx(view_layer, obj, index=None):
+    '''
+    get the object's position in the hierarchy index, None if it isn't in the view layer
+    if the object isn't found, but is in the view layer, the index is out of date, which can happen after undo, so rebuild it
+    '''
+
+    if index is None:
+        index = get_hierarchy_index(view_layer)
+
+    idx = index['pointers'].get(obj.as_pointer())
+
+    if idx is not None and index['names'][idx] == obj.name:
+        return idx
+
+    if obj.name in view_layer.objects:
+        return build_hierarchy_index(view_layer)['pointers'].get(obj.as_pointer())
+
+
+def get_hierarchy_objects(view_layer, indices, index=None):
+    '''
+    resolve indices of the hierarchy index to objects, rebuilding the index and starting over, if one of them is stale
+    '''
+
+    if index is None:
+        index = get_hierarchy_index(view_layer)
+
+    # name lookups aren't free either, so for many objects, map all view layer objects by pointer once instead
+    if len(indices) > 100:
+        lookup = {obj.as_pointer(): obj for obj in view_layer.objects if obj}
+        objects = [lookup.get(index['ptrs'][idx]) for idx in indices]
+
+        if all(obj and obj.name == index['names'][idx] for obj, idx in zip(objects, indices)):
+            return objects
+
+        build_hierarchy_index(view_layer)
+        return None
+
+    objects = []
+
+    for idx in indices:
+        obj = view_layer.objects.get(index['names'][idx])
+
+        if not obj or obj.as_pointer() != index['ptrs'][idx]:
+            build_hierarchy_index(view_layer)
+            return None
+
+        objects.append(obj)
+
+    return objects
+
+
+def get_hierarchy_children(view_layer, obj, recursive=False):
+    '''
+    get the view layer children of an object, optionally recursively, from the hierarchy index
+    objects that aren't in the view layer themselves, aren't indexed, so fall back to their view layer children, via obj.children
+    '''
+
+    for _ in range(2):
+        index = get_hierarchy_index(view_layer)
+        idx = get_hierarchy_idx(view_layer, obj, index=index)
+
+        if idx is None:
+            break
+
+        # the index may have been rebuilt while looking up the object
+        index = get_hierarchy_index(view_layer)
+        children = index['children']
+
+        indices = list(children[idx])
+
+        # breadth first, the list grows while iterating it
+        if recursive:
+            for child in indices:
+                indices.extend(children[child])
+
+        objects = get_hierarchy_objects(view_layer, indices, index=index)
+
+        if objects is not None:
+            return objects
+
+    return [c for c in (obj.children_recursive if recursive else obj.children) if c.name in view_layer.objects]
+
+
+def get_hierarchy_depth(view_layer, obj):
+    '''
+    get the object's depth in the view layer hierarchy, -1 if it can't be reached from the top, None if it's not in the view layer
+    '''
+
+    idx = get_hierarchy_idx(view_layer, obj)
+
+    if idx is not None:
+        return get_hierarchy_index(view_layer)['depths'][idx]
+
+
+def get_top_hierarchy_objects(view_layer, objects):
+    '''
+    of the passed in objects, get those at the lowest hierarchy depth
+    '''
+
+    depths = {}
+
+    for obj in objects:
+        depth = get_hierarchy_depth(view_layer, obj)
+
+        if depth is not None and depth >= 0:
+            depths.setdefault(depth, set()).add(obj)
+
+    return depths[min(depths)] if depths else set()
+
+
+def get_object_hierarchy_layers(context, debug=False):
+    '''
+    sort all objects of the view_layer into hierarchical layers, creating a list of lists, from the hierarchy index
+    '''
+
+    view_layer = context.view_layer
+
+    for _ in range(2):
+        index = get_hierarchy_index(view_layer, debug=debug)
+        layers = [get_hierarchy_objects(view_layer, layer, index=index) for layer in index['layers']]
+
+        if all(layer is not None for layer in layers):
+            return layers
+
+    return []
 
 
 def get_parent(obj, recursive=False, debug=False):
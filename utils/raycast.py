@@ -3,18 +3,99 @@ from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_
 import bmesh
 from mathutils.bvhtree import BVHTree as BVH
 import sys
+import numpy as np
 
 
 # RAYCASTING BVH
 
-def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debug=False):
+def get_local_bboxes(objects, bboxes=None):
+    '''
+    get the local space min and max corners of the meshes the BVHs are built from, as (N, 3) arrays
+    for objects without enabled modifiers, that aren't in edit mode, Blender's bound_box is identical to the mesh's bbox
+    for all others, the bbox is calculated from the mesh coords, and cached in the optionally passed in bboxes dict
+    '''
+
+    mins = np.empty((len(objects), 3), dtype=float)
+    maxs = np.empty((len(objects), 3), dtype=float)
+
+    for idx, obj in enumerate(objects):
+        if bboxes is not None and obj.name in bboxes:
+            mins[idx], maxs[idx] = bboxes[obj.name]
+            continue
+
+        if obj.mode != 'EDIT' and not any(mod.show_viewport for mod in obj.modifiers):
+            coords = np.array(obj.bound_box, dtype=float)
+
+        else:
+            vert_count = len(obj.data.vertices)
+            coords = np.empty((vert_count, 3), dtype=float)
+            obj.data.vertices.foreach_get('co', np.reshape(coords, vert_count * 3))
+
+            # no verts, no hit, so use an inverted bbox
+            if not vert_count:
+                coords = np.array([(np.inf, np.inf, np.inf), (-np.inf, -np.inf, -np.inf)])
+
+            if bboxes is not None:
+                bboxes[obj.name] = (coords.min(axis=0), coords.max(axis=0))
+
+        mins[idx] = coords.min(axis=0)
+        maxs[idx] = coords.max(axis=0)
+
+    return mins, maxs
+
+
+def get_ray_bbox_intersections(origins, directions, mins, maxs):
+    '''
+    vectorized slab test of N rays against N bboxes
+    returns a boolean hit mask and the ray parameter at which each ray enters its box, which is 0 if the ray starts inside of it
+    '''
+
+    parallel = directions == 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (mins - origins) / directions
+        t2 = (maxs - origins) / directions
+
+    tnear = np.minimum(t1, t2)
+    tfar = np.maximum(t1, t2)
+
+    # rays parallel to a slab, never leave it if they start within it, and never enter it otherwise
+    inside = (origins >= mins) & (origins <= maxs)
+
+    tnear = np.where(parallel, np.where(inside, -np.inf, np.inf), tnear)
+    tfar = np.where(parallel, np.where(inside, np.inf, -np.inf), tfar)
+
+    entry = np.maximum(tnear.max(axis=1), 0)
+    exit = tfar.min(axis=1)
+
+    # inverted bboxes of empty meshes are never hit
+    valid = (mins <= maxs).all(axis=1)
+
+    return (exit >= entry) & valid, entry
+
+
+def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes=None, bvhs=None, bboxes=None, debug=False):
+    '''
+    cast a ray against the candidates' BVHs, using a two-level acceleration structure
+        first a vectorized broad-phase of the ray against all the candidates' local space bboxes
+        then the per-object BVH narrow-phase, but only for the boxes hit, sorted by their entry distance, stopping as soon as a box is further away than the closest hit so far
+
+    pass in previously returned bmeshes and bvhs to re-use them, newly created ones are always returned in the cache
+    '''
+
     region = bpy.context.region
     region_data = bpy.context.region_data
 
     origin_3d = region_2d_to_origin_3d(region, region_data, mousepos)
-    vector_3d = region_2d_to_vector_3d(region, region_data, mousepos)
+    vector_3d = region_2d_to_vector_3d(region, region_data, mousepos).normalized()
 
-    objects = [(obj, None) for obj in candidates if obj.type == "MESH"]
+    if bmeshes is None:
+        bmeshes = {}
+
+    if bvhs is None:
+        bvhs = {}
+
+    objects = [obj for obj in candidates if obj.type == "MESH"]
 
     hitobj = None
     hitlocation = None
@@ -25,43 +106,69 @@ def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debu
     cache = {'bmesh': {},
              'bvh': {}}
 
-    for obj, src in objects:
-        mx = obj.matrix_world
-        mxi = mx.inverted_safe()
+    if objects:
 
-        ray_origin = mxi @ origin_3d
-        ray_direction = mxi.to_3x3() @ vector_3d
+        # BROAD-PHASE
 
-        # use cached bmesh if possible
-        if obj.name in bmeshes:
-            # print("fetching existing bmesh")
-            bm = bmeshes[obj.name]
-        else:
-            # print("creating new bmesh")
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            cache['bmesh'][obj.name] = bm
+        # as matrices are affine, the ray parameter is the same in local and world space, and so with a normalized view vector, entry parameters are world space distances
+        mxis = np.array([obj.matrix_world.inverted_safe() for obj in objects], dtype=float)
 
-        # use cached bvh if possible
-        if obj.name in bvhs:
-            # print("fetching exsiting BVH")
-            bvh = bvhs[obj.name]
-        else:
-            # print("creating new BVH")
-            bvh = BVH.FromBMesh(bm)
-            cache['bvh'][obj.name] = bvh
+        ray_origins = mxis[:, :3, :3] @ np.array(origin_3d) + mxis[:, :3, 3]
+        ray_directions = mxis[:, :3, :3] @ np.array(vector_3d)
 
-        location, normal, index, distance = bvh.ray_cast(ray_origin, ray_direction)
+        mins, maxs = get_local_bboxes(objects, bboxes=bboxes)
+        hits, entries = get_ray_bbox_intersections(ray_origins, ray_directions, mins, maxs)
 
-        # recalculate distance in worldspace
-        if distance:
-            distance = (mx @ location - origin_3d).length
+        order = [idx for idx in np.argsort(entries) if hits[idx]]
 
         if debug:
-            print("candidate:", obj.name, location, normal, index, distance)
+            print(f"broad-phase: {len(order)} of {len(objects)} candidate bboxes hit")
+
+
+        # NARROW-PHASE
+
+        for idx in order:
+            if entries[idx] > hitdistance:
+                if debug:
+                    print("early out at", objects[idx].name)
+                break
+
+            obj = objects[idx]
+
+            mx = obj.matrix_world
+            mxi = mx.inverted_safe()
+
+            ray_origin = mxi @ origin_3d
+            ray_direction = mxi.to_3x3() @ vector_3d
+
+            # use cached bmesh if possible
+            if obj.name in bmeshes:
+                bm = bmeshes[obj.name]
+            elif obj.name in cache['bmesh']:
+                bm = cache['bmesh'][obj.name]
+            else:
+                bm = bmesh.new()
+                bm.from_mesh(obj.data)
+                cache['bmesh'][obj.name] = bm
+
+            # use cached bvh if possible
+            if obj.name in bvhs:
+                bvh = bvhs[obj.name]
+            else:
+                bvh = BVH.FromBMesh(bm)
+                cache['bvh'][obj.name] = bvh
+
+            location, normal, index, distance = bvh.ray_cast(ray_origin, ray_direction)
+
+            # recalculate distance in worldspace
+            if distance:
+                distance = (mx @ location - origin_3d).length
+
+            if debug:
+                print("candidate:", obj.name, location, normal, index, distance)
 
-        if distance and distance < hitdistance:
-            hitobj, hitlocation, hitnormal, hitindex, hitdistance = obj, mx @ location, mx.to_3x3() @ normal, index, distance
+            if distance and distance < hitdistance:
+                hitobj, hitlocation, hitnormal, hitindex, hitdistance = obj, mx @ location, mx.to_3x3() @ normal, index, distance
 
 
     if debug:
@@ -175,7 +282,18 @@ def get_closest(origin, candidates=[], depsgraph=None, debug=False):
 
 # SCENE RAYCASTING
 
-def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], debug=False):
+def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], bvhs=None, max_steps=100, debug=False):
+    '''
+    cast a scene ray, while ignoring the objects in the exclude list, and optionally wire objects
+
+    excluded objects used to be temporarily hidden and the ray re-cast, but each hide toggle causes a depsgraph update, which in turn fires all handlers
+    instead the ray is now advanced to just beyond each excluded hit, without changing the scene state at all
+
+    objects in the unhide list are hidden, and so can't be hit by the scene ray, so instead they are each cast individually via BVHs built from their mesh data
+    this is useful if you want to self.snap edit mesh objects, which is achieved by excluding the active object and snapping on an unchanging duplicate that is hidden
+    pass in a bvhs dict to keep these BVHs around between calls
+    '''
+
     region = bpy.context.region
     region_data = bpy.context.region_data
 
@@ -184,44 +302,51 @@ def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=Fals
 
     scene = bpy.context.scene
 
-    # temporary unhide obects in the unhide list, usefuly if you want to self.snap edit mesh objects, which is achieved by excluding the active object and snapping on an unchanging duplicate that is hidden
-    for ob in unhide:
-        ob.hide_set(False)
+    origin = view_origin
 
-    # initial cast
-    hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+    for step in range(max_steps):
+        hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=origin, direction=view_dir)
 
+        if hit and (obj in exclude or (exclude_wire and obj.display_type == 'WIRE')):
+            if debug:
+                print(" Ignoring object", obj.name)
 
-    # objects are excluded by temporary hiding them, collect them to reveal them at the end
-    hidden = []
+            # advance the ray to just beyond the excluded hit, scaling the offset with the distance, to stay above float precision
+            offset = max(0.0001, (location - view_origin).length * 0.000001)
+            origin = location + view_dir * offset
 
-    # additional casts in case the hit object should be excluded
-    if hit:
-        if obj in exclude or (exclude_wire and obj.display_type == 'WIRE'):
-            ignore = True
+            hit = False
 
-            while ignore:
-                if debug:
-                    print(" Ignoring object", obj.name)
+        else:
+            break
 
-                # temporarily hide and collect excluded object
-                obj.hide_set(True)
-                hidden.append(obj)
+    hitdistance = (location - view_origin).length if hit else sys.maxsize
 
-                hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+    # cast the unhide objects individually, and see if any of them is closer than the scene hit
+    for ob in unhide:
+        if bvhs is not None and ob.name in bvhs:
+            bvh = bvhs[ob.name]
+
+        else:
+            bm = bmesh.new()
+            bm.from_mesh(ob.data)
+            bvh = BVH.FromBMesh(bm)
+            bm.free()
 
-                if hit:
-                    ignore = obj in exclude or (exclude_wire and obj.display_type == 'WIRE')
-                else:
-                    break
+            if bvhs is not None:
+                bvhs[ob.name] = bvh
 
-    # hide the unhide objects again
-    for ob in unhide:
-        ob.hide_set(True)
+        obmx = ob.matrix_world
+        obmxi = obmx.inverted_safe()
+
+        ob_location, ob_normal, ob_index, _ = bvh.ray_cast(obmxi @ view_origin, obmxi.to_3x3() @ view_dir)
+
+        if ob_location:
+            distance = (obmx @ ob_location - view_origin).length
 
-    # reveal hidden objects again
-    for ob in hidden:
-        ob.hide_set(False)
+            if distance < hitdistance:
+                hit, location, normal, index, obj, mx = True, obmx @ ob_location, (obmxi.transposed().to_3x3() @ ob_normal).normalized(), ob_index, ob, obmx.copy()
+                hitdistance = distance
 
     if hit:
         if debug:
@@ -19,41 +19,101 @@ def get_prefs():
     return bpy.context.preferences.addons[get_name()].preferences
 
 
+# ADDON REGISTRY
+
+addon_registry = None
+
+def get_addon_registry(debug=False):
+    '''
+    get the memoized addon registry, with name and folder name indexes
+    it's built lazily on first access, as addon_utils.modules() scans all addon folders on disk and parses each bl_info,
+    and it's rebuilt, when the set of enabled addons changes, or after it has been cleared on load_post
+    '''
+
+    global addon_registry
+
+    signature = frozenset(bpy.context.preferences.addons.keys())
+
+    if addon_registry is None or addon_registry['signature'] != signature:
+        import addon_utils
+
+        if debug:
+            print("building addon registry")
+
+        names = {}
+        foldernames = {}
+
+        for mod in addon_utils.modules():
+            name = mod.bl_info["name"]
+            entry = (mod.__name__, mod.bl_info.get("version", None), mod.__file__)
+
+            # like before, the first addon found for a name wins
+            if name not in names:
+                names[name] = entry
+
+            foldernames[mod.__name__] = name
+
+        addon_registry = {'signature': signature,
+                          'names': names,
+                          'foldernames': foldernames}
+
+    return addon_registry
+
+
+def clear_addon_registry():
+    global addon_registry
+
+    addon_registry = None
+
+
 def get_addon(addon, debug=False):
     '''
     look for addon by name
     return registration status, foldername, version and path
+    NOTE: the registry's signature is the set of enabled addons' folder names, so it also tells if the addon is enabled
     '''
-    
-    import addon_utils
-
-    for mod in addon_utils.modules():
-        name = mod.bl_info["name"]
-        version = mod.bl_info.get("version", None)
-        foldername = mod.__name__
-        path = mod.__file__
-        enabled = addon_utils.check(foldername)[1]
-
-        if name == addon:
-            if debug:
-                print(name)
-                print("  enabled:", enabled)
-                print("  folder name:", foldername)
-                print("  version:", version)
-                print("  path:", path)
-                print()
-
-            return enabled, foldername, version, path
+
+    registry = get_addon_registry(debug=debug)
+    entry = registry['names'].get(addon)
+
+    if entry:
+        foldername, version, path = entry
+        enabled = foldername in registry['signature']
+
+        if debug:
+            print(addon)
+            print("  enabled:", enabled)
+            print("  folder name:", foldername)
+            print("  version:", version)
+            print("  path:", path)
+            print()
+
+        return enabled, foldername, version, path
     return False, None, None, None
 
 
+def get_addon_name(foldername, debug=False):
+    '''
+    look up an addon's bl_info name by its folder name
+    '''
+
+    return get_addon_registry(debug=debug)['foldernames'].get(foldername)
+
+
 def get_addon_operator_idnames(addon):
     if addon in ['MACHIN3tools', 'DECALmachine', 'MESHmachine', 'CURVEmachine', 'HyperCursor', 'PUNCHit']:
-        if addon in ['DECALmachine', 'MESHmachine', 'CURVEmachine', 'HyperCursor', 'PUNCHit']:
-            if not get_addon(addon)[0]:
+
+        # addons are imported by their folder names, which don't have to match their names
+        if addon == get_addon_name(get_name()):
+            foldername = get_name()
+
+        else:
+            enabled, foldername, _, _ = get_addon(addon)
+
+            if not enabled:
                 return []
 
-        classes = import_module(f'{addon}.registration').classes
+        classes = import_module(f'{foldername}.registration').classes
 
         idnames = []
 
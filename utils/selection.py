@@ -1,40 +1,64 @@
+from collections import deque
 
 
 # SORTING
 
-def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
+def sort_vert_sequences(verts, is_connected, strict=False):
     '''
-    return sorted lists of vertices, where vertices are considered connected if their edges are selected, and faces are not selected
+    walk along the connected edges of the passed in verts, and sort them into (sequence, cyclic) tuples in linear time
+    if a walk runs into a vert, that is either not among the passed in verts, or already part of a previous sequence, which happens for intersecting edge loops, stop sorting, or raise a ValueError if strict
+    like before, the passed in verts list is consumed
     '''
 
-    sequences = []
+    order = list(dict.fromkeys(verts))
+    remaining = set(order)
+
+    # fetch the connected edges of each vert once
+    links = {v: [e for e in v.link_edges if is_connected(e)] for v in order}
 
     # if edge loops are non-cyclic, it matters at what vert you start the sorting
-    noncyclicstartverts = [v for v in verts if len([e for e in v.link_edges if e.select]) == 1]
+    noncyclicstartverts = [v for v in order if len(links[v]) == 1]
+
+    # instead of removing verts from lists, advance through them, skipping those already sorted
+    noncyclic_idx = 0
+    order_idx = 0
+
+    def get_start_vert():
+        nonlocal noncyclic_idx, order_idx
+
+        while noncyclic_idx < len(noncyclicstartverts) and noncyclicstartverts[noncyclic_idx] not in remaining:
+            noncyclic_idx += 1
 
-    if noncyclicstartverts:
-        v = noncyclicstartverts[0]
+        if noncyclic_idx < len(noncyclicstartverts):
+            return noncyclicstartverts[noncyclic_idx]
 
-    # in cyclic edge loops, any vert works
-    else:
-        v = verts[0]
+        # in cyclic edge loops, any vert works
+        while order[order_idx] not in remaining:
+            order_idx += 1
+
+        return order[order_idx]
+
+    sequences = []
+
+    if remaining:
+        v = get_start_vert()
 
     seq = []
+    seen = set()
 
-    while verts:
+    while remaining:
         seq.append(v)
+        seen.add(v)
 
-        # safty precaution,for EPanel, where people may select intersecting edge loops
-        if v not in verts:
-            break
+        if v not in remaining:
+            if strict:
+                raise ValueError(f"Vert {v.index} can't be sorted into a sequence")
 
-        else:
-            verts.remove(v)
+            break
 
-        if v in noncyclicstartverts:
-            noncyclicstartverts.remove(v)
+        remaining.remove(v)
 
-        nextv = [e.other_vert(v) for e in v.link_edges if e.select and e.other_vert(v) not in seq]
+        nextv = [e.other_vert(v) for e in links[v] if e.other_vert(v) not in seen]
 
         # next vert in sequence
         if nextv:
@@ -43,19 +67,30 @@ def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
         # finished a sequence
         else:
             # determine cyclicity
-            cyclic = True if len([e for e in v.link_edges if e.select]) == 2 else False
+            cyclic = len(links[v]) == 2
 
             # store sequence and cyclicity
             sequences.append((seq, cyclic))
 
             # start a new sequence, if there are still verts left
-            if verts:
-                if noncyclicstartverts:
-                    v = noncyclicstartverts[0]
-                else:
-                    v = verts[0]
+            if remaining:
+                v = get_start_vert()
 
                 seq = []
+                seen = set()
+
+    verts[:] = [v for v in verts if v in remaining]
+
+    return sequences
+
+
+def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
+    '''
+    return sorted lists of vertices, where vertices are considered connected if their edges are selected, and faces are not selected
+    '''
+
+    # safty precaution,for EPanel, where people may select intersecting edge loops, sorting simply stops in that case
+    sequences = sort_vert_sequences(verts, lambda e: e.select)
 
     # again for EPanel, make sure sequences are longer than one vert
     if ensure_seq_len:
@@ -78,50 +113,12 @@ def get_edges_vert_sequences(verts, edges, debug=False):
     """
     return sorted lists of vertices, where vertices are considered connected if they are verts of the passed in edges
     selection states are completely ignored.
+    raises a ValueError, if the edges can't be sorted, because they intersect
     """
-    sequences = []
-
-    # if edge loops are non-cyclic, it matters at what vert you start the sorting
-    noncyclicstartverts = [v for v in verts if len([e for e in v.link_edges if e in edges]) == 1]
-
-    if noncyclicstartverts:
-        v = noncyclicstartverts[0]
-
-    # in cyclic edge loops, any vert works
-    else:
-        v = verts[0]
-
-    seq = []
-
-    while verts:
-        seq.append(v)
-        verts.remove(v)
-
-        if v in noncyclicstartverts:
-            noncyclicstartverts.remove(v)
-
-        nextv = [e.other_vert(v) for e in v.link_edges if e in edges and e.other_vert(v) not in seq]
-
-        # next vert in sequence
-        if nextv:
-            v = nextv[0]
 
-        # finished a sequence
-        else:
-            # determine cyclicity
-            cyclic = True if len([e for e in v.link_edges if e in edges]) == 2 else False
+    edges = set(edges)
 
-            # store sequence and cyclicity
-            sequences.append((seq, cyclic))
-
-            # start a new sequence, if there are still verts left
-            if verts:
-                if noncyclicstartverts:
-                    v = noncyclicstartverts[0]
-                else:
-                    v = verts[0]
-
-                seq = []
+    sequences = sort_vert_sequences(verts, lambda e: e in edges, strict=True)
 
     if debug:
         for verts, cyclic in sequences:
@@ -135,38 +132,40 @@ def get_edges_vert_sequences(verts, edges, debug=False):
 def get_selection_islands(faces, debug=False):
     '''
     return island tuples (verts, edges, faces), sorted by amount of faces in each, highest first
+    islands are grown breadth first across selected faces, using a set of seen faces, so it's linear in the amount of faces
+    like before, the passed in faces list is consumed
     '''
 
     if debug:
         print("selected:", [f.index for f in faces])
 
     face_islands = []
+    seen = set()
+
+    for face in faces:
+        if face in seen:
+            continue
 
-    while faces:
-        island = [faces[0]]
-        foundmore = [faces[0]]
+        island = [face]
+        seen.add(face)
 
-        if debug:
-            print("island:", [f.index for f in island])
-            print("foundmore:", [f.index for f in foundmore])
+        foundmore = deque([face])
 
         while foundmore:
-            for e in foundmore[0].edges:
-                # get unseen selected border faces
-                bf = [f for f in e.link_faces if f.select and f not in island]
-                if bf:
-                    island.append(bf[0])
-                    foundmore.append(bf[0])
+            f = foundmore.popleft()
 
-            if debug:
-                print("popping", foundmore[0].index)
+            for e in f.edges:
+                # get unseen selected border faces
+                for bf in e.link_faces:
+                    if bf.select and bf not in seen:
+                        seen.add(bf)
 
-            foundmore.pop(0)
+                        island.append(bf)
+                        foundmore.append(bf)
 
         face_islands.append(island)
 
-        for f in island:
-            faces.remove(f)
+    faces.clear()
 
     if debug:
         print()
@@ -185,8 +184,6 @@ def get_selection_islands(faces, debug=False):
             vi.update(f.verts)
             ei.update(f.edges)
 
-            # f.select = False
-
         islands.append((list(vi), list(ei), fi))
 
     return sorted(islands, key=lambda x: len(x[2]), reverse=True)
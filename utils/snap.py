@@ -1,6 +1,7 @@
 import bpy
 import bmesh
 from . raycast import cast_scene_ray_from_mouse
+from . object import get_geometry_update_count
 
 
 # TODO: add update function to update/re-cache specific object
@@ -56,6 +57,9 @@ class Snap:
         # init alternatives
         self._init_alternatives(context, alternative)
 
+        # the exclusion list is tested for every hit, so turn it into a set
+        self.exclude = set(self.exclude)
+
         # init depsgraph and cache object
         self.depsgraph = context.evaluated_depsgraph_get()
         self.cache = SnapCache(debug=debug)
@@ -80,7 +84,7 @@ class Snap:
         do a scene raycast from the passed in mouse position
         '''
 
-        self.hit, self.hitobj, self.hitindex, self.hitlocation, self.hitnormal, self.hitmx = cast_scene_ray_from_mouse(mousepos, self.depsgraph, exclude=self.exclude, exclude_wire=self.exclude_wire, unhide=self.alternative, debug=self.debug)
+        self.hit, self.hitobj, self.hitindex, self.hitlocation, self.hitnormal, self.hitmx = cast_scene_ray_from_mouse(mousepos, self.depsgraph, exclude=self.exclude, exclude_wire=self.exclude_wire, unhide=self.alternative, bvhs=self._alternative_bvhs, debug=self.debug)
 
         if self.hit:
             name = self.hitobj.name
@@ -94,26 +98,14 @@ class Snap:
                 self.cache.objects[name] = self.hitobj
 
 
-                # MESH
-
-                mesh = bpy.data.meshes.new_from_object(self.hitobj.evaluated_get(self.depsgraph), depsgraph=self.depsgraph)
-                self.cache.meshes[name] = mesh
-
-
-                # BMESH
-
-                bm = bmesh.new()
-                bm.from_mesh(mesh)
-                # bm.normal_update()
-                bm.verts.ensure_lookup_table()
-                bm.faces.ensure_lookup_table()
-                self.cache.bmeshes[name] = bm
+                # BMESH and LOOP TRIANGLES
 
+                # NOTE: alternative duplicates are temporary, and edit mesh objects are about to change, so only keep them for this session
+                is_alternative = self.hitobj in self.alternative
+                persistent = not is_alternative and self.hitobj.mode != 'EDIT'
 
-                # LOOP TRIANGLES
-
-                self.cache.loop_triangles[name] = bm.calc_loop_triangles()
-                self.cache.tri_coords[name] = {}
+                # NOTE: alternatives are hidden, and are raycast on their mesh data, which is identical to their evaluated mesh, as they are created with modifiers disabled already
+                self.cache.add(self.hitobj, self.depsgraph, persistent=persistent, evaluated=not is_alternative)
 
 
             # update the following every time the hitface changes
@@ -135,9 +127,9 @@ class Snap:
             if self.hitindex not in self.cache.tri_coords[name]:
                 self.log("Adding tri coords for face index", self.hitindex)
 
-                loop_triangles = self.cache.loop_triangles[name]
+                face_tris = self.cache.get_face_tris(name)
 
-                tri_coords = [self.hitmx @ l.vert.co for tri in loop_triangles if tri[0].face == self.hitface for l in tri]
+                tri_coords = [self.hitmx @ l.vert.co for tri in face_tris.get(self.hitindex, []) for l in tri]
                 self.cache.tri_coords[name][self.hitindex] = tri_coords
 
     def _init_edit_mode(self, context):
@@ -181,6 +173,7 @@ class Snap:
         '''
 
         self.alternative = []
+        self._alternative_bvhs = {}
 
         if alternative:
             for obj in alternative:
@@ -234,36 +227,200 @@ class Snap:
             mod.show_viewport = True
 
 
+# PERSISTENT SNAPPING CACHE
+
+snap_cache = {}
+snap_cache_size = 0
+
+# rough memory budget of all cached snapping bmeshes and loop triangles, in bytes
+snap_cache_budget = 1024 ** 3
+
+def get_snap_cache_key(obj, obj_eval):
+    '''
+    identify an object's evaluated mesh by its data pointer and depsgraph geometry update count
+    the modifier visibility is included too, as Snap() disables edit mesh object modifiers, and the face count is a cheap safety net for any missed updates
+    for curve, text and surface objects, the counts are taken from a temporary mesh of the evaluated object
+    '''
+
+    if obj.type == 'MESH':
+        counts = (len(obj_eval.data.vertices), len(obj_eval.data.polygons))
+
+    else:
+        mesh = obj_eval.to_mesh()
+        counts = (len(mesh.vertices), len(mesh.polygons)) if mesh else (0, 0)
+        obj_eval.to_mesh_clear()
+
+    return (obj_eval.data.as_pointer(), get_geometry_update_count(obj), tuple(mod.show_viewport for mod in obj.modifiers)) + counts
+
+
+def get_snap_cache_entry_size(bm, loop_triangles):
+    # NOTE: each face with n loops is made up of n - 2 triangles, so the loop count can be derived without going over the faces
+    loop_count = len(loop_triangles) + 2 * len(bm.faces)
+
+    return len(bm.verts) * 80 + len(bm.edges) * 100 + len(bm.faces) * 80 + loop_count * 70 + len(loop_triangles) * 250
+
+
+def create_snap_cache_entry(obj, depsgraph, evaluated=True):
+    bm = bmesh.new()
+
+    # bm.from_object() only supports mesh objects, so go via a temporary mesh for curve, text and surface objects
+    if obj.type != 'MESH':
+        obj_eval = obj.evaluated_get(depsgraph) if evaluated else obj
+        mesh = obj_eval.to_mesh()
+
+        if mesh:
+            bm.from_mesh(mesh)
+
+        obj_eval.to_mesh_clear()
+
+    elif evaluated:
+        bm.from_object(obj.evaluated_get(depsgraph), depsgraph)
+    else:
+        bm.from_mesh(obj.data)
+
+    bm.verts.ensure_lookup_table()
+    bm.faces.ensure_lookup_table()
+    bm.faces.index_update()
+
+    loop_triangles = bm.calc_loop_triangles()
+
+    return {'key': None,
+            'bm': bm,
+            'loop_triangles': loop_triangles,
+            'face_tris': None,
+            'size': get_snap_cache_entry_size(bm, loop_triangles)}
+
+
+def get_snap_cache_entry(obj, depsgraph, protected=(), debug=False):
+    '''
+    fetch an object's snapping bmesh and loop triangles from the persistent, session-independent cache, or create and cache them
+    entries are kept in least recently used order, and the oldest ones are evicted, once the memory budget is exceeded
+    protected entries, usually those still used by the current snapping session, are never evicted
+    '''
+
+    global snap_cache_size
+
+    key = get_snap_cache_key(obj, obj.evaluated_get(depsgraph))
+    entry = snap_cache.pop(obj.name, None)
+
+    if entry and entry['key'] != key:
+        if debug:
+            print(f" Discarding {obj.name}'s outdated cached snapping bmesh")
+
+        entry['bm'].free()
+        snap_cache_size -= entry['size']
+        entry = None
+
+    if entry is None:
+        if debug:
+            print(f" Caching {obj.name}'s snapping bmesh")
+
+        entry = create_snap_cache_entry(obj, depsgraph)
+        entry['key'] = key
+
+        snap_cache_size += entry['size']
+
+    elif debug:
+        print(f" Re-using {obj.name}'s cached snapping bmesh")
+
+    # (re-)insert as most recently used
+    snap_cache[obj.name] = entry
+
+    # evict least recently used entries, but always keep the current and the protected ones
+    evictable = [name for name in snap_cache if name != obj.name and name not in protected]
+
+    while snap_cache_size > snap_cache_budget and evictable:
+        name = evictable.pop(0)
+        evicted = snap_cache.pop(name)
+
+        if debug:
+            print(f" Evicting {name}'s cached snapping bmesh")
+
+        evicted['bm'].free()
+        snap_cache_size -= evicted['size']
+
+    return entry
+
+
+def clear_snap_cache():
+    global snap_cache_size
+
+    for entry in snap_cache.values():
+        entry['bm'].free()
+
+    snap_cache.clear()
+    snap_cache_size = 0
+
+
 class SnapCache:
+    '''
+    per-session view on the snapping data
+    bmeshes and loop triangles are usually fetched from the persistent snapping cache, while tri coords are in world space, and so are only kept for the session
+    '''
+
     def log(self, *args, **kwargs):
         if self.debug:
             print(*args, **kwargs)
 
-    debug = False
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.log(" Initialize SnappingCache")
 
-    objects = {}
-    meshes = {}
+        # NOTE: these used to be class attributes, and so were accidentally shared between instances
+        self.objects = {}
 
-    bmeshes = {}
+        self.bmeshes = {}
 
-    loop_triangles = {}
-    tri_coords = {}
+        self.loop_triangles = {}
+        self.tri_coords = {}
 
-    def __init__(self, debug=False):
-        self.debug = debug
-        self.log(" Initialize SnappingCache")
+        self._entries = {}
+        self._temporary = []
+
+    def add(self, obj, depsgraph, persistent=True, evaluated=True):
+        name = obj.name
+
+        if persistent:
+            entry = get_snap_cache_entry(obj, depsgraph, protected=self._entries, debug=self.debug)
+
+        else:
+            self.log(f" Creating {name}'s temporary snapping bmesh")
+
+            entry = create_snap_cache_entry(obj, depsgraph, evaluated=evaluated)
+            self._temporary.append(entry)
+
+        self._entries[name] = entry
+
+        self.bmeshes[name] = entry['bm']
+        self.loop_triangles[name] = entry['loop_triangles']
+        self.tri_coords[name] = {}
+
+    def get_face_tris(self, name):
+        '''
+        get a face index: loop triangles mapping, built once per entry, instead of going over all loop triangles for every new hit face
+        '''
+
+        entry = self._entries[name]
+
+        if entry['face_tris'] is None:
+            face_tris = {}
+
+            for tri in entry['loop_triangles']:
+                face_tris.setdefault(tri[0].face.index, []).append(tri)
+
+            entry['face_tris'] = face_tris
+
+        return entry['face_tris']
 
     def clear(self):
-        for name, mesh in self.meshes.items():
-            self.log(f" Removing {name}'s temporary snapping mesh {mesh.name} with {len(mesh.polygons)} faces and {len(mesh.vertices)} verts")
-            bpy.data.meshes.remove(mesh, do_unlink=True)
+        for entry in self._temporary:
+            self.log(f" Freeing temporary snapping bmesh")
+            entry['bm'].free()
 
-        for name, bm in self.bmeshes.items():
-            self.log(f" Freeing {name}'s temporary snapping bmesh")
-            bm.free()
+        self._temporary.clear()
+        self._entries.clear()
 
         self.objects.clear()
-        self.meshes.clear()
 
         self.bmeshes.clear()
 
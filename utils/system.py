@@ -164,3 +164,50 @@ def get_incremented_paths(currentblend):
         incrname = basename + incrstr + ".blend"
 
         return os.path.join(path, incrname), os.path.join(path, name + '_01.blend')
+
+
+# FILE GENERATIONS
+
+def get_generation_path(path, generation):
+    '''
+    the newest generation is the path itself, older ones get a _1, _2, ... suffix
+    '''
+
+    if generation == 0:
+        return path
+
+    name, ext = os.path.splitext(path)
+    return f"{name}_{generation}{ext}"
+
+
+def rotate_file_generations(path, generations):
+    '''
+    shift all existing generations of path by one, removing those exceeding the generation count, making room for a new file at path
+    '''
+
+    # remove the oldest generation, as well as any left overs from a previously higher generation count
+    generation = generations - 1
+
+    while os.path.exists(get_generation_path(path, generation)):
+        os.remove(get_generation_path(path, generation))
+        generation += 1
+
+    for generation in range(generations - 2, -1, -1):
+        src = get_generation_path(path, generation)
+
+        if os.path.exists(src):
+            os.replace(src, get_generation_path(path, generation + 1))
+
+
+def compress_file(src, dst, level=1):
+    '''
+    gzip compress a file, which Blender can read directly, when it's a .blend file
+    NOTE: Blender's own zstd compression uses a seekable multi-frame format, which can't be reproduced with the standard library
+    NOTE: this doesn't touch bpy, so it's safe to run from a thread
+    '''
+
+    import gzip
+    import shutil
+
+    with open(src, 'rb') as f_in, gzip.open(dst, 'wb', compresslevel=level) as f_out:
+        shutil.copyfileobj(f_in, f_out, length=1024 * 1024)
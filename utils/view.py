@@ -2,6 +2,7 @@ import bpy
 from typing import Tuple, Union
 from mathutils import Matrix, Vector
 from bpy_extras.view3d_utils import location_3d_to_region_2d
+from . light import get_light_registry, get_registered_lights, light_registry
 
 
 def set_xray(context):
@@ -58,19 +59,39 @@ def reset_viewport(context, disable_toolbar=False):
 def sync_light_visibility(scene):
     '''
     set light's hide_render prop based on light's hide_get()
+    the lights per view layer are taken from the light registry, and nothing is done at all, if no hide state can have changed since the last sync
     '''
 
     # print("syncing light visibility/renderability")
 
-    for view_layer in scene.view_layers:
-        lights = [obj for obj in view_layer.objects if obj.type == 'LIGHT']
+    registry = get_light_registry(scene)
 
+    if not registry['dirty']:
+        return
+
+    # fetch all lights first, and if the registry turns out to be outdated, rebuild it and start over once, so no light is skipped
+    for _ in range(2):
+        view_layer_lights = [(view_layer, get_registered_lights(registry['view_layers'].get(view_layer.name, []))) for view_layer in scene.view_layers]
+
+        if all(lights is not None for _, lights in view_layer_lights):
+            break
+
+        registry = get_light_registry(scene)
+
+    # fall back to a full scan, should the rebuilt registry be outdated as well
+    else:
+        view_layer_lights = [(view_layer, [obj for obj in view_layer.objects if obj.type == 'LIGHT']) for view_layer in scene.view_layers]
+
+    for view_layer, lights in view_layer_lights:
         for light in lights:
             hidden = light.hide_get(view_layer=view_layer)
 
             if light.hide_render != hidden:
                 light.hide_render = hidden
 
+    if light_registry:
+        light_registry['dirty'] = False
+
 
 def get_loc_2d(context, loc):
     '''
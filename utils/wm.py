@@ -4,6 +4,7 @@ from . registration import get_addon_operator_idnames
 
 
 addons = None
+addon_idnames = None
 
 addon_abbr_mapping = {'MACHIN3tools': 'M3',
                       'DECALmachine': 'DM',
@@ -13,19 +14,12 @@ addon_abbr_mapping = {'MACHIN3tools': 'M3',
                       'PUNCHit': 'PI'}
 
 
-def get_last_operators(context, debug=False):
-    def get_parent_addon(idname):
-        if idname.startswith('hops.'):
-            return 'HO'
-        elif idname.startswith('bc.'):
-            return 'BC'
-
-        for name, idnames in addons.items():
-            if idname in idnames:
-                return addon_abbr_mapping[name]
-        return None
+def get_parent_addon(idname, debug=False):
+    '''
+    get the abbreviated name of the addon an operator idname belongs to, via an idname: abbreviation index, that is built on first use
+    '''
 
-    global addons
+    global addons, addon_idnames
 
     if addons is None:
         addons = {}
@@ -36,347 +30,423 @@ def get_last_operators(context, debug=False):
         if debug:
             printd(addons)
 
-    operators = []
+    if addon_idnames is None:
+        addon_idnames = {idname: addon_abbr_mapping[name] for name, idnames in addons.items() if idnames for idname in idnames}
+
+    if idname.startswith('hops.'):
+        return 'HO'
+    elif idname.startswith('bc.'):
+        return 'BC'
+
+    return addon_idnames.get(idname)
+
 
-    for op in context.window_manager.operators:
-        idname = op.bl_idname.replace('_OT_', '.').lower()
-        label = op.bl_label.replace('MACHIN3: ', '').replace('Macro', '').strip()
-        addon = get_parent_addon(idname)
-        prop = ''
+def get_operator_entry(context, op):
+    '''
+    parse a single operator of the wm's operator stack into an (addon, label, idname, prop) tuple
+    returns None for operators, that should be skipped
+    '''
+
+    idname = op.bl_idname.replace('_OT_', '.').lower()
+    label = op.bl_label.replace('MACHIN3: ', '').replace('Macro', '').strip()
+    addon = get_parent_addon(idname)
+    prop = ''
+
+    # skip pie menu calls
+
+    if idname.startswith('machin3.call_'):
+        return None
 
-        # skip pie menu calls
+    # show props, special modes and custom labels
 
-        if idname.startswith('machin3.call_'):
-            continue
+    # -------------------------------------------------------------------------------------------------------
 
-        # show props, special modes and custom labels
+    # MACHIN3tools
 
-        # -------------------------------------------------------------------------------------------------------
+    elif idname == 'machin3.set_tool_by_name':
+        prop = prettify_tool_name(op.properties.get('name', ''))
 
-        # MACHIN3tools
 
-        elif idname == 'machin3.set_tool_by_name':
-            prop = prettify_tool_name(op.properties.get('name', ''))
+    # SWITCH WORKSPACE
 
+    elif idname == 'machin3.switch_workspace':
+        prop = op.properties.get('name', '')
 
-        # SWITCH WORKSPACE
 
-        elif idname == 'machin3.switch_workspace':
-            prop = op.properties.get('name', '')
+    # SWITCH SHADING
 
+    elif idname == 'machin3.switch_shading':
+        toggled_overlays = getattr(op, 'toggled_overlays', False)
+        prop = op.properties.get('shading_type', '').capitalize()
 
-        # SWITCH SHADING
+        if toggled_overlays:
+            label = f"{toggled_overlays} Overlays"
 
-        elif idname == 'machin3.switch_shading':
-            toggled_overlays = getattr(op, 'toggled_overlays', False)
-            prop = op.properties.get('shading_type', '').capitalize()
 
-            if toggled_overlays:
-                label = f"{toggled_overlays} Overlays"
+    # EDIT/OBJECT MODE
 
+    elif idname == 'machin3.edit_mode':
+        toggled_object = getattr(op, 'toggled_object', False)
+        label = 'Object Mode' if toggled_object else 'Edit Mesh Mode'
 
-        # EDIT/OBJECT MODE
 
-        elif idname == 'machin3.edit_mode':
-            toggled_object = getattr(op, 'toggled_object', False)
-            label = 'Object Mode' if toggled_object else 'Edit Mesh Mode'
+    # MESH MODE
 
+    elif idname == 'machin3.mesh_mode':
+        mode = op.properties.get('mode', '')
+        label = f"{mode.capitalize()} Mode"
 
-        # MESH MODE
 
-        elif idname == 'machin3.mesh_mode':
-            mode = op.properties.get('mode', '')
-            label = f"{mode.capitalize()} Mode"
+    # SMART VERT
 
+    elif idname == 'machin3.smart_vert':
+        if op.properties.get('slideoverride', ''):
+            prop = 'SideExtend'
 
-        # SMART VERT
+        elif op.properties.get('vertbevel', False):
+            prop = 'VertBevel'
 
-        elif idname == 'machin3.smart_vert':
-            if op.properties.get('slideoverride', ''):
-                prop = 'SideExtend'
+        else:
+            modeint = op.properties.get('mode')
+            mergetypeint = op.properties.get('mergetype')
+            mousemerge = getattr(op, 'mousemerge', False)
 
-            elif op.properties.get('vertbevel', False):
-                prop = 'VertBevel'
+            mode = 'Merge' if modeint== 0 else 'Connect'
+            mergetype = 'AtMouse' if mousemerge else 'AtLast' if mergetypeint == 0 else 'AtCenter' if mergetypeint == 1 else 'Paths'
 
+            if mode == 'Merge':
+                prop = mode + mergetype
             else:
-                modeint = op.properties.get('mode')
-                mergetypeint = op.properties.get('mergetype')
-                mousemerge = getattr(op, 'mousemerge', False)
+                pathtype = getattr(op, 'pathtype', False)
+                prop = mode + 'Pathsby' + pathtype.title()
 
-                mode = 'Merge' if modeint== 0 else 'Connect'
-                mergetype = 'AtMouse' if mousemerge else 'AtLast' if mergetypeint == 0 else 'AtCenter' if mergetypeint == 1 else 'Paths'
 
-                if mode == 'Merge':
-                    prop = mode + mergetype
-                else:
-                    pathtype = getattr(op, 'pathtype', False)
-                    prop = mode + 'Pathsby' + pathtype.title()
+    # SMART EDGE
 
+    elif idname == 'machin3.smart_edge':
+        if op.properties.get('is_knife_project', False):
+            prop = 'KnifeProject'
 
-        # SMART EDGE
+        elif op.properties.get('sharp', False):
+            mode = getattr(op, 'sharp_mode')
 
-        elif idname == 'machin3.smart_edge':
-            if op.properties.get('is_knife_project', False):
-                prop = 'KnifeProject'
+            if mode == 'SHARPEN':
+                prop = 'ToggleSharp'
+            elif mode == 'CHAMFER':
+                prop = 'ToggleChamfer'
+            elif mode == 'KOREAN':
+                prop = 'ToggleKoreanBevel'
 
-            elif op.properties.get('sharp', False):
-                mode = getattr(op, 'sharp_mode')
+        elif op.properties.get('offset', False):
+            prop = 'KoreanBevel'
 
-                if mode == 'SHARPEN':
-                    prop = 'ToggleSharp'
-                elif mode == 'CHAMFER':
-                    prop = 'ToggleChamfer'
-                elif mode == 'KOREAN':
-                    prop = 'ToggleKoreanBevel'
+        elif getattr(op, 'draw_bridge_props'):
+            prop = 'Bridge'
 
-            elif op.properties.get('offset', False):
-                prop = 'KoreanBevel'
+        elif getattr(op, 'is_knife'):
+            prop = 'Knife'
 
-            elif getattr(op, 'draw_bridge_props'):
-                prop = 'Bridge'
+        elif getattr(op, 'is_connect'):
+            prop = 'Connect'
 
-            elif getattr(op, 'is_knife'):
-                prop = 'Knife'
+        elif getattr(op, 'is_starconnect'):
+            prop = 'StarConnect'
 
-            elif getattr(op, 'is_connect'):
-                prop = 'Connect'
+        elif getattr(op, 'is_select'):
+            mode = getattr(op, 'select_mode')
 
-            elif getattr(op, 'is_starconnect'):
-                prop = 'StarConnect'
+            if getattr(op, 'is_region'):
+                prop = 'SelectRegion'
+            else:
+                prop = f'Select{mode.title()}'
+
+        elif getattr(op, 'is_loop_cut'):
+            prop = 'LoopCut'
 
-            elif getattr(op, 'is_select'):
-                mode = getattr(op, 'select_mode')
+        elif getattr(op, 'is_turn'):
+            prop = 'Turn'
 
-                if getattr(op, 'is_region'):
-                    prop = 'SelectRegion'
-                else:
-                    prop = f'Select{mode.title()}'
 
-            elif getattr(op, 'is_loop_cut'):
-                prop = 'LoopCut'
+    # SMART FACE
 
-            elif getattr(op, 'is_turn'):
-                prop = 'Turn'
+    elif idname == 'machin3.smart_face':
+        mode = getattr(op, 'mode')
 
+        if mode[0]:
+            prop = "FaceFromVert"
+        if mode[1]:
+            prop = "FaceFromEdge"
+        elif mode[2]:
+            prop = "MeshFromFaces"
 
-        # SMART FACE
 
-        elif idname == 'machin3.smart_face':
-            mode = getattr(op, 'mode')
+    # FOCUS
 
-            if mode[0]:
-                prop = "FaceFromVert"
-            if mode[1]:
-                prop = "FaceFromEdge"
-            elif mode[2]:
-                prop = "MeshFromFaces"
+    elif idname == 'machin3.focus':
+        if op.properties.get('method', 0) == 1:
+            prop = 'LocalView'
 
 
-        # FOCUS
+    # MIRROR
 
-        elif idname == 'machin3.focus':
-            if op.properties.get('method', 0) == 1:
-                prop = 'LocalView'
+    elif idname == 'machin3.mirror':
+        removeall = getattr(op, 'removeall')
 
+        if removeall:
+            label = "Remove All Mirrors"
 
-        # MIRROR
+        else:
+            axis = getattr(op, 'axis')
+            remove = getattr(op, 'remove')
 
-        elif idname == 'machin3.mirror':
-            removeall = getattr(op, 'removeall')
+            if remove:
+                label = "Remove Mirror"
 
-            if removeall:
-                label = "Remove All Mirrors"
+                across = getattr(op, 'removeacross')
+                cursor = getattr(op, 'removecursor')
 
             else:
-                axis = getattr(op, 'axis')
-                remove = getattr(op, 'remove')
+                cursor = getattr(op, 'cursor')
+                across = getattr(op, 'across')
 
-                if remove:
-                    label = "Remove Mirror"
+            if cursor:
+                prop = f'Cursor {axis}'
+            elif across:
+                prop = f'Object {axis}'
+            else:
+                prop = f'Local {axis}'
 
-                    across = getattr(op, 'removeacross')
-                    cursor = getattr(op, 'removecursor')
 
-                else:
-                    cursor = getattr(op, 'cursor')
-                    across = getattr(op, 'across')
+    # SHADE SMOOTH/FLAT
 
-                if cursor:
-                    prop = f'Cursor {axis}'
-                elif across:
-                    prop = f'Object {axis}'
-                else:
-                    prop = f'Local {axis}'
+    elif idname == 'machin3.shade':
+        mode = getattr(op, 'mode')
 
+        label = f"Shade {mode.title()}"
 
-        # SHADE SMOOTH/FLAT
+        incl_children = getattr(op, 'include_children')
+        incl_boolean = getattr(op, 'include_boolean_objs')
 
-        elif idname == 'machin3.shade':
-            mode = getattr(op, 'mode')
+        if mode == 'SMOOTH':
+            sharpen = getattr(op, 'sharpen')
 
-            label = f"Shade {mode.title()}"
+            if sharpen:
+                prop += '+Sharpen'
 
-            incl_children = getattr(op, 'include_children')
-            incl_boolean = getattr(op, 'include_boolean_objs')
+        elif mode == 'FLAT':
+            clear = getattr(op, 'clear')
 
-            if mode == 'SMOOTH':
-                sharpen = getattr(op, 'sharpen')
+            if clear:
+                prop += '+Clear'
 
-                if sharpen:
-                    prop += '+Sharpen'
+        if incl_children:
+            prop += ' +incl Children'
 
-            elif mode == 'FLAT':
-                clear = getattr(op, 'clear')
+        if incl_boolean:
+            prop += ' +incl. Boolean'
 
-                if clear:
-                    prop += '+Clear'
+        # remove unncessary space at the very beginning
+        prop = prop.strip()
 
-            if incl_children:
-                prop += ' +incl Children'
 
-            if incl_boolean:
-                prop += ' +incl. Boolean'
+    # PURGE ORPHANS
 
-            # remove unncessary space at the very beginning
-            prop = prop.strip()
+    elif idname == 'machin3.purge_orphans':
+        recursive = getattr(op, 'recursive')
+        label = 'Purge Orphans Recursively' if recursive else 'Purge Orphans'
 
 
-        # PURGE ORPHANS
+    # SELECT HIERARCHY
 
-        elif idname == 'machin3.purge_orphans':
-            recursive = getattr(op, 'recursive')
-            label = 'Purge Orphans Recursively' if recursive else 'Purge Orphans'
+    elif idname == 'machin3.select_hierarchy':
+        direction = getattr(op, 'direction')
+        label = f"Select Hiearchy {direction.title()}"
 
 
-        # SELECT HIERARCHY
+    # -------------------------------------------------------------------------------------------------------
 
-        elif idname == 'machin3.select_hierarchy':
-            direction = getattr(op, 'direction')
-            label = f"Select Hiearchy {direction.title()}"
+    # DECALmachine
 
+    elif idname == 'machin3.decal_library_visibility_preset':
+        label = f"{label} {op.properties.get('name')}"
+        prop = 'Store' if op.properties.get('store') else 'Recall'
 
-        # -------------------------------------------------------------------------------------------------------
+    elif idname == 'machin3.override_decal_materials':
+        undo = getattr(op, 'undo')
+        label = "Undo Material Override" if undo else "Material Override"
 
-        # DECALmachine
 
-        elif idname == 'machin3.decal_library_visibility_preset':
-            label = f"{label} {op.properties.get('name')}"
-            prop = 'Store' if op.properties.get('store') else 'Recall'
+    # -------------------------------------------------------------------------------------------------------
 
-        elif idname == 'machin3.override_decal_materials':
-            undo = getattr(op, 'undo')
-            label = "Undo Material Override" if undo else "Material Override"
+    # MESHmachine
 
+    elif idname == 'machin3.select':
+        if getattr(op, 'vgroup', False):
+            prop = 'VertexGroup'
+        elif getattr(op, 'faceloop', False):
+            prop = 'FaceLoop'
+        else:
+            prop = 'Loop' if op.properties.get('loop', False) else 'Sharp'
 
-        # -------------------------------------------------------------------------------------------------------
+    elif idname == 'machin3.boolean':
+        prop = getattr(op, 'method', False).capitalize()
 
-        # MESHmachine
+    elif idname == 'machin3.symmetrize':
 
-        elif idname == 'machin3.select':
-            if getattr(op, 'vgroup', False):
-                prop = 'VertexGroup'
-            elif getattr(op, 'faceloop', False):
-                prop = 'FaceLoop'
-            else:
-                prop = 'Loop' if op.properties.get('loop', False) else 'Sharp'
+        if getattr(op, 'remove'):
+            prop = 'Remove'
 
-        elif idname == 'machin3.boolean':
-            prop = getattr(op, 'method', False).capitalize()
+        if getattr(op, 'partial'):
+            label = 'Selected ' + label
 
-        elif idname == 'machin3.symmetrize':
 
-            if getattr(op, 'remove'):
-                prop = 'Remove'
+    # -------------------------------------------------------------------------------------------------------
 
-            if getattr(op, 'partial'):
-                label = 'Selected ' + label
+    # HyperCursor
 
 
-        # -------------------------------------------------------------------------------------------------------
+    # ADD OBJECT at CURSOR
 
-        # HyperCursor
+    elif idname == 'machin3.add_object_at_cursor':
+        is_pipe_init = getattr(op, 'is_pipe_init', False)
 
+        if is_pipe_init:
+            label = 'Initiate Pipe Creation'
 
-        # ADD OBJECT at CURSOR
+        else:
+            objtype = getattr(op, 'type', False)
+            label = f"Add {objtype.title()} at Cursor"
 
-        elif idname == 'machin3.add_object_at_cursor':
-            is_pipe_init = getattr(op, 'is_pipe_init', False)
 
-            if is_pipe_init:
-                label = 'Initiate Pipe Creation'
+    # TRANSFORM CURSOR
+
+    elif idname == 'machin3.transform_cursor':
+        mode = getattr(op, 'mode', False).capitalize()
+        is_array = getattr(op, 'is_array', False)
+        is_macro = getattr(op, 'is_macro', False)
+        is_duplicate = getattr(op, 'is_duplicate', False)
+
+        if is_macro:
+            geo = 'Mesh Selection' if context.mode == 'EDIT_MESH' else 'Object Selection'
+
+            if is_duplicate:
+                # prop = f"Duplicate {mode} {geo}"
+                label = f"Duplicate {mode} {geo}"
 
             else:
-                objtype = getattr(op, 'type', False)
-                label = f"Add {objtype.title()} at Cursor"
+                # prop = f"{mode} {geo}"
+                label = f"{mode} {geo}"
 
+        elif is_array:
+            # prop = f"{mode} Array"
+            # label = f"{mode} Array"
 
-        # TRANSFORM CURSOR
+            if mode == 'Translate':
+                label = f"Linear Array"
+            elif mode == 'Rotate':
+                label = f"Radial Array"
 
-        elif idname == 'machin3.transform_cursor':
-            mode = getattr(op, 'mode', False).capitalize()
-            is_array = getattr(op, 'is_array', False)
-            is_macro = getattr(op, 'is_macro', False)
-            is_duplicate = getattr(op, 'is_duplicate', False)
+        else:
+            # prop = f"{mode}"
+            label = f"{mode} Cursor"
 
-            if is_macro:
-                geo = 'Mesh Selection' if context.mode == 'EDIT_MESH' else 'Object Selection'
 
-                if is_duplicate:
-                    # prop = f"Duplicate {mode} {geo}"
-                    label = f"Duplicate {mode} {geo}"
+    # PICK HYPER BEVEL
 
-                else:
-                    # prop = f"{mode} {geo}"
-                    label = f"{mode} {geo}"
+    elif idname == 'machin3.pick_hyper_bevel':
+        mirror = getattr(op, 'mirror')
 
-            elif is_array:
-                # prop = f"{mode} Array"
-                # label = f"{mode} Array"
+        if mirror:
+            label = 'Mirror Hyper Bevel'
+        else:
+            label = 'Remove Hyper Bevel'
 
-                if mode == 'Translate':
-                    label = f"Linear Array"
-                elif mode == 'Rotate':
-                    label = f"Radial Array"
 
-            else:
-                # prop = f"{mode}"
-                label = f"{mode} Cursor"
+    # POINT CURSOR
 
+    elif idname == 'machin3.point_cursor':
+        align_y_axis = getattr(op, 'align_y_axis')
+        label = 'Point Cursor'
+        prop = 'Y' if align_y_axis else 'Z'
 
-        # PICK HYPER BEVEL
 
-        elif idname == 'machin3.pick_hyper_bevel':
-            mirror = getattr(op, 'mirror')
+    # TODO: obsolete?
 
-            if mirror:
-                label = 'Mirror Hyper Bevel'
-            else:
-                label = 'Remove Hyper Bevel'
+    elif idname == 'machin3.hyper_cursor_object':
+        hide_all = getattr(op, 'hide_all_visible_wire_objs')
+        sort_modifiers = getattr(op, 'sort_modifiers')
+        cycle_object_tree = getattr(op, 'cycle_object_tree')
+
+        if hide_all:
+            label = "Hide All Visible Wire Objects"
+        elif sort_modifiers:
+            label = "Sort Modifiers + Force Gizmo Update"
+        elif cycle_object_tree:
+            label = "Cycle Object Tree"
+
+    return (addon, label, idname, prop)
+
+
+# OPERATOR HISTORY
+
+operator_history = {'signature': None,
+                    'entries': {},
+                    'operators': []}
+
+def get_operator_key(op):
+    '''
+    key operators by pointer and idname, but also by their props, as pointers of freed operators can be re-used by new ones
+    '''
+
+    props = op.properties
+    return (op.as_pointer(), op.bl_idname, tuple(str(getattr(props, prop.identifier, None)) for prop in props.bl_rna.properties if prop.identifier != 'rna_type'))
+
+
+def get_last_operators(context, debug=False):
+    '''
+    get the parsed operator stack from the operator history model
+    only operators, that were newly appended to the stack since the last call, are parsed, all others are fetched from the entries cache, keyed by operator pointer, idname and props
+    operators already in the history are found by pointer and idname alone, so their props are not stringified again
+    the last operator is always re-parsed however, as its props can still be changed via the redo panel
+    '''
+
+    wm_operators = context.window_manager.operators
+
+    signature = (len(wm_operators), wm_operators[-1].as_pointer() if wm_operators else None)
+
+    if signature != operator_history['signature']:
+        if debug:
+            print("updating operator history")
+
+        entries = operator_history['entries']
+
+        # the props are only stringified for operators, that weren't on the stack before
+        known = {key[:2]: key for key in operator_history['operators']}
+        keys = [known.get((op.as_pointer(), op.bl_idname)) or get_operator_key(op) for op in wm_operators]
 
+        for op, key in zip(wm_operators, keys):
+            if key not in entries:
+                if debug:
+                    print(" parsing new operator", key[1])
 
-        # POINT CURSOR
+                entries[key] = get_operator_entry(context, op)
 
-        elif idname == 'machin3.point_cursor':
-            align_y_axis = getattr(op, 'align_y_axis')
-            label = 'Point Cursor'
-            prop = 'Y' if align_y_axis else 'Z'
+        # drop entries of operators, that are no longer on the stack
+        current = set(keys)
 
+        for key in [key for key in entries if key not in current]:
+            del entries[key]
 
-        # TODO: obsolete?
+        operator_history['signature'] = signature
+        operator_history['operators'] = keys
 
-        elif idname == 'machin3.hyper_cursor_object':
-            hide_all = getattr(op, 'hide_all_visible_wire_objs')
-            sort_modifiers = getattr(op, 'sort_modifiers')
-            cycle_object_tree = getattr(op, 'cycle_object_tree')
+    keys = operator_history['operators']
+    entries = operator_history['entries']
 
-            if hide_all:
-                label = "Hide All Visible Wire Objects"
-            elif sort_modifiers:
-                label = "Sort Modifiers + Force Gizmo Update"
-            elif cycle_object_tree:
-                label = "Cycle Object Tree"
+    if keys and wm_operators:
+        entries[keys[-1]] = get_operator_entry(context, wm_operators[-1])
 
-        operators.append((addon, label, idname, prop))
+    operators = [entries[key] for key in keys if entries[key]]
 
     # if there aren't any last ops, it's because you've just done an undo
     if not operators: